@@ -1,51 +1,197 @@
-from flask import Flask, render_template, jsonify, request
-from flask_socketio import SocketIO, emit
-import cv2
-import mediapipe as mp
-import numpy as np
-import base64
-import json
+# Premier import : en mode eventlet ou gevent, le monkey patching précède tout le reste
+import server_mode
+from flask import Flask, Response, render_template, jsonify, request, session
+from flask_socketio import SocketIO, emit, join_room
 from datetime import datetime
 import os
-from game_logic import detect_sign, get_result
-import random
+import time
+import uuid
+import atexit
+import functools
+import importlib
+import threading
+from hand_trackers import HandTrackerRegistry
+from game_sessions import GameSessionStore
+from inference_scheduler import InferenceScheduler
+from capture_pacing import CapturePacer
+from score_journal import ScoreJournal
+from score_db import SqliteScoreStore
+from score_stats import ScoreStats
+from metrics import MetricsRegistry, StageTimer, timed
+from gestures import (AUCUN, COMPUTER_WINS, OUTCOMES, PLAYER_WINS, WEB_LABELS, WEB_RESULTS,
+                      gesture_code, is_move, label_outcome)
+from opponent import STRATEGIES, create_opponent
+
+# Les processus d'inférence (spawn) réimportent ce module sous le nom __mp_main__ :
+# les stockages, fichiers, processus et hooks atexit n'y sont pas créés
+SERVER_PROCESS = __name__ != '__mp_main__'
 
 app = Flask(__name__)
 app.config['SECRET_KEY'] = 'shifumi_secret_key'
-socketio = SocketIO(app, cors_allowed_origins="*")
-
-# Configuration MediaPipe
-mp_hands = mp.solutions.hands
-mp_drawing = mp.solutions.drawing_utils
-
-# Variables globales pour le jeu
-game_state = {
-    'player_score': 0,
-    'computer_score': 0,
-    'current_round': 0,
-    'points_to_win': 5,    # Points nécessaires pour gagner la partie
-    'game_over': False,
-    'last_result': None,
-    'game_history': [],    # Historique des rounds
-    'countdown_active': False,  # Indique si un compte à rebours est en cours
-    'round_in_progress': False,  # Indique si un round est en cours
-    'last_round_time': 0,  # Timestamp du dernier round
-    'detected_hand': 'aucun'  # Main détectée par la caméra
-}
+# Modèle de concurrence : voir server_mode.py (SHIFUMI_ASYNC_MODE)
+app.config['ASYNC_MODE'] = server_mode.ASYNC_MODE
+socketio = SocketIO(app, cors_allowed_origins="*", async_mode=app.config['ASYNC_MODE'])
+
+# Mesures exportées au format texte de Prometheus sur /metrics
+metrics = MetricsRegistry()
+
+FRAME_STAGES = ('decode', 'imdecode', 'bgr2rgb', 'inference', 'detect_sign', 'emit')
+frame_stage_seconds = {
+    stage: metrics.histogram('shifumi_frame_stage_seconds',
+                             "Durée de chaque étape du traitement d'une image",
+                             labels={'stage': stage})
+    for stage in FRAME_STAGES}
+frames_total = metrics.counter('shifumi_frames_total', "Images reçues et traitées")
+frame_errors_total = metrics.counter('shifumi_frame_errors_total', "Images dont le traitement a échoué")
+frames_with_hand_total = metrics.counter('shifumi_frames_with_hand_total', "Images où une main a été détectée")
+metrics.gauge('shifumi_hands_detected_ratio', "Part des images où une main a été détectée",
+              lambda: frames_with_hand_total.value / frames_total.value if frames_total.value else 0.0)
+play_seconds = metrics.histogram('shifumi_play_seconds', "Durée de traitement de /play")
+save_score_seconds = metrics.histogram('shifumi_save_score_seconds', "Durée d'enregistrement d'une partie")
+metrics.gauge('shifumi_inference_backlog', "Clients ayant une image en attente d'inférence",
+              lambda: inference.pending())
+metrics.gauge('shifumi_live_hand_trackers', "Trackers MediaPipe vivants", lambda: len(hand_trackers))
+
+# La pile de vision (OpenCV, MediaPipe, NumPy) n'est chargée qu'à la première image
+_vision = None
+_vision_lock = threading.Lock()
+vision_import_seconds = 0.0
+
+def load_vision():
+    """Importe le module `vision` au premier appel et le retourne"""
+    global _vision, vision_import_seconds
+    if _vision is None:
+        with _vision_lock:
+            if _vision is None:
+                started = time.perf_counter()
+                vision = server_mode.run_blocking(importlib.import_module, 'vision')
+                vision_import_seconds = time.perf_counter() - started
+                print(f"Pile de vision chargée en {vision_import_seconds:.2f} s")
+                _vision = vision
+    return _vision
+
+metrics.gauge('shifumi_vision_import_seconds', "Durée du chargement de la pile de vision (0 = pas encore chargée)",
+              lambda: vision_import_seconds)
+
+# Un tracker MediaPipe vivant par client Socket.IO (évincé par LRU/TTL)
+app.config['TRACKER_MAX_LIVE'] = int(os.environ.get('SHIFUMI_TRACKER_MAX_LIVE', 32))
+app.config['TRACKER_TTL'] = float(os.environ.get('SHIFUMI_TRACKER_TTL', 300))
+
+def create_hand_tracker():
+    """Construit un tracker MediaPipe Hands pour un client, recadré sur sa main"""
+    return server_mode.run_blocking(load_vision().create_hand_tracker)
+
+hand_trackers = HandTrackerRegistry(
+    create_hand_tracker,
+    max_live=app.config['TRACKER_MAX_LIVE'],
+    ttl=app.config['TRACKER_TTL'])
+
+# Préchauffage optionnel : vision chargée et trackers prêts avant la première image
+app.config['WARMUP'] = os.environ.get('SHIFUMI_WARMUP', '0').lower() in ('1', 'true', 'yes', 'on')
+app.config['WARMUP_TRACKERS'] = int(os.environ.get('SHIFUMI_WARMUP_TRACKERS', 1))
+
+# État de la détection : 'cold' (pas encore servie), 'warming' (préchauffage) ou 'warm'
+vision_state = 'cold'
+
+def vision_status():
+    return {'state': vision_state, 'warm': vision_state == 'warm'}
+
+def set_vision_state(state):
+    """Change l'état de la détection et le diffuse à tous les clients"""
+    global vision_state
+    if state != vision_state:
+        vision_state = state
+        socketio.emit('vision_status', vision_status())
+
+def warm_up(trackers=1):
+    """
+    Charge la pile de vision et prépare des trackers par une inférence à blanc.
+
+    Args:
+        trackers: Nombre de trackers de réserve à construire
+
+    Returns:
+        bool: True si la détection est prête
+    """
+    set_vision_state('warming')
+    started = time.perf_counter()
+    try:
+        vision = load_vision()
+        if inference_pool is not None:
+            inference_pool.prewarm(trackers)
+        else:
+            hand_trackers.prewarm(trackers, warm=lambda tracker: server_mode.run_blocking(vision.warm_up_tracker, tracker))
+    except Exception as e:
+        print(f"Erreur lors du préchauffage de la détection: {e}")
+        set_vision_state('cold')
+        return False
+    print(f"Détection préchauffée en {time.perf_counter() - started:.2f} s")
+    set_vision_state('warm')
+    return True
+
+metrics.gauge('shifumi_vision_warm', "1 si la détection est préchauffée", lambda: int(vision_state == 'warm'))
+
+# Une partie par session : plusieurs bornes peuvent partager le même serveur
+app.config['GAME_IDLE_TIMEOUT'] = float(os.environ.get('SHIFUMI_GAME_IDLE_TIMEOUT', 1800))
+
+# Stratégie de l'ordinateur pour les nouvelles parties (modifiable par session)
+app.config['AI_STRATEGY'] = os.environ.get('SHIFUMI_AI_STRATEGY', 'adaptive')
+create_opponent(app.config['AI_STRATEGY'])  # Stratégie invalide : erreur dès le démarrage
+
+games = GameSessionStore(points_to_win=5, idle_timeout=app.config['GAME_IDLE_TIMEOUT'],
+                         opponent_factory=lambda: create_opponent(app.config['AI_STRATEGY']))
+
+def current_game_id():
+    """Identifiant de la partie de l'appelant, conservé dans la session Flask"""
+    game_id = session.get('game_id')
+    if game_id is None:
+        game_id = session['game_id'] = uuid.uuid4().hex
+    return game_id
+
+def current_game():
+    """Retourne l'état de la partie de l'appelant"""
+    return games.get(current_game_id())
+
+# Historique des parties : journal JSONL (par défaut) ou base SQLite
+app.config['SCORE_BACKEND'] = os.environ.get('SHIFUMI_SCORE_BACKEND', 'jsonl')
+app.config['SCORES_FILE'] = os.environ.get('SHIFUMI_SCORES_FILE', 'web_scores.jsonl')
+app.config['SCORES_DB'] = os.environ.get('SHIFUMI_SCORES_DB', 'web_scores.db')
+app.config['SCORE_RETENTION'] = int(os.environ.get('SHIFUMI_SCORE_RETENTION', 100))
+app.config['SCORE_RETENTION_DAYS'] = float(os.environ.get('SHIFUMI_SCORE_RETENTION_DAYS', 0)) or None
+app.config['SCORES_PAGE_SIZE'] = int(os.environ.get('SHIFUMI_SCORES_PAGE_SIZE', 20))
+
+def create_score_store():
+    """Construit le stockage des scores selon SHIFUMI_SCORE_BACKEND"""
+    journal = ScoreJournal(
+        app.config['SCORES_FILE'],
+        retention=app.config['SCORE_RETENTION'],
+        legacy_path='web_scores.json')
+    if app.config['SCORE_BACKEND'] == 'sqlite':
+        # Une base neuve reprend l'historique du journal
+        return SqliteScoreStore(
+            app.config['SCORES_DB'],
+            retention_days=app.config['SCORE_RETENTION_DAYS'],
+            seed=journal.load)
+    if app.config['SCORE_BACKEND'] != 'jsonl':
+        raise ValueError(f"Stockage de scores inconnu: {app.config['SCORE_BACKEND']}")
+    return journal
+
+score_store = score_stats = None
+if SERVER_PROCESS:
+    score_store = create_score_store()
+
+    # Statistiques tenues à jour à chaque partie, persistées à côté des scores
+    score_stats = ScoreStats(
+        os.path.splitext(score_store.path)[0] + '.stats.json',
+        rebuild=score_store.iter_recent)
 
 def load_scores():
     """Charge l'historique des scores"""
-    if os.path.exists("web_scores.json"):
-        try:
-            with open("web_scores.json", 'r') as f:
-                return json.load(f)
-        except:
-            return []
-    return []
+    return score_store.load()
 
+@timed(save_score_seconds)
 def save_score(winner, player_score, computer_score, game_history):
     """Sauvegarde le résultat d'une partie"""
-    scores = load_scores()
     score_entry = {
         'date': datetime.now().isoformat(),
         'winner': winner,
@@ -54,194 +200,323 @@ def save_score(winner, player_score, computer_score, game_history):
         'game_details': game_history,
         'total_rounds': len(game_history)
     }
-    scores.append(score_entry)
-    
-    # Garder seulement les 100 dernières parties
-    if len(scores) > 100:
-        scores = scores[-100:]
-    
-    with open("web_scores.json", 'w') as f:
-        json.dump(scores, f, indent=2)
+    score_store.append(score_entry)
+    score_stats.record(score_entry)
 
-def reset_game():
+def reset_game(game_state):
     """Remet à zéro l'état du jeu"""
-    global game_state
-    game_state.update({
-        'player_score': 0,
-        'computer_score': 0,
-        'current_round': 0,
-        'game_over': False,
-        'last_result': None,
-        'game_history': [],
-        'countdown_active': False,
-        'round_in_progress': False,
-        'detected_hand': 'aucun'
-    })
+    game_state.reset()
 
 def determine_winner(player_gesture, computer_gesture):
-    """Détermine le gagnant d'un round"""
-    if player_gesture == computer_gesture:
-        return 'draw'
-    elif ((player_gesture == 'pierre' and computer_gesture == 'ciseaux') or
-          (player_gesture == 'papier' and computer_gesture == 'pierre') or
-          (player_gesture == 'ciseaux' and computer_gesture == 'papier')):
-        return 'player'
-    else:
-        return 'computer'
+    """Détermine le gagnant d'un round ('player', 'computer' ou 'draw')"""
+    return WEB_RESULTS[label_outcome(player_gesture, computer_gesture)]
 
-def emit_game_update(event_type):
-    """Émet une mise à jour de l'état du jeu"""
-    socketio.emit('game_state', {
-        'state': game_state,
-        'event': event_type
-    })
+def emit_game_update(game_id, game_state, event_type):
+    """Émet aux clients de la partie les changements depuis la version précédente"""
+    patch = game_state.make_patch()
+    if patch is None:
+        # Historique remis à zéro : un instantané complet remplace le patch
+        socketio.emit('game_state', {**game_state.snapshot(), 'event': event_type}, to=game_id)
+    else:
+        socketio.emit('game_patch', {**patch, 'event': event_type}, to=game_id)
 
 @app.route('/')
 def index():
+    # Attribuer une partie à la session dès le chargement de la page
+    current_game_id()
     return render_template('index.html')
 
 @app.route('/scores')
 def scores():
-    scores_data = load_scores()
-    
-    # Calculer les statistiques
-    total_games = len(scores_data)
-    player_wins = sum(1 for score in scores_data if score['winner'] == 'Joueur')
-    computer_wins = total_games - player_wins
-    win_rate = round((player_wins / total_games * 100) if total_games > 0 else 0, 1)
-    
-    stats = {
-        'total_games': total_games,
-        'player_wins': player_wins,
-        'computer_wins': computer_wins,
-        'win_rate': win_rate
-    }
-    
-    # Trier par date (plus récent en premier)
-    scores_data.sort(key=lambda x: x['date'], reverse=True)
-    
-    return render_template('scores.html', scores=scores_data, stats=stats)
+    # Une page de parties, de la plus récente à la plus ancienne
+    before = request.args.get('before') or None
+    try:
+        scores_data, next_cursor = score_store.page(app.config['SCORES_PAGE_SIZE'], before)
+    except ValueError:
+        return jsonify({'error': 'Curseur de pagination invalide'}), 400
+
+    return render_template('scores.html', scores=scores_data, stats=score_stats.snapshot(),
+                           next_cursor=next_cursor, is_first_page=before is None)
+
+@app.route('/metrics')
+def metrics_endpoint():
+    return Response(metrics.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+@app.route('/ready')
+def readiness():
+    # Sans préchauffage, le serveur est prêt dès son démarrage (détection froide)
+    status = vision_status()
+    ready = status['warm'] or not app.config['WARMUP']
+    return jsonify({'ready': ready, **status}), 200 if ready else 503
+
+@app.route('/api/scores/stats')
+def get_score_stats():
+    return jsonify(score_stats.snapshot())
 
 @app.route('/api/game/state')
 def get_game_state():
-    return jsonify(game_state)
+    return jsonify(current_game().to_dict())
 
 @app.route('/api/game/reset', methods=['POST'])
 def reset_game_api():
-    reset_game()
-    return jsonify({'status': 'success', 'game_state': game_state})
+    game_id = current_game_id()
+    game_state = games.get(game_id)
+    reset_game(game_state)
+    emit_game_update(game_id, game_state, 'reset')
+    return jsonify({'status': 'success', 'game_state': game_state.to_dict()})
+
+@app.route('/api/game/strategy', methods=['GET', 'POST'])
+def game_strategy():
+    game_state = current_game()
+    if request.method == 'POST':
+        strategy = (request.json or {}).get('strategy')
+        if strategy not in STRATEGIES:
+            return jsonify({'error': 'Stratégie inconnue', 'strategies': list(STRATEGIES)}), 400
+        # Le nouvel adversaire repart sans rien savoir du joueur
+        game_state.opponent = create_opponent(strategy)
+    return jsonify({'strategy': game_state.opponent.strategy, 'strategies': list(STRATEGIES)})
 
 @app.route('/reset', methods=['POST'])
 def reset_game_route():
-    reset_game()
-    return jsonify(game_state)
+    game_id = current_game_id()
+    game_state = games.get(game_id)
+    reset_game(game_state)
+    emit_game_update(game_id, game_state, 'reset')
+    return jsonify(game_state.to_dict())
 
 @app.route('/play', methods=['POST'])
+@timed(play_seconds)
 def play():
-    global game_state
-    player_gesture = request.json.get('gesture')
+    game_id = current_game_id()
+    game_state = games.get(game_id)
+    # Les libellés ne servent qu'à l'entrée et à la réponse : la manche se joue sur les codes
+    payload = request.get_json(silent=True)
+    label = payload.get('gesture') if isinstance(payload, dict) else None
+    player_move = gesture_code(label) if isinstance(label, str) else AUCUN
     
-    if not player_gesture or player_gesture not in ['pierre', 'papier', 'ciseaux']:
+    if not is_move(player_move):
         return jsonify({'error': 'Geste invalide'}), 400
     
-    if game_state['game_over']:
+    if game_state.game_over:
         return jsonify({'error': 'Partie terminée'}), 400
     
-    computer_gesture = random.choice(['pierre', 'papier', 'ciseaux'])
-    result = determine_winner(player_gesture, computer_gesture)
+    computer_move = game_state.opponent.choose()
+    round_outcome = OUTCOMES[player_move][computer_move]
+    game_state.opponent.observe(player_move)
+    player_gesture = WEB_LABELS[player_move]
+    computer_gesture = WEB_LABELS[computer_move]
+    result = WEB_RESULTS[round_outcome]
     
-    game_state['current_round'] += 1
+    game_state.current_round += 1
     
     # Enregistrer le round dans l'historique
     round_data = {
-        'round': game_state['current_round'],
+        'round': game_state.current_round,
         'player_gesture': player_gesture,
         'computer_gesture': computer_gesture,
         'result': result,
         'timestamp': datetime.now().isoformat()
     }
-    game_state['game_history'].append(round_data)
+    game_state.game_history.append(round_data)
     
     # Mettre à jour les scores
-    if result == 'player':
-        game_state['player_score'] += 1
-    elif result == 'computer':
-        game_state['computer_score'] += 1
+    if round_outcome == PLAYER_WINS:
+        game_state.player_score += 1
+    elif round_outcome == COMPUTER_WINS:
+        game_state.computer_score += 1
     
-    game_state['last_result'] = result
+    game_state.last_result = result
     
     # Vérifier si quelqu'un a atteint 5 points
-    if game_state['player_score'] >= game_state['points_to_win']:
-        game_state['game_over'] = True
+    if game_state.player_score >= game_state.points_to_win:
+        game_state.game_over = True
         winner = 'Joueur'
-        save_score(winner, game_state['player_score'], game_state['computer_score'], game_state['game_history'])
-        emit_game_update('game_over')
-    elif game_state['computer_score'] >= game_state['points_to_win']:
-        game_state['game_over'] = True
+        save_score(winner, game_state.player_score, game_state.computer_score, game_state.game_history)
+        emit_game_update(game_id, game_state, 'game_over')
+    elif game_state.computer_score >= game_state.points_to_win:
+        game_state.game_over = True
         winner = 'IA'
-        save_score(winner, game_state['player_score'], game_state['computer_score'], game_state['game_history'])
-        emit_game_update('game_over')
+        save_score(winner, game_state.player_score, game_state.computer_score, game_state.game_history)
+        emit_game_update(game_id, game_state, 'game_over')
     else:
-        emit_game_update('round_over')
+        emit_game_update(game_id, game_state, 'round_over')
     
     return jsonify({
         'status': 'success',
         'result': result,
         'player_gesture': player_gesture,
         'computer_gesture': computer_gesture,
-        'game_state': game_state
+        # L'historique complet n'est pas renvoyé : il suit par les patches Socket.IO
+        'game_state': game_state.to_dict(include_history=False),
+        'version': game_state.version
     })
 
 @socketio.on('connect')
 def handle_connect():
     print('Client connecté')
-    emit('game_state', game_state)
+    game_id = current_game_id()
+    join_room(game_id)
+    emit('game_state', {**games.get(game_id).snapshot(), 'event': 'snapshot'})
+    emit('vision_status', vision_status())
+
+@socketio.on('request_resync')
+def handle_resync():
+    """Renvoie un instantané complet à un client qui a manqué une version"""
+    emit('game_state', {**current_game().snapshot(), 'event': 'resync'})
 
 @socketio.on('disconnect')
 def handle_disconnect():
     print('Client déconnecté')
+    sid = request.sid
+    # Le tracker et le rythme de capture ne sont oubliés qu'une fois l'éventuelle
+    # inférence en cours terminée : elle les utilise encore
+    release_tracker = inference_pool.release if inference_pool is not None else hand_trackers.release
 
-@socketio.on('detect_gesture')
-def handle_gesture_detection(data):
-    """Traite l'image reçue pour détecter les gestes"""
-    global game_state
+    def cleanup():
+        release_tracker(sid)
+        capture_pacer.forget(sid)
+        if landmark_recorder is not None:
+            landmark_recorder.release_stream(sid)
+
+    inference.forget(sid, cleanup=cleanup)
+
+# Enregistrement optionnel des points de repère reçus, pour relecture hors ligne
+app.config['RECORD_LANDMARKS'] = os.environ.get('SHIFUMI_RECORD_LANDMARKS') or None
+
+landmark_recorder = None
+if app.config['RECORD_LANDMARKS'] and SERVER_PROCESS:
+    from landmark_recording import LandmarkRecorder
+    landmark_recorder = LandmarkRecorder(app.config['RECORD_LANDMARKS'])
+    atexit.register(landmark_recorder.close)
+
+def analyze_frame(vision, data, detect):
+    """
+    Décode l'image d'un client et y détecte le geste : tout le travail CPU d'une
+    image, en un seul appel pour ne quitter la boucle d'événements qu'une fois.
+
+    Args:
+        vision: Module `vision`
+        data: Trame binaire ou data URL base64 reçue du client
+        detect: Fonction frame -> détection (tracker du client ou pool de processus)
+
+    Returns:
+        tuple: (meta, durée d'extraction, durée de décompression, détection)
+    """
+    started = time.perf_counter()
+    jpeg, meta = vision.extract_jpeg(data)
+    extracted = time.perf_counter()
+    frame = vision.decode_jpeg(jpeg)
+    decoded = time.perf_counter()
+    return meta, extracted - started, decoded - extracted, detect(frame)
+
+def process_frame(sid, payload, stats):
+    """Décode l'image d'un client, détecte le geste et lui renvoie le résultat"""
+    game_id, data = payload
+    meta = {}
+    started = time.perf_counter()
+    timer = StageTimer(frame_stage_seconds)
+    frames_total.inc()
     try:
-        # Décoder l'image base64
-        image_data = data['image'].split(',')[1]
-        image_bytes = base64.b64decode(image_data)
-        nparr = np.frombuffer(image_bytes, np.uint8)
-        frame = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
+        vision = load_vision()
         
-        # Traiter avec MediaPipe
-        with mp_hands.Hands(
-            static_image_mode=False,
-            max_num_hands=1,
-            min_detection_confidence=0.5,
-            min_tracking_confidence=0.5) as hands:
-            
-            detected_gesture = 'aucun'
-            
-            # Convertir BGR to RGB
-            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            results = hands.process(rgb_frame)
-            
-            if results.multi_hand_landmarks:
-                for hand_landmarks in results.multi_hand_landmarks:
-                    # Détecter le geste
-                    detected_gesture = detect_sign(hand_landmarks.landmark)
-            
-            # Mettre à jour l'état avec la main détectée
-            game_state['detected_hand'] = detected_gesture
-            
-            # Retourner le résultat
-            emit('gesture_detected', {
-                'gesture': detected_gesture,
-                'hand_detected': detected_gesture != 'aucun'
-            })
+        # Le tracker est emprunté dans la boucle : le registre et ses verrous n'en sortent
+        # pas, et une éviction pendant l'inférence ne le ferme qu'à son retour
+        tracker = None
+        if inference_pool is not None:
+            detect = functools.partial(inference_pool.infer, sid)
+        else:
+            tracker = hand_trackers.checkout(sid)
+            detect = functools.partial(vision.detect_hands, tracker)
+        
+        # Extraire le JPEG (trame binaire ou data URL base64), le décompresser, le
+        # convertir en RGB, l'analyser (zone de la main seulement si elle est connue)
+        # et reconnaître le geste, hors de la boucle d'événements en mode asynchrone
+        try:
+            meta, decode_seconds, imdecode_seconds, detection = server_mode.run_blocking(
+                analyze_frame, vision, data, detect)
+        finally:
+            if tracker is not None:
+                hand_trackers.checkin(tracker)
+        frame_stage_seconds['decode'].observe(decode_seconds)
+        frame_stage_seconds['imdecode'].observe(imdecode_seconds)
+        frame_stage_seconds['bgr2rgb'].observe(detection['convert_seconds'])
+        frame_stage_seconds['inference'].observe(detection['inference_seconds'])
+        frame_stage_seconds['detect_sign'].observe(detection['detect_seconds'])
+        timer.skip()
+        gesture = detection['gesture_code']
+        detected_gesture = WEB_LABELS[gesture]
+        if detection['hands']:
+            frames_with_hand_total.inc()
+        if vision_state != 'warm':
+            # Première image servie : la détection est désormais rapide
+            set_vision_state('warm')
+        
+        if landmark_recorder is not None:
+            # Un flux par client, numéroté dans l'ordre de connexion
+            landmark_recorder.record_frame(detection['hands'], stream=landmark_recorder.stream_id(sid))
+        
+        # Mettre à jour l'état avec la main détectée
+        games.get(game_id).detected_hand = detected_gesture
+        
+        result = {'gesture': detected_gesture, 'hand_detected': gesture != AUCUN}
             
     except Exception as e:
+        frame_errors_total.inc()
         print(f"Erreur lors du traitement de l'image: {e}")
-        emit('gesture_detected', {'gesture': 'aucun', 'hand_detected': False})
+        result = {'gesture': WEB_LABELS[AUCUN], 'hand_detected': False}
+    
+    # Retourner le résultat avec le rythme de capture conseillé au client
+    processing_ms = (time.perf_counter() - started) * 1000
+    pacing = capture_pacer.recommend(sid, processing_ms, stats['queue_wait_ms'], inference.pending())
+    timer.skip()
+    socketio.emit('gesture_detected', {**result, **meta, **stats, **pacing}, to=sid)
+    timer.mark('emit')
+
+# Une boîte aux lettres d'une image par client, vidée par un pool de threads fixe
+app.config['INFERENCE_WORKERS'] = int(os.environ.get('SHIFUMI_INFERENCE_WORKERS', 2))
+
+# Inférence dans des processus dédiés (0 = dans le processus du serveur)
+app.config['INFERENCE_PROCESSES'] = int(os.environ.get('SHIFUMI_INFERENCE_PROCESSES', 0))
+app.config['INFERENCE_SLOTS'] = int(os.environ.get('SHIFUMI_INFERENCE_SLOTS', 2))
+
+inference_pool = None
+if app.config['INFERENCE_PROCESSES'] > 0 and app.config['ASYNC_MODE'] != 'threading':
+    raise ValueError("SHIFUMI_INFERENCE_PROCESSES n'est disponible qu'avec SHIFUMI_ASYNC_MODE=threading")
+if app.config['INFERENCE_PROCESSES'] > 0 and SERVER_PROCESS:
+    from inference_pool import ProcessInferencePool
+    # Démarré à la première image : les processus ne coûtent rien aux routes hors vision
+    inference_pool = ProcessInferencePool(
+        app.config['INFERENCE_PROCESSES'],
+        slots_per_process=app.config['INFERENCE_SLOTS'],
+        max_live=app.config['TRACKER_MAX_LIVE'],
+        ttl=app.config['TRACKER_TTL'])
+    atexit.register(inference_pool.stop)
+    # Un thread par emplacement : chaque processus reste alimenté
+    app.config['INFERENCE_WORKERS'] = max(
+        app.config['INFERENCE_WORKERS'], app.config['INFERENCE_PROCESSES'] * app.config['INFERENCE_SLOTS'])
+
+inference = InferenceScheduler(process_frame, workers=app.config['INFERENCE_WORKERS'])
+
+# Rythme de capture conseillé aux navigateurs selon la charge du serveur
+app.config['CAPTURE_MIN_INTERVAL_MS'] = int(os.environ.get('SHIFUMI_CAPTURE_MIN_INTERVAL_MS', 100))
+app.config['CAPTURE_MAX_INTERVAL_MS'] = int(os.environ.get('SHIFUMI_CAPTURE_MAX_INTERVAL_MS', 1000))
+
+capture_pacer = CapturePacer(
+    workers=app.config['INFERENCE_WORKERS'],
+    min_interval_ms=app.config['CAPTURE_MIN_INTERVAL_MS'],
+    max_interval_ms=app.config['CAPTURE_MAX_INTERVAL_MS'])
+
+@socketio.on('detect_gesture')
+def handle_gesture_detection(data):
+    """Met en file l'image reçue ; une image plus récente remplace celle en attente"""
+    inference.submit(request.sid, (current_game_id(), data))
+
+if app.config['WARMUP'] and SERVER_PROCESS:
+    socketio.start_background_task(warm_up, app.config['WARMUP_TRACKERS'])
+
+# Rechargement et débogueur de Werkzeug : par défaut en mode threading seulement
+app.config['SERVER_DEBUG'] = os.environ.get(
+    'SHIFUMI_DEBUG', '1' if app.config['ASYNC_MODE'] == 'threading' else '0').lower() in ('1', 'true', 'yes', 'on')
 
 if __name__ == '__main__':
-    socketio.run(app, debug=True, host='0.0.0.0', port=5000)
\ No newline at end of file
+    socketio.run(app, debug=app.config['SERVER_DEBUG'], host='0.0.0.0', port=5000)
\ No newline at end of file
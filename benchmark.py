@@ -0,0 +1,492 @@
+"""
+Banc de mesure hors ligne des chemins critiques du jeu.
+
+Mesure, sur des données synthétiques (points de repère et images JPEG) :
+- la reconnaissance des gestes (detect_sign, detect_sign_fast, detect_sign_batch) ;
+- la résolution d'une manche (get_result, determine_winner, matrice des issues) ;
+- le coup de l'ordinateur (choix et mise à jour de l'adversaire, par stratégie) ;
+- save_score pour des historiques de taille croissante (journal JSONL et SQLite) ;
+- le temps de démarrage (import de app, puis de la pile de vision) ;
+- le chemin complet detect_gesture → décodage → MediaPipe → geste, via le
+  client de test Flask-SocketIO ;
+- avec --pool N, le débit du pool de processus d'inférence de 1 à N processus.
+
+Les résultats sont écrits en JSON ; avec --baseline, chaque mesure est
+comparée à une exécution de référence et le script sort en erreur si l'une
+d'elles a ralenti au-delà de la tolérance.
+
+Usage :
+    python benchmark.py --output bench.json
+    python benchmark.py --baseline bench.json --tolerance 0.25
+"""
+import argparse
+import base64
+import itertools
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import numpy as np
+
+GESTURES = ('pierre', 'papier', 'ciseaux')
+HISTORY_SIZES = (0, 100, 1000, 10000)
+
+
+class Landmark:
+    """Point de repère synthétique, avec les attributs d'un landmark MediaPipe"""
+
+    __slots__ = ('x', 'y', 'z')
+
+    def __init__(self, x, y, z):
+        self.x = x
+        self.y = y
+        self.z = z
+
+
+def measure(func, repeat=20, number=100, warmup=1):
+    """
+    Chronomètre une fonction sans argument.
+
+    Args:
+        func: Fonction à mesurer
+        repeat: Nombre d'échantillons
+        number: Nombre d'appels par échantillon
+        warmup: Nombre d'échantillons ignorés au départ
+
+    Returns:
+        dict: Durées par appel en microsecondes (médiane, moyenne, p95, min)
+              et débit en appels par seconde
+    """
+    for _ in range(warmup):
+        for _ in range(number):
+            func()
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(number):
+            func()
+        samples.append((time.perf_counter() - started) / number * 1e6)
+    return summarize(samples, calls=repeat * number)
+
+
+def summarize(samples_us, calls=None):
+    """Résume une liste de durées (µs par appel)"""
+    ordered = sorted(samples_us)
+    median = statistics.median(ordered)
+    return {
+        'calls': calls if calls is not None else len(ordered),
+        'median_us': round(median, 3),
+        'mean_us': round(statistics.fmean(ordered), 3),
+        'p95_us': round(ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))], 3),
+        'min_us': round(ordered[0], 3),
+        'ops_per_sec': round(1e6 / median, 1) if median > 0 else None,
+    }
+
+
+def synthetic_landmarks(count, seed=0):
+    """
+    Génère des mains synthétiques couvrant toutes les combinaisons de doigts.
+
+    Chaque main lève ou baisse aléatoirement chacun de ses cinq doigts,
+    avec un léger bruit sur toutes les coordonnées.
+
+    Returns:
+        np.ndarray: Tableau (count, 21, 3)
+    """
+    rng = np.random.default_rng(seed)
+    points = rng.normal(0.5, 0.01, size=(count, 21, 3))
+    up = rng.random((count, 5)) < 0.5
+    # Pouce : bout à gauche de l'articulation s'il est levé (main droite)
+    points[:, 3, 0] = 0.45
+    points[:, 4, 0] = np.where(up[:, 0], 0.40, 0.50)
+    # Autres doigts : bout au-dessus de l'articulation, elle-même au-dessus de la base
+    for finger, (tip, ip, mcp) in enumerate(((8, 7, 6), (12, 11, 10), (16, 15, 14), (20, 19, 18)), 1):
+        raised = up[:, finger]
+        points[:, mcp, 1] = 0.60
+        points[:, ip, 1] = np.where(raised, 0.50, 0.65)
+        points[:, tip, 1] = np.where(raised, 0.40, 0.62)
+    return points
+
+
+def to_landmark_lists(points):
+    """Convertit un tableau (N, 21, 3) en listes de Landmark pour detect_sign"""
+    return [[Landmark(*lm) for lm in hand.tolist()] for hand in points]
+
+
+def to_mediapipe_lists(points):
+    """Convertit un tableau (N, 21, 3) en NormalizedLandmarkList, comme les sorties de MediaPipe"""
+    from mediapipe.framework.formats import landmark_pb2
+
+    hands = []
+    for hand in points.tolist():
+        landmark_list = landmark_pb2.NormalizedLandmarkList()
+        for x, y, z in hand:
+            landmark_list.landmark.add(x=x, y=y, z=z)
+        hands.append(landmark_list)
+    return hands
+
+
+def synthetic_jpegs(count, width=640, height=480, quality=80, seed=0):
+    """Encode des images synthétiques (dégradé bruité) en JPEG"""
+    import cv2
+
+    rng = np.random.default_rng(seed)
+    gradient = np.linspace(0, 255, width, dtype=np.float32)[None, :, None]
+    frames = []
+    for _ in range(count):
+        image = gradient + rng.normal(0, 25, size=(height, width, 3))
+        image = np.clip(image, 0, 255).astype(np.uint8)
+        ok, buffer = cv2.imencode('.jpg', image, [cv2.IMWRITE_JPEG_QUALITY, quality])
+        if not ok:
+            raise RuntimeError("Encodage JPEG impossible")
+        frames.append(buffer.tobytes())
+    return frames
+
+
+def bench_gestures(results, hands, quick):
+    from game_logic import detect_sign, detect_sign_fast, detect_sign_batch
+
+    points = synthetic_landmarks(hands)
+    lists = to_landmark_lists(points)
+    repeat = 5 if quick else 20
+    index = itertools.count()
+
+    def next_hand():
+        return lists[next(index) % len(lists)]
+
+    results['detect_sign'] = measure(lambda: detect_sign(next_hand()), repeat=repeat)
+    results['detect_sign_fast'] = measure(lambda: detect_sign_fast(next_hand()), repeat=repeat)
+
+    # Mêmes mains sous forme de NormalizedLandmarkList : le coût réel par main en production
+    mediapipe_lists = to_mediapipe_lists(points)
+
+    def next_mediapipe_hand():
+        return mediapipe_lists[next(index) % len(mediapipe_lists)]
+
+    results['detect_sign_mediapipe'] = measure(
+        lambda: detect_sign(next_mediapipe_hand().landmark), repeat=repeat)
+    results['detect_sign_fast_mediapipe'] = measure(
+        lambda: detect_sign_fast(next_mediapipe_hand()), repeat=repeat)
+    batch = measure(lambda: detect_sign_batch(points), repeat=repeat, number=5)
+    batch['hands_per_call'] = len(points)
+    results['detect_sign_batch'] = batch
+
+
+def bench_rounds(results, app_module, quick):
+    from game_logic import get_result
+
+    rng = np.random.default_rng(1)
+    pairs = [(GESTURES[a], GESTURES[b]) for a, b in rng.integers(0, 3, size=(1024, 2))]
+    repeat = 5 if quick else 20
+    index = itertools.count()
+
+    def next_pair():
+        return pairs[next(index) & 1023]
+
+    results['get_result'] = measure(lambda: get_result(*next_pair()), repeat=repeat, number=1000)
+    results['determine_winner'] = measure(
+        lambda: app_module.determine_winner(*next_pair()), repeat=repeat, number=1000)
+
+    # Même manche sur les codes de gestures.py, sans libellés
+    from gestures import OUTCOMES
+    codes = [(int(a), int(b)) for a, b in rng.integers(0, 3, size=(1024, 2))]
+
+    def next_codes():
+        return codes[next(index) & 1023]
+
+    def code_outcome():
+        player, computer = next_codes()
+        return OUTCOMES[player][computer]
+
+    results['outcome'] = measure(code_outcome, repeat=repeat, number=1000)
+
+
+def bench_opponent(results, quick, sessions=500):
+    """Décision et mise à jour de l'adversaire, parties entrelacées comme sur un serveur chargé"""
+    from opponent import STRATEGIES, create_opponent
+
+    rng = np.random.default_rng(2)
+    moves = rng.integers(0, 3, size=4096).tolist()
+    repeat = 5 if quick else 20
+    for strategy in STRATEGIES:
+        opponents = [create_opponent(strategy) for _ in range(sessions)]
+        index = itertools.count()
+
+        def play_round():
+            i = next(index)
+            opponent = opponents[i % sessions]
+            opponent.choose()
+            opponent.observe(moves[i & 4095])
+
+        results[f'opponent_round[{strategy}]'] = measure(play_round, repeat=repeat, number=1000)
+
+
+def _history_entries(count):
+    """Parties synthétiques au format de save_score"""
+    rounds = [{'round': i + 1, 'player_gesture': 'pierre', 'computer_gesture': 'ciseaux',
+               'result': 'player', 'timestamp': '2024-01-01T00:00:00'} for i in range(9)]
+    return [{'date': datetime(2024, 1, 1).isoformat(), 'winner': 'Joueur',
+             'player_score': 5, 'computer_score': 4, 'game_details': rounds,
+             'total_rounds': len(rounds)} for _ in range(count)]
+
+
+def bench_save_score(results, app_module, workdir, sizes, quick):
+    from score_db import SqliteScoreStore
+    from score_journal import ScoreJournal
+    from score_stats import ScoreStats
+
+    rounds = _history_entries(1)[0]['game_details']
+    saves = 20 if quick else 100
+    original = app_module.score_store, app_module.score_stats
+    try:
+        for backend in ('jsonl', 'sqlite'):
+            for size in sizes:
+                base = os.path.join(workdir, f'scores_{backend}_{size}')
+                existing = _history_entries(size)
+                if backend == 'jsonl':
+                    with open(base + '.jsonl', 'w', encoding='utf-8') as f:
+                        for entry in existing:
+                            f.write(json.dumps(entry, separators=(',', ':')) + '\n')
+                    # Rétention au-dessus de la taille mesurée : aucun compactage
+                    store = ScoreJournal(base + '.jsonl', retention=max(size, 1) + saves)
+                else:
+                    store = SqliteScoreStore(base + '.db', seed=lambda: existing)
+                app_module.score_store = store
+                app_module.score_stats = ScoreStats(base + '.stats.json', rebuild=store.iter_recent)
+
+                samples = []
+                for _ in range(saves):
+                    started = time.perf_counter()
+                    app_module.save_score('Joueur', 5, 4, rounds)
+                    samples.append((time.perf_counter() - started) * 1e6)
+                stats = summarize(samples)
+                stats['history_size'] = size
+                results[f'save_score[{backend},{size}]'] = stats
+    finally:
+        app_module.score_store, app_module.score_stats = original
+
+
+def bench_socket_path(results, app_module, frames, quick):
+    from frame_transport import FRAME_HEADER
+
+    client = app_module.socketio.test_client(app_module.app)
+    client.get_received()
+    count = 20 if quick else 100
+
+    def round_trip(payload, expect_seq=None, timeout=5.0):
+        started = time.perf_counter()
+        client.emit('detect_gesture', payload)
+        deadline = started + timeout
+        while time.perf_counter() < deadline:
+            for message in client.get_received():
+                if message['name'] != 'gesture_detected':
+                    continue
+                if expect_seq is None or message['args'][0].get('seq') == expect_seq:
+                    return (time.perf_counter() - started) * 1e6, message['args'][0]
+            time.sleep(0.0002)
+        raise TimeoutError("Pas de réponse gesture_detected")
+
+    try:
+        # Premier passage : création du tracker MediaPipe du client
+        round_trip(FRAME_HEADER.pack(0, 0.0) + frames[0], expect_seq=0, timeout=30.0)
+
+        for name, encode in (
+                ('binary', lambda seq, jpeg: FRAME_HEADER.pack(seq, 0.0) + jpeg),
+                ('data_url', lambda seq, jpeg: {
+                    'image': 'data:image/jpeg;base64,' + base64.b64encode(jpeg).decode('ascii')})):
+            samples = []
+            hands_seen = 0
+            for seq in range(1, count + 1):
+                payload = encode(seq, frames[seq % len(frames)])
+                elapsed, response = round_trip(payload, expect_seq=seq if name == 'binary' else None)
+                samples.append(elapsed)
+                hands_seen += bool(response.get('hand_detected'))
+            stats = summarize(samples)
+            stats['hands_detected'] = hands_seen
+            results[f'handle_gesture_detection[{name}]'] = stats
+    finally:
+        client.disconnect()
+
+
+def bench_inference_pool(results, jpegs, max_processes, quick):
+    """Débit du pool de processus d'inférence pour 1 à `max_processes` processus"""
+    from concurrent.futures import ThreadPoolExecutor
+
+    import cv2
+    from inference_pool import ProcessInferencePool
+
+    frames = [cv2.imdecode(np.frombuffer(jpeg, np.uint8), cv2.IMREAD_COLOR) for jpeg in jpegs]
+    per_client = 10 if quick else 50
+    for processes in range(1, max_processes + 1):
+        pool = ProcessInferencePool(processes)
+        clients = processes * pool.slots_per_process
+        try:
+            pool.prewarm(pool.slots_per_process)
+
+            def stream(client):
+                for index in range(per_client):
+                    pool.infer(f'client-{client}', frames[index % len(frames)])
+
+            started = time.perf_counter()
+            with ThreadPoolExecutor(clients) as executor:
+                list(executor.map(stream, range(clients)))
+            elapsed = time.perf_counter() - started
+        finally:
+            pool.stop()
+        total = clients * per_client
+        stats = summarize([elapsed / total * 1e6], calls=total)
+        stats['processes'] = processes
+        stats['frames_per_sec'] = round(total / elapsed, 1)
+        results[f'inference_pool[{processes}]'] = stats
+
+
+# Exécuté dans un processus neuf : durée de l'import, mémoire et modules lourds chargés
+STARTUP_PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - started
+try:
+    import resource
+    max_rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+except ImportError:
+    max_rss_kb = None
+heavy = [name for name in ('cv2', 'mediapipe', 'numpy') if name in sys.modules]
+print(json.dumps({{'seconds': elapsed, 'max_rss_kb': max_rss_kb, 'heavy_modules': heavy}}))
+"""
+
+
+def bench_startup(results, workdir, quick):
+    """Mesure l'import de app (sans vision) et de la pile de vision, chacun dans un processus neuf"""
+    env = dict(os.environ)
+    repo_dir = os.path.dirname(os.path.abspath(__file__))
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [repo_dir, env.get('PYTHONPATH')]))
+    for module in ('app', 'vision'):
+        samples, probe = [], None
+        for _ in range(3 if quick else 5):
+            output = subprocess.run(
+                [sys.executable, '-c', STARTUP_PROBE.format(module=module)],
+                cwd=workdir, env=env, capture_output=True, text=True, check=True).stdout
+            probe = json.loads(output.strip().splitlines()[-1])
+            samples.append(probe['seconds'] * 1e6)
+        stats = summarize(samples)
+        stats['max_rss_kb'] = probe['max_rss_kb']
+        stats['heavy_modules'] = probe['heavy_modules']
+        results[f'startup[import {module}]'] = stats
+
+
+def run(quick=False, hands=1000, sizes=HISTORY_SIZES, socket_path=True, pool_processes=0):
+    """
+    Exécute toutes les mesures dans un dossier temporaire.
+
+    Returns:
+        dict: {'meta': ..., 'benchmarks': {nom: mesures}}
+    """
+    workdir = tempfile.mkdtemp(prefix='shifumi_bench_')
+    # L'application ne doit ni lire ni écrire les scores du dépôt
+    os.environ['SHIFUMI_SCORES_FILE'] = os.path.join(workdir, 'web_scores.jsonl')
+    os.environ['SHIFUMI_SCORES_DB'] = os.path.join(workdir, 'web_scores.db')
+    previous_cwd = os.getcwd()
+    os.chdir(workdir)
+    try:
+        benchmarks = {}
+        bench_startup(benchmarks, workdir, quick)
+
+        import app as app_module
+
+        bench_gestures(benchmarks, hands, quick)
+        bench_rounds(benchmarks, app_module, quick)
+        bench_opponent(benchmarks, quick)
+        bench_save_score(benchmarks, app_module, workdir, sizes, quick)
+        if socket_path:
+            bench_socket_path(benchmarks, app_module, synthetic_jpegs(8), quick)
+        app_module.inference.stop(timeout=2)
+        if pool_processes:
+            bench_inference_pool(benchmarks, synthetic_jpegs(8), pool_processes, quick)
+    finally:
+        os.chdir(previous_cwd)
+        shutil.rmtree(workdir, ignore_errors=True)
+    return {'meta': environment(quick), 'benchmarks': benchmarks}
+
+
+def environment(quick):
+    """Décrit la machine et les versions utilisées pour la mesure"""
+    import cv2
+    import mediapipe
+
+    return {
+        'date': datetime.now().isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'numpy': np.__version__,
+        'opencv': cv2.__version__,
+        'mediapipe': getattr(mediapipe, '__version__', 'inconnue'),
+        'quick': quick,
+    }
+
+
+def compare(results, baseline, tolerance=0.25):
+    """
+    Compare les médianes à celles d'une exécution de référence.
+
+    Args:
+        results: Résultats de run()
+        baseline: Résultats de référence (même format)
+        tolerance: Ralentissement relatif toléré (0.25 = +25 %)
+
+    Returns:
+        list: Régressions {'name', 'baseline_us', 'current_us', 'ratio'}, pires en premier
+    """
+    regressions = []
+    reference = baseline.get('benchmarks', {})
+    for name, current in results['benchmarks'].items():
+        previous = reference.get(name)
+        if not previous or not previous.get('median_us'):
+            continue
+        ratio = current['median_us'] / previous['median_us']
+        if ratio > 1 + tolerance:
+            regressions.append({'name': name, 'baseline_us': previous['median_us'],
+                                'current_us': current['median_us'], 'ratio': round(ratio, 3)})
+    return sorted(regressions, key=lambda r: r['ratio'], reverse=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Banc de mesure hors ligne de Shifumi AI")
+    parser.add_argument('--output', help="Fichier JSON des résultats (sortie standard par défaut)")
+    parser.add_argument('--baseline', help="Résultats de référence à comparer")
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help="Ralentissement relatif toléré avant de signaler une régression")
+    parser.add_argument('--quick', action='store_true', help="Moins d'itérations (vérification rapide)")
+    parser.add_argument('--no-socket', action='store_true',
+                        help="Ne pas mesurer le chemin Socket.IO complet")
+    parser.add_argument('--pool', type=int, default=0, metavar='N',
+                        help="Mesurer aussi le débit du pool de 1 à N processus d'inférence")
+    args = parser.parse_args(argv)
+
+    results = run(quick=args.quick, socket_path=not args.no_socket, pool_processes=args.pool)
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            results['regressions'] = compare(results, json.load(f), args.tolerance)
+
+    output = json.dumps(results, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output + '\n')
+    else:
+        print(output)
+
+    for regression in results.get('regressions', []):
+        print(f"Régression : {regression['name']} {regression['baseline_us']} µs → "
+              f"{regression['current_us']} µs (x{regression['ratio']})", file=sys.stderr)
+    return 1 if results.get('regressions') else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,99 @@
+import threading
+import time
+
+
+class CapturePacer:
+    """
+    Recommande à chaque client un intervalle de capture et une qualité JPEG.
+
+    L'intervalle visé est celui que le pool d'inférence peut soutenir pour
+    tous les clients actifs en gardant une marge (`target_utilization`),
+    d'après une moyenne glissante du temps de traitement. Une attente en file
+    trop longue ou une file trop remplie ajoute un recul supplémentaire. La
+    recommandation évolue progressivement (`smoothing`) pour éviter les
+    à-coups ; la qualité JPEG baisse à mesure que l'intervalle s'allonge.
+
+    Seuls comptent les clients actifs : ceux dont une image est arrivée
+    depuis moins de `active_intervals` fois leur intervalle recommandé. Un
+    client dont la caméra est coupée cesse donc de ralentir les autres, et
+    son entrée est supprimée une fois inactif au-delà de l'intervalle maximal.
+    """
+
+    def __init__(self, workers, min_interval_ms=100, max_interval_ms=1000,
+                 initial_interval_ms=200, min_quality=0.5, max_quality=0.85,
+                 target_utilization=0.7, smoothing=0.3, active_intervals=3, clock=time.monotonic):
+        self.workers = workers
+        self.min_interval_ms = min_interval_ms
+        self.max_interval_ms = max_interval_ms
+        self.initial_interval_ms = initial_interval_ms
+        self.min_quality = min_quality
+        self.max_quality = max_quality
+        self.target_utilization = target_utilization
+        self.smoothing = smoothing
+        self.active_intervals = active_intervals
+        self._clock = clock
+        # client -> [temps de traitement moyen (ms), intervalle recommandé (ms), dernière image (s)]
+        self._clients = {}
+        self._lock = threading.Lock()
+
+    def recommend(self, client_id, processing_ms, queue_wait_ms=0.0, backlog=0):
+        """
+        Met à jour les mesures d'un client et retourne sa recommandation.
+
+        Args:
+            client_id: Identifiant du client
+            processing_ms: Durée de traitement de sa dernière image
+            queue_wait_ms: Attente de cette image dans la file
+            backlog: Nombre de clients ayant une image en attente
+
+        Returns:
+            dict: `capture_interval_ms` et `jpeg_quality` (entre 0 et 1)
+        """
+        now = self._clock()
+        with self._lock:
+            entry = self._clients.get(client_id)
+            if entry is None:
+                entry = self._clients[client_id] = [processing_ms, self.initial_interval_ms, now]
+            else:
+                entry[0] += self.smoothing * (processing_ms - entry[0])
+                entry[2] = now
+            active_clients = self._count_active(now)
+
+        average_ms, current_ms, _ = entry
+        # Intervalle soutenable : chaque thread sert active_clients / workers clients
+        target_ms = average_ms * active_clients / (self.workers * self.target_utilization)
+        if queue_wait_ms > current_ms / 4 or backlog > self.workers:
+            # Les images attendent : le serveur est en retard
+            target_ms = max(target_ms, current_ms * 1.25)
+        target_ms = min(max(target_ms, self.min_interval_ms), self.max_interval_ms)
+
+        interval_ms = current_ms + self.smoothing * (target_ms - current_ms)
+        entry[1] = interval_ms
+
+        span = self.max_interval_ms - self.min_interval_ms
+        load = (interval_ms - self.min_interval_ms) / span if span > 0 else 0.0
+        quality = self.max_quality - (self.max_quality - self.min_quality) * load
+        return {
+            'capture_interval_ms': int(round(interval_ms)),
+            'jpeg_quality': round(quality, 2),
+        }
+
+    def _count_active(self, now):
+        """Compte les clients actifs et supprime ceux inactifs depuis longtemps"""
+        expired_after = self.active_intervals * self.max_interval_ms / 1000.0
+        active = 0
+        stale = []
+        for client_id, (_, interval_ms, last_seen) in self._clients.items():
+            idle = now - last_seen
+            if idle <= self.active_intervals * interval_ms / 1000.0:
+                active += 1
+            elif idle > expired_after:
+                stale.append(client_id)
+        for client_id in stale:
+            del self._clients[client_id]
+        return active
+
+    def forget(self, client_id):
+        """Oublie un client (à la déconnexion)"""
+        with self._lock:
+            self._clients.pop(client_id, None)
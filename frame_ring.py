@@ -0,0 +1,185 @@
+import multiprocessing
+import threading
+import time
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+
+# En-tête (entiers 64 bits) : emplacement et numéro de la dernière image publiée,
+# puis un compteur de séquence par emplacement et une ligne d'épingles par lecteur
+_LATEST_SLOT = 0
+_LATEST_NUMBER = 1
+_HEADER_FIXED = 2
+
+
+class FrameRing:
+    """
+    Anneau d'images préallouées entre la capture et ses lecteurs.
+
+    L'écrivain remplit directement un emplacement libre (lecture caméra,
+    miroir, conversion de couleur avec `dst=`) puis le publie ; les lecteurs
+    épinglent la dernière image publiée et la lisent sur place, sans copie.
+    L'écrivain n'écrit jamais dans la dernière image publiée ni dans une image
+    épinglée : avec `slots >= readers + 2`, il trouve toujours un emplacement.
+
+    Avec `shared=True`, l'en-tête et les images vivent dans un segment de
+    mémoire partagée qu'un autre processus ouvre avec FrameRing.attach().
+    Chaque lecteur (thread ou processus) utilise son propre index, de sorte
+    que chaque case de l'en-tête n'a qu'un seul écrivain.
+    """
+
+    def __init__(self, shape, slots=4, readers=2, shared=False, dtype=np.uint8, name=None):
+        """
+        Args:
+            shape: Forme d'une image (hauteur, largeur, canaux)
+            slots: Nombre d'emplacements de l'anneau
+            readers: Nombre de lecteurs simultanés (un index chacun)
+            shared: Place l'anneau en mémoire partagée entre processus
+            dtype: Type des pixels
+            name: Nom d'un segment existant à ouvrir (voir attach)
+        """
+        if slots < readers + 2:
+            raise ValueError("L'anneau doit avoir au moins readers + 2 emplacements")
+        self.shape = tuple(shape)
+        self.slots = slots
+        self.readers = readers
+        self.dtype = np.dtype(dtype)
+        header_items = _HEADER_FIXED + slots + readers * slots
+        header_bytes = header_items * 8
+        frame_bytes = int(np.prod(self.shape)) * self.dtype.itemsize
+        size = header_bytes + slots * frame_bytes
+
+        self._shm = None
+        self._owner = name is None
+        if name is not None:
+            self._shm = shared_memory.SharedMemory(name=name)
+            if multiprocessing.parent_process() is None:
+                # Processus indépendant : son propre suivi des ressources détruirait
+                # le segment à sa sortie (les enfants spawn partagent celui du créateur)
+                resource_tracker.unregister(self._shm._name, 'shared_memory')
+            buffer = self._shm.buf
+        elif shared:
+            self._shm = shared_memory.SharedMemory(create=True, size=size)
+            buffer = self._shm.buf
+        else:
+            buffer = np.empty(size, dtype=np.uint8)
+
+        self._header = np.ndarray((header_items,), dtype=np.int64, buffer=buffer)
+        self._seqs = self._header[_HEADER_FIXED:_HEADER_FIXED + slots]  # impair = écriture en cours
+        self._pins = self._header[_HEADER_FIXED + slots:].reshape(readers, slots)
+        self.frames = np.ndarray((slots,) + self.shape, dtype=self.dtype, buffer=buffer, offset=header_bytes)
+        if self._owner:
+            self._header[:] = 0
+            self._header[_LATEST_SLOT] = -1
+        # Réveille les lecteurs du même processus ; ceux d'un autre processus interrogent l'en-tête
+        self._cond = threading.Condition()
+
+    @classmethod
+    def attach(cls, name, shape, slots=4, readers=2, dtype=np.uint8):
+        """Ouvre, depuis un autre processus, un anneau créé avec shared=True"""
+        return cls(shape, slots, readers, dtype=dtype, name=name)
+
+    @property
+    def name(self):
+        """Nom du segment de mémoire partagée (None si l'anneau est local)"""
+        return self._shm.name if self._shm is not None else None
+
+    @property
+    def latest_number(self):
+        """Numéro de la dernière image publiée (0 = aucune)"""
+        return int(self._header[_LATEST_NUMBER])
+
+    def acquire_write(self):
+        """
+        Réserve un emplacement pour la prochaine image.
+
+        Returns:
+            tuple: (emplacement, tableau à remplir), ou None si tous sont occupés
+        """
+        latest = int(self._header[_LATEST_SLOT])
+        for step in range(1, self.slots + 1):
+            slot = (latest + step) % self.slots
+            if slot == latest or self._pins[:, slot].any():
+                continue
+            self._seqs[slot] += 1
+            # Un lecteur a pu épingler l'emplacement entre les deux lectures :
+            # il verra la séquence changer et réessaiera, on passe au suivant
+            if self._pins[:, slot].any():
+                self._seqs[slot] += 1
+                continue
+            return slot, self.frames[slot]
+        return None
+
+    def commit_write(self, slot):
+        """Publie l'emplacement rempli comme dernière image"""
+        self._seqs[slot] += 1
+        with self._cond:
+            self._header[_LATEST_SLOT] = slot
+            self._header[_LATEST_NUMBER] += 1
+            self._cond.notify_all()
+
+    def cancel_write(self, slot):
+        """Rend un emplacement réservé sans le publier"""
+        self._seqs[slot] += 1
+
+    def acquire_read(self, reader, seen_number=0):
+        """
+        Épingle la dernière image si elle est plus récente que `seen_number`.
+
+        L'image reste valide et inchangée jusqu'à release_read().
+
+        Args:
+            reader: Index du lecteur (0 à readers - 1)
+            seen_number: Numéro de la dernière image déjà lue
+
+        Returns:
+            tuple: (numéro, emplacement, image), ou None s'il n'y a rien de nouveau
+        """
+        while True:
+            number = int(self._header[_LATEST_NUMBER])
+            slot = int(self._header[_LATEST_SLOT])
+            if slot < 0 or number <= seen_number:
+                return None
+            seq = int(self._seqs[slot])
+            self._pins[reader, slot] = 1
+            if seq % 2 == 0 and int(self._seqs[slot]) == seq:
+                return number, slot, self.frames[slot]
+            # L'écrivain a repris l'emplacement avant l'épingle : réessayer
+            self._pins[reader, slot] = 0
+
+    def release_read(self, reader, slot):
+        """Rend l'emplacement lu à l'écrivain"""
+        self._pins[reader, slot] = 0
+
+    def wait_newer(self, seen_number, timeout=None, poll=0.005):
+        """
+        Attend une image plus récente que `seen_number`.
+
+        Returns:
+            bool: True si une nouvelle image est disponible
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while self.latest_number <= seen_number:
+                remaining = poll if deadline is None else min(poll, deadline - time.monotonic())
+                if remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def close(self):
+        """Libère l'anneau ; le segment partagé est détruit par le processus qui l'a créé"""
+        if self._shm is None:
+            return
+        # Les vues numpy doivent disparaître avant la fermeture du segment
+        self.frames = self._header = self._seqs = self._pins = None
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
+        self._shm = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,63 @@
+import base64
+import struct
+
+import cv2
+import numpy as np
+
+# En-tête des trames binaires envoyées par le navigateur :
+# numéro de séquence (uint32) puis horodatage de capture en ms (float64), little-endian
+FRAME_HEADER = struct.Struct('<Id')
+
+def parse_binary_frame(payload):
+    """
+    Sépare l'en-tête d'une trame binaire de son contenu JPEG.
+
+    Args:
+        payload: Trame reçue (bytes, bytearray ou memoryview)
+
+    Returns:
+        tuple: (numéro de séquence, horodatage de capture, memoryview sur le JPEG)
+    """
+    view = memoryview(payload)
+    if view.nbytes <= FRAME_HEADER.size:
+        raise ValueError("Trame binaire trop courte")
+    seq, captured_at = FRAME_HEADER.unpack_from(view)
+    return seq, captured_at, view[FRAME_HEADER.size:]
+
+def decode_frame(data):
+    """
+    Décode une image reçue par `detect_gesture`.
+
+    Accepte soit une trame binaire (en-tête + JPEG brut), soit l'ancien
+    format `{'image': 'data:image/jpeg;base64,...'}`.
+
+    Args:
+        data: Données reçues du client
+
+    Returns:
+        tuple: (image BGR, métadonnées à renvoyer au client)
+    """
+    jpeg, meta = extract_jpeg(data)
+    return decode_jpeg(jpeg), meta
+
+def extract_jpeg(data):
+    """
+    Extrait le JPEG d'une image reçue, sans le décompresser.
+
+    Returns:
+        tuple: (tableau d'octets du JPEG, métadonnées à renvoyer au client)
+    """
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        seq, captured_at, jpeg = parse_binary_frame(data)
+        # Lecture directe depuis le tampon reçu, sans copie intermédiaire
+        return np.frombuffer(jpeg, np.uint8), {'seq': seq, 'captured_at': captured_at}
+
+    image_data = data['image'].split(',', 1)[1]
+    return np.frombuffer(base64.b64decode(image_data), np.uint8), {}
+
+def decode_jpeg(jpeg):
+    """Décompresse un JPEG en image BGR"""
+    frame = cv2.imdecode(jpeg, cv2.IMREAD_COLOR)
+    if frame is None:
+        raise ValueError("Image JPEG illisible")
+    return frame
@@ -1,3 +1,16 @@
+import numpy as np
+
+from gestures import AUCUN, CISEAUX, GAME_LABELS, GAME_RESULTS, OUTCOMES, PAPIER, PIERRE, label_outcome
+
+# Libellés des gestes, indexés par code (voir gestures.py)
+GESTURE_NAMES = GAME_LABELS
+
+# Indices (bout, articulation intermédiaire, base) de l'index, du majeur,
+# de l'annulaire et de l'auriculaire
+FINGER_TIPS = [8, 12, 16, 20]
+FINGER_IPS = [7, 11, 15, 19]
+FINGER_MCPS = [6, 10, 14, 18]
+
 def finger_up(landmarks, tip, mcp, ip=None):
     """
     Détermine si un doigt est levé en comparant les positions relatives.
@@ -27,11 +40,11 @@ def detect_sign(landmarks, is_right_hand=True):
         is_right_hand: True si c'est la main droite, False si c'est la main gauche
     
     Returns:
-        str: "pierre", "papier", "ciseaux" ou "aucun"
+        str: "pierre", "feuille", "ciseaux" ou "inconnu"
     """
     # Vérification si les landmarks sont valides
     if not landmarks or len(landmarks) < 21:
-        return "aucun"
+        return GESTURE_NAMES[AUCUN]
 
     fingers = []
     
@@ -54,46 +67,217 @@ def detect_sign(landmarks, is_right_hand=True):
         is_up = finger_up(landmarks, tip, mcp, ip)
         fingers.append(is_up)
 
-    # Détection améliorée des signes
+    return GESTURE_NAMES[classify_fingers(fingers)]
+
+def classify_fingers(fingers):
+    """
+    Détermine le geste à partir de l'état des cinq doigts.
+    
+    Args:
+        fingers: Booléens [pouce, index, majeur, annulaire, auriculaire]
     
+    Returns:
+        int: PIERRE, PAPIER, CISEAUX ou AUCUN
+    """
     # Vérifier spécifiquement pour les ciseaux d'abord
     # Les ciseaux sont détectés si :
     # 1. L'index est levé
     # 2. Le majeur est levé
     # 3. L'annulaire est baissé OU le petit doigt est baissé
     if fingers[1] and fingers[2] and (not fingers[3] or not fingers[4]):
-        return "ciseaux"
+        return CISEAUX
     
     # Compter le nombre total de doigts levés pour les autres signes
-    num_fingers_up = fingers.count(True)
+    num_fingers_up = sum(bool(up) for up in fingers)
     
     # Pierre : poing fermé (0-1 doigts levés)
     if num_fingers_up <= 1:
-        return "pierre"
+        return PIERRE
     
     # Papier : la plupart des doigts levés (4-5 doigts)
     elif num_fingers_up >= 4:
-        return "papier"
+        return PAPIER
     
     # Si aucun signe n'est clairement identifié
-    return "aucun"
+    return AUCUN
+
+# Poids des doigts dans le masque : bit 0 = pouce ... bit 4 = auriculaire
+FINGER_WEIGHTS = np.array([1, 2, 4, 8, 16])
+
+# Geste associé à chacun des 32 masques de doigts levés
+SIGN_TABLE = np.array(
+    [classify_fingers([(mask >> bit) & 1 for bit in range(5)]) for mask in range(32)],
+    dtype=np.int8)
+
+def landmarks_to_array(hand_landmarks):
+    """
+    Convertit les points de repère MediaPipe en tableau NumPy (une fois par main).
+    
+    Args:
+        hand_landmarks: NormalizedLandmarkList ou liste de points (x, y, z)
+    
+    Returns:
+        np.ndarray: Tableau (21, 3) des coordonnées
+    """
+    landmarks = getattr(hand_landmarks, 'landmark', hand_landmarks)
+    coords = np.fromiter(
+        (value for lm in landmarks for value in (lm.x, lm.y, lm.z)),
+        dtype=np.float64, count=3 * len(landmarks))
+    return coords.reshape(-1, 3)
+
+def finger_mask(points, is_right_hand=True):
+    """
+    Calcule le masque 5 bits des doigts levés d'une main.
+    
+    Args:
+        points: Tableau (21, 3) des points de repère
+        is_right_hand: True si c'est la main droite, False si c'est la main gauche
+    
+    Returns:
+        int: Masque (bit 0 = pouce ... bit 4 = auriculaire)
+    """
+    x = points[:, 0]
+    y = points[:, 1]
+    thumb_up = x[4] < x[3] if is_right_hand else x[4] > x[3]
+    tips = y[FINGER_TIPS]
+    ips = y[FINGER_IPS]
+    others_up = (tips < ips) & (ips < y[FINGER_MCPS])
+    return int(thumb_up) | int(others_up @ FINGER_WEIGHTS[1:])
+
+def detect_sign_code(points, is_right_hand=True):
+    """
+    Détecte le geste d'une main à partir de son tableau de points de repère.
+    
+    Args:
+        points: Tableau (21, 3) des points de repère
+        is_right_hand: True si c'est la main droite, False si c'est la main gauche
+    
+    Returns:
+        int: PIERRE, PAPIER, CISEAUX ou AUCUN
+    """
+    if points.shape[0] < 21:
+        return AUCUN
+    return int(SIGN_TABLE[finger_mask(points, is_right_hand)])
+
+# SIGN_TABLE en entiers Python, pour la lecture main par main
+SIGN_CODES = tuple(int(code) for code in SIGN_TABLE)
+
+def landmark_mask(landmarks, is_right_hand=True):
+    """
+    Calcule le masque 5 bits des doigts levés par lectures scalaires, sans
+    conversion en tableau : pour une seule main, c'est plus rapide que NumPy.
+    
+    Args:
+        landmarks: Liste des points de repère de la main (21 points)
+        is_right_hand: True si c'est la main droite, False si c'est la main gauche
+    
+    Returns:
+        int: Masque (bit 0 = pouce ... bit 4 = auriculaire)
+    """
+    thumb_tip_x = landmarks[4].x
+    thumb_ip_x = landmarks[3].x
+    mask = 1 if (thumb_tip_x < thumb_ip_x if is_right_hand else thumb_tip_x > thumb_ip_x) else 0
+    bit = 2
+    for tip, ip, mcp in zip(FINGER_TIPS, FINGER_IPS, FINGER_MCPS):
+        ip_y = landmarks[ip].y
+        if landmarks[tip].y < ip_y < landmarks[mcp].y:
+            mask |= bit
+        bit <<= 1
+    return mask
+
+def hand_sign_code(hand_landmarks, is_right_hand=True):
+    """
+    Détecte le geste d'une main directement sur ses points de repère MediaPipe.
+    
+    Args:
+        hand_landmarks: NormalizedLandmarkList ou liste de points de repère
+        is_right_hand: True si c'est la main droite, False si c'est la main gauche
+    
+    Returns:
+        int: PIERRE, PAPIER, CISEAUX ou AUCUN
+    """
+    landmarks = getattr(hand_landmarks, 'landmark', hand_landmarks)
+    if len(landmarks) < 21:
+        return AUCUN
+    return SIGN_CODES[landmark_mask(landmarks, is_right_hand)]
+
+def detect_sign_fast(hand_landmarks, is_right_hand=True):
+    """
+    Équivalent de detect_sign par masque des doigts et lecture dans SIGN_TABLE.
+    
+    Args:
+        hand_landmarks: NormalizedLandmarkList ou liste de points de repère
+        is_right_hand: True si c'est la main droite, False si c'est la main gauche
+    
+    Returns:
+        str: "pierre", "feuille", "ciseaux" ou "inconnu"
+    """
+    return GESTURE_NAMES[hand_sign_code(hand_landmarks, is_right_hand)]
 
 def get_result(player, computer):
     """
     Détermine le gagnant d'une manche.
     
     Args:
-        player: Choix du joueur ("pierre", "papier" ou "ciseaux")
-        computer: Choix de l'ordinateur ("pierre", "papier" ou "ciseaux")
+        player: Choix du joueur ("pierre", "feuille" ou "ciseaux" ; "papier" est accepté)
+        computer: Choix de l'ordinateur (mêmes libellés)
     
     Returns:
         str: "Égalité", "Joueur" ou "Ordinateur"
     """
-    if player == computer:
-        return "Égalité"
-    elif (player == "pierre" and computer == "ciseaux") or \
-         (player == "papier" and computer == "pierre") or \
-         (player == "ciseaux" and computer == "papier"):
-        return "Joueur"
-    else:
-        return "Ordinateur"
\ No newline at end of file
+    return GAME_RESULTS[label_outcome(player, computer)]
+
+# Issue d'une manche indexée par [code du joueur, code de l'ordinateur] (gestures.OUTCOMES) :
+# 1 = victoire du joueur, -1 = victoire de l'ordinateur, 0 = égalité
+RESULT_TABLE = np.array(OUTCOMES, dtype=np.int8)
+
+def finger_states_batch(landmarks, is_right_hand=True):
+    """
+    Calcule l'état des cinq doigts pour N mains en une passe vectorisée.
+
+    Args:
+        landmarks: Tableau (N, 21, 3) des points de repère (x, y, z)
+        is_right_hand: Booléen ou vecteur de N booléens (True = main droite)
+
+    Returns:
+        np.ndarray: Tableau (N, 5) de booléens [pouce, index, majeur, annulaire, auriculaire]
+    """
+    points = np.asarray(landmarks, dtype=np.float64)
+    x = points[:, :, 0]
+    y = points[:, :, 1]
+    right = np.broadcast_to(np.asarray(is_right_hand, dtype=bool), points.shape[:1])
+
+    # Pouce : même règle que detect_sign, inversée pour la main gauche
+    thumb_up = np.where(right, x[:, 4] < x[:, 3], x[:, 4] > x[:, 3])
+
+    # Autres doigts : bout au-dessus de l'articulation, elle-même au-dessus de la base
+    tips = y[:, FINGER_TIPS]
+    ips = y[:, FINGER_IPS]
+    mcps = y[:, FINGER_MCPS]
+    others_up = (tips < ips) & (ips < mcps)
+
+    return np.column_stack((thumb_up, others_up))
+
+def detect_sign_batch(landmarks, is_right_hand=True):
+    """
+    Version vectorisée de detect_sign pour N mains.
+
+    Applique exactement les mêmes règles : les ciseaux d'abord, puis
+    pierre pour 0-1 doigt levé et papier pour 4-5 doigts levés.
+    Une main contenant des NaN (main absente) est classée AUCUN.
+
+    Args:
+        landmarks: Tableau (N, 21, 3) des points de repère (x, y, z)
+        is_right_hand: Booléen ou vecteur de N booléens (True = main droite)
+
+    Returns:
+        np.ndarray: Codes des gestes (PIERRE, PAPIER, CISEAUX ou AUCUN), de forme (N,)
+    """
+    points = np.asarray(landmarks, dtype=np.float64)
+    if points.ndim != 3 or points.shape[1] < 21 or points.shape[2] < 2:
+        raise ValueError("landmarks doit être de forme (N, 21, 3)")
+
+    masks = finger_states_batch(points, is_right_hand) @ FINGER_WEIGHTS
+    codes = SIGN_TABLE[masks]
+    codes[np.isnan(points[:, :21, :2]).any(axis=(1, 2))] = AUCUN
+    return codes
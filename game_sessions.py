@@ -0,0 +1,163 @@
+import threading
+import time
+
+from gestures import AUCUN, WEB_LABELS
+
+
+class GameState:
+    """
+    État d'une partie, compact grâce à `__slots__`.
+
+    L'état est diffusé par versions : un client reçoit d'abord un instantané
+    complet (`snapshot`), puis des patches (`make_patch`) ne contenant que
+    les champs modifiés et les rounds ajoutés depuis le message précédent.
+    """
+
+    # Champs exposés aux clients
+    FIELDS = (
+        'player_score',
+        'computer_score',
+        'current_round',
+        'points_to_win',     # Points nécessaires pour gagner la partie
+        'game_over',
+        'last_result',
+        'game_history',      # Historique des rounds
+        'countdown_active',  # Indique si un compte à rebours est en cours
+        'round_in_progress', # Indique si un round est en cours
+        'last_round_time',   # Timestamp du dernier round
+        'detected_hand',     # Main détectée par la caméra
+    )
+    SCALAR_FIELDS = tuple(field for field in FIELDS if field != 'game_history')
+
+    __slots__ = FIELDS + (
+        'last_seen',         # Dernier accès (horloge monotone), pour l'expiration
+        'version',           # Version du dernier message diffusé
+        '_synced',           # (valeurs des champs, longueur de l'historique) à cette version
+        'opponent',          # Adversaire de l'ordinateur (opponent.Opponent), propre à la session
+    )
+
+    def __init__(self, points_to_win=5, opponent=None):
+        self.points_to_win = points_to_win
+        self.opponent = opponent
+        self.last_round_time = 0
+        self.last_seen = 0.0
+        self.version = 0
+        self.reset()
+        self._synced = (self._scalar_values(), 0)
+
+    def reset(self):
+        """Remet à zéro l'état du jeu"""
+        self.player_score = 0
+        self.computer_score = 0
+        self.current_round = 0
+        self.game_over = False
+        self.last_result = None
+        self.game_history = []
+        self.countdown_active = False
+        self.round_in_progress = False
+        self.detected_hand = WEB_LABELS[AUCUN]
+
+    def to_dict(self, include_history=True):
+        """Représentation JSON de l'état, au format historique de l'API"""
+        fields = self.FIELDS if include_history else self.SCALAR_FIELDS
+        return {field: getattr(self, field) for field in fields}
+
+    def snapshot(self):
+        """Message complet : l'état entier et sa version"""
+        return {'version': self.version, 'state': self.to_dict()}
+
+    def make_patch(self):
+        """
+        Avance la version et retourne les changements depuis la précédente.
+
+        Returns:
+            dict: `base_version`, `version`, `changes` (champs modifiés),
+            `history_start` et `new_rounds` (rounds ajoutés) ; None si
+            l'historique a été remis à zéro et qu'un instantané est nécessaire
+        """
+        synced_values, synced_length = self._synced
+        values = self._scalar_values()
+        history_length = len(self.game_history)
+        base_version = self.version
+        self.version += 1
+        self._synced = (values, history_length)
+        if history_length < synced_length:
+            return None
+        return {
+            'base_version': base_version,
+            'version': self.version,
+            'changes': {field: value
+                        for field, value, old in zip(self.SCALAR_FIELDS, values, synced_values)
+                        if value != old},
+            'history_start': synced_length,
+            'new_rounds': self.game_history[synced_length:],
+        }
+
+    def _scalar_values(self):
+        return tuple(getattr(self, field) for field in self.SCALAR_FIELDS)
+
+
+class GameSessionStore:
+    """
+    Parties en cours, une par session (ou salle Socket.IO).
+
+    Les parties inactives depuis plus de `idle_timeout` secondes sont
+    supprimées ; le balayage est fait au fil des accès, au plus une fois
+    toutes les `sweep_interval` secondes.
+    """
+
+    def __init__(self, points_to_win=5, idle_timeout=1800.0, sweep_interval=60.0,
+                 clock=time.monotonic, opponent_factory=None):
+        self.points_to_win = points_to_win
+        self.opponent_factory = opponent_factory  # Crée l'adversaire d'une nouvelle partie
+        self.idle_timeout = idle_timeout
+        self.sweep_interval = sweep_interval
+        self._clock = clock
+        self._games = {}
+        self._lock = threading.Lock()
+        self._last_sweep = clock()
+
+    def __len__(self):
+        return len(self._games)
+
+    def __contains__(self, game_id):
+        return game_id in self._games
+
+    def get(self, game_id):
+        """
+        Retourne la partie associée à `game_id`, en la créant si besoin.
+
+        Args:
+            game_id: Identifiant de session ou de salle
+
+        Returns:
+            GameState: L'état de la partie
+        """
+        now = self._clock()
+        with self._lock:
+            if now - self._last_sweep >= self.sweep_interval:
+                self._expire_idle(now)
+            state = self._games.get(game_id)
+            if state is None:
+                opponent = self.opponent_factory() if self.opponent_factory else None
+                state = self._games[game_id] = GameState(self.points_to_win, opponent)
+            state.last_seen = now
+            return state
+
+    def discard(self, game_id):
+        """Oublie une partie"""
+        with self._lock:
+            self._games.pop(game_id, None)
+
+    def expire_idle(self):
+        """Supprime les parties inactives et retourne leur nombre"""
+        with self._lock:
+            return self._expire_idle(self._clock())
+
+    def _expire_idle(self, now):
+        self._last_sweep = now
+        expired = [game_id for game_id, state in self._games.items()
+                   if now - state.last_seen > self.idle_timeout]
+        for game_id in expired:
+            del self._games[game_id]
+        return len(expired)
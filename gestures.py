@@ -0,0 +1,78 @@
+"""
+Noyau commun des gestes : codes entiers, issue d'une manche et libellés.
+
+Les gestes circulent partout sous forme de petits entiers et l'issue d'une
+manche est lue dans une matrice précalculée. Les libellés ne servent qu'aux
+entrées et sorties :
+- le jeu webcam et game_logic.detect_sign parlent de « feuille » et « inconnu » ;
+- l'API web et la page parlent de « papier » et « aucun ».
+Les deux vocabulaires sont acceptés en entrée.
+
+N'utilise que la bibliothèque standard, pour que `import app` reste léger.
+"""
+
+# Codes des gestes
+PIERRE, PAPIER, CISEAUX, AUCUN = 0, 1, 2, 3
+MOVES = (PIERRE, PAPIER, CISEAUX)
+
+# Libellés par code
+GAME_LABELS = ("pierre", "feuille", "ciseaux", "inconnu")
+WEB_LABELS = ("pierre", "papier", "ciseaux", "aucun")
+
+LABEL_CODES = {label: code for labels in (GAME_LABELS, WEB_LABELS) for code, label in enumerate(labels)}
+
+# Issue d'une manche, du point de vue du joueur
+DRAW, PLAYER_WINS, COMPUTER_WINS = 0, 1, -1
+
+GAME_RESULTS = {DRAW: "Égalité", PLAYER_WINS: "Joueur", COMPUTER_WINS: "Ordinateur"}
+WEB_RESULTS = {DRAW: "draw", PLAYER_WINS: "player", COMPUTER_WINS: "computer"}
+
+
+def _outcome(player, computer):
+    if player == computer:
+        return DRAW
+    if player == AUCUN or computer == AUCUN:
+        # Sans geste reconnu, le joueur perd la manche
+        return COMPUTER_WINS
+    # Chaque coup bat celui qui le précède : papier > pierre > ciseaux > papier
+    return PLAYER_WINS if (player - computer) % 3 == 1 else COMPUTER_WINS
+
+
+# OUTCOMES[joueur][ordinateur], pour les quatre codes
+OUTCOMES = tuple(tuple(_outcome(player, computer) for computer in range(4)) for player in range(4))
+
+
+def gesture_code(label):
+    """Code d'un libellé (l'un ou l'autre vocabulaire), AUCUN s'il est inconnu"""
+    return LABEL_CODES.get(label, AUCUN)
+
+
+def label_outcome(player, computer):
+    """
+    Issue d'une manche entre deux libellés.
+
+    Deux libellés identiques font égalité ; sinon, un libellé inconnu (ni
+    coup ni « aucun ») fait perdre le joueur, comme un geste non reconnu.
+    """
+    if player == computer:
+        return DRAW
+    player_code = LABEL_CODES.get(player)
+    computer_code = LABEL_CODES.get(computer)
+    if player_code is None or computer_code is None:
+        return COMPUTER_WINS
+    return OUTCOMES[player_code][computer_code]
+
+
+def is_move(code):
+    """True pour pierre, papier ou ciseaux"""
+    return 0 <= code < AUCUN
+
+
+def counter_move(code):
+    """Coup qui bat `code`"""
+    return (code + 1) % 3
+
+
+def outcome(player, computer):
+    """Issue d'une manche entre deux codes : DRAW, PLAYER_WINS ou COMPUTER_WINS"""
+    return OUTCOMES[player][computer]
@@ -0,0 +1,140 @@
+import time
+
+import cv2
+import numpy as np
+
+
+class HandRoiTracker:
+    """
+    Enveloppe un tracker MediaPipe Hands pour n'analyser que la zone de la main.
+
+    Après une première détection sur l'image entière, les images suivantes
+    sont recadrées sur la boîte englobante de la main, élargie de `padding`.
+    La zone reste fixe tant que la main y reste bien à l'intérieur : le graphe
+    MediaPipe (static_image_mode=False) suit alors la main d'une image à
+    l'autre dans un repère stable, au lieu d'un recadrage qui bouge à chaque
+    image. Elle n'est recalculée que si la main approche du bord ou change
+    nettement de taille. Les points de repère sont ramenés en coordonnées de
+    l'image complète. Si la main n'est plus trouvée dans la zone, la même
+    image est réanalysée en entier.
+
+    Le recadrage ne sert qu'aux trackers à une seule main : avec plusieurs
+    mains, une autre main pourrait apparaître hors de la zone, et chaque
+    image est donc analysée en entier.
+    """
+
+    def __init__(self, hands, padding=0.35, min_size=128, max_num_hands=1, keep_margin=0.1):
+        """
+        Args:
+            hands: Tracker MediaPipe Hands
+            padding: Marge ajoutée autour de la boîte englobante (fraction de sa taille)
+            min_size: Côté minimal de la zone recadrée, en pixels
+            max_num_hands: max_num_hands du tracker ; au-delà de 1, pas de recadrage
+            keep_margin: Distance minimale au bord de la zone (fraction de son côté)
+                         en deçà de laquelle la zone est recalculée
+        """
+        self.hands = hands
+        self.padding = padding
+        self.min_size = min_size
+        self.crop_enabled = max_num_hands == 1
+        self.keep_margin = keep_margin
+        self.roi = None  # (x0, y0, x1, y1) en pixels, None = image entière
+        self.frame_size = None  # (largeur, hauteur) des images pour lesquelles `roi` a été calculée
+        self.last_area_ratio = 1.0  # Part des pixels analysés à la dernière image
+        self.last_convert_seconds = 0.0  # Durée de la conversion de couleur à la dernière image
+        self.last_inference_seconds = 0.0  # Durée de l'inférence MediaPipe à la dernière image
+        self._rgb = None  # Tampon de conversion réutilisé d'une image à l'autre
+
+    def close(self):
+        self.hands.close()
+
+    def process(self, frame, color_conversion=cv2.COLOR_BGR2RGB):
+        """
+        Détecte les mains dans une image BGR, en ne convertissant et
+        n'analysant que la zone d'intérêt quand elle est connue.
+
+        Args:
+            frame: Image BGR complète
+            color_conversion: Conversion OpenCV vers le RGB attendu par MediaPipe
+
+        Returns:
+            Résultats MediaPipe, points de repère en coordonnées de l'image complète
+        """
+        height, width = frame.shape[:2]
+        if (width, height) != self.frame_size:
+            # Résolution changée (autre caméra, autre réglage) : la zone pourrait sortir de l'image
+            self.roi = None
+            self.frame_size = (width, height)
+        full = (0, 0, width, height)
+        roi = self.roi or full
+        self.last_convert_seconds = self.last_inference_seconds = 0.0
+        results = self._process_region(frame, roi, color_conversion)
+        if not results.multi_hand_landmarks and roi != full:
+            # Main perdue : recherche sur l'image entière
+            roi = full
+            results = self._process_region(frame, roi, color_conversion)
+        self.last_area_ratio = ((roi[2] - roi[0]) * (roi[3] - roi[1])) / float(width * height)
+        if self.crop_enabled:
+            self.roi = self._next_roi(results, roi if roi != full else None, width, height)
+        return results
+
+    def _process_region(self, frame, roi, color_conversion):
+        x0, y0, x1, y1 = roi
+        started = time.perf_counter()
+        # Seule la zone recadrée est convertie, dans un tampon contigu préalloué
+        rgb = cv2.cvtColor(frame[y0:y1, x0:x1], color_conversion, dst=self._rgb_buffer(y1 - y0, x1 - x0))
+        converted = time.perf_counter()
+        results = self.hands.process(rgb)
+        self.last_convert_seconds += converted - started
+        self.last_inference_seconds += time.perf_counter() - converted
+        if results.multi_hand_landmarks and roi != (0, 0, frame.shape[1], frame.shape[0]):
+            self._to_full_frame(results, roi, frame.shape[1], frame.shape[0])
+        return results
+
+    def _rgb_buffer(self, height, width):
+        """Vue contiguë (hauteur, largeur, 3) sur le tampon, agrandi seulement si nécessaire"""
+        size = height * width * 3
+        if self._rgb is None or self._rgb.size < size:
+            self._rgb = np.empty(size, dtype=np.uint8)
+        return self._rgb[:size].reshape(height, width, 3)
+
+    @staticmethod
+    def _to_full_frame(results, roi, width, height):
+        """Convertit les coordonnées normalisées de la zone en coordonnées de l'image"""
+        x0, y0, x1, y1 = roi
+        scale_x = (x1 - x0) / width
+        scale_y = (y1 - y0) / height
+        offset_x = x0 / width
+        offset_y = y0 / height
+        for hand_landmarks in results.multi_hand_landmarks:
+            for lm in hand_landmarks.landmark:
+                lm.x = offset_x + lm.x * scale_x
+                lm.y = offset_y + lm.y * scale_y
+                lm.z = lm.z * scale_x
+
+    def _next_roi(self, results, current, width, height):
+        """
+        Zone carrée englobant les mains détectées, élargie et bornée à l'image.
+        La zone courante est conservée tant que la main y reste bien à l'intérieur.
+        """
+        if not results.multi_hand_landmarks:
+            return None
+        xs = [lm.x for hand in results.multi_hand_landmarks for lm in hand.landmark]
+        ys = [lm.y for hand in results.multi_hand_landmarks for lm in hand.landmark]
+        left, right = min(xs) * width, max(xs) * width
+        top, bottom = min(ys) * height, max(ys) * height
+        side = max(right - left, bottom - top) * (1 + 2 * self.padding)
+        side = int(min(max(side, self.min_size), width, height))
+        if current is not None:
+            x0, y0, x1, y1 = current
+            margin = (x1 - x0) * self.keep_margin
+            inside = (left >= x0 + margin and right <= x1 - margin
+                      and top >= y0 + margin and bottom <= y1 - margin)
+            # Main nettement plus petite qu'à la création de la zone : on resserre
+            if inside and side * 2 > x1 - x0:
+                return current
+        center_x = (left + right) / 2
+        center_y = (top + bottom) / 2
+        x0 = int(min(max(center_x - side / 2, 0), width - side))
+        y0 = int(min(max(center_y - side / 2, 0), height - side))
+        return (x0, y0, x0 + side, y0 + side)
@@ -0,0 +1,203 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class HandTrackerRegistry:
+    """
+    Registre des trackers MediaPipe Hands, un par connexion Socket.IO.
+
+    Les trackers sont créés à la première image d'un client puis réutilisés,
+    ce qui garde le graphe chargé et l'état de suivi entre deux images.
+    Les entrées sont rangées de la moins récemment utilisée à la plus récente :
+    celles inactives depuis plus de `ttl` secondes sont fermées, et au-delà de
+    `max_live` trackers vivants la plus ancienne est évincée.
+
+    Des trackers de réserve peuvent être construits à l'avance (`prewarm`) :
+    les prochains clients les reçoivent au lieu d'attendre un nouveau graphe.
+
+    Un tracker emprunté par `checkout` (inférence en cours hors du verrou)
+    n'est jamais fermé sous les pieds de son utilisateur : s'il est évincé
+    ou libéré entre-temps, sa fermeture est différée jusqu'au `checkin`.
+    """
+
+    def __init__(self, factory, max_live=32, ttl=300.0, clock=time.monotonic):
+        """
+        Args:
+            factory: Fonction sans argument qui construit un nouveau tracker
+            max_live: Nombre maximum de trackers ouverts en même temps
+            ttl: Durée d'inactivité (en secondes) avant fermeture d'un tracker
+            clock: Horloge monotone, remplaçable pour les tests
+        """
+        if max_live < 1:
+            raise ValueError("max_live doit être au moins 1")
+        self._factory = factory
+        self.max_live = max_live
+        self.ttl = ttl
+        self._clock = clock
+        self._trackers = OrderedDict()  # sid -> [tracker, dernier usage]
+        self._spares = []  # Trackers préchauffés, pas encore attribués
+        self._in_use = {}  # tracker -> nombre d'emprunts en cours
+        self._closing = set()  # Trackers retirés pendant un emprunt, fermés au dernier checkin
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._trackers)
+
+    def __contains__(self, sid):
+        return sid in self._trackers
+
+    def get(self, sid):
+        """
+        Retourne le tracker du client, en le créant si besoin.
+
+        Sans emprunt : réservé aux appelants qu'aucune éviction concurrente ne
+        peut surprendre (un seul thread). Sinon, utiliser `checkout`.
+
+        Args:
+            sid: Identifiant Socket.IO du client
+
+        Returns:
+            Le tracker associé au client
+        """
+        return self._get(sid, pin=False)
+
+    def checkout(self, sid):
+        """
+        Emprunte le tracker du client (créé si besoin) jusqu'au `checkin`.
+
+        Args:
+            sid: Identifiant Socket.IO du client
+
+        Returns:
+            Le tracker associé au client
+        """
+        return self._get(sid, pin=True)
+
+    def checkin(self, tracker):
+        """Rend un tracker emprunté ; il est fermé s'il a été retiré entre-temps"""
+        with self._lock:
+            count = self._in_use[tracker] - 1
+            if count:
+                self._in_use[tracker] = count
+                return
+            del self._in_use[tracker]
+            if tracker not in self._closing:
+                return
+            self._closing.discard(tracker)
+        self._close_all([tracker])
+
+    def _get(self, sid, pin):
+        now = self._clock()
+        with self._lock:
+            evicted = self._retire(self._evict_expired(now))
+            entry = self._trackers.get(sid)
+            if entry is not None:
+                entry[1] = now
+                self._trackers.move_to_end(sid)
+                if pin:
+                    self._pin(entry[0])
+        self._close_all(evicted)
+        if entry is not None:
+            return entry[0]
+
+        # La construction du graphe est lente : on la fait hors du verrou
+        tracker = self._take_spare()
+        if tracker is None:
+            tracker = self._factory()
+        with self._lock:
+            entry = self._trackers.get(sid)
+            if entry is not None:
+                # Un autre thread a créé le tracker entre-temps
+                evicted = [tracker]
+                tracker = entry[0]
+                entry[1] = now
+                self._trackers.move_to_end(sid)
+            else:
+                evicted = []
+                while len(self._trackers) >= self.max_live:
+                    evicted.append(self._trackers.popitem(last=False)[1][0])
+                evicted = self._retire(evicted)
+                self._trackers[sid] = [tracker, now]
+            if pin:
+                self._pin(tracker)
+        self._close_all(evicted)
+        return tracker
+
+    def prewarm(self, count, warm=None):
+        """
+        Construit des trackers de réserve pour les prochains clients.
+
+        Args:
+            count: Nombre de trackers à préparer
+            warm: Fonction appelée sur chaque tracker (par exemple une inférence à blanc)
+        """
+        for _ in range(count):
+            tracker = self._factory()
+            if warm is not None:
+                warm(tracker)
+            with self._lock:
+                self._spares.append(tracker)
+
+    @property
+    def spare_count(self):
+        return len(self._spares)
+
+    def release(self, sid):
+        """Ferme et oublie le tracker d'un client (à la déconnexion)"""
+        with self._lock:
+            entry = self._trackers.pop(sid, None)
+            evicted = self._retire([entry[0]]) if entry is not None else []
+        self._close_all(evicted)
+
+    def evict_expired(self):
+        """Ferme les trackers inactifs depuis plus de `ttl` secondes"""
+        with self._lock:
+            expired = self._evict_expired(self._clock())
+            evicted = self._retire(expired)
+        self._close_all(evicted)
+        return len(expired)
+
+    def close_all(self):
+        """Ferme tous les trackers ouverts"""
+        with self._lock:
+            evicted = self._retire([entry[0] for entry in self._trackers.values()]) + self._spares
+            self._trackers.clear()
+            self._spares = []
+        self._close_all(evicted)
+
+    def _take_spare(self):
+        with self._lock:
+            return self._spares.pop() if self._spares else None
+
+    def _pin(self, tracker):
+        self._in_use[tracker] = self._in_use.get(tracker, 0) + 1
+
+    def _retire(self, trackers):
+        """Retourne les trackers à fermer tout de suite ; ceux empruntés attendent leur checkin"""
+        to_close = []
+        for tracker in trackers:
+            if tracker in self._in_use:
+                self._closing.add(tracker)
+            else:
+                to_close.append(tracker)
+        return to_close
+
+    def _evict_expired(self, now):
+        # Les entrées les plus anciennes sont en tête : on s'arrête à la première fraîche
+        evicted = []
+        while self._trackers:
+            sid, (tracker, last_used) = next(iter(self._trackers.items()))
+            if now - last_used <= self.ttl:
+                break
+            del self._trackers[sid]
+            evicted.append(tracker)
+        return evicted
+
+    @staticmethod
+    def _close_all(trackers):
+        for tracker in trackers:
+            try:
+                tracker.close()
+            except Exception as e:
+                print(f"Erreur lors de la fermeture d'un tracker: {e}")
@@ -0,0 +1,185 @@
+from collections import OrderedDict
+
+import cv2
+import numpy as np
+
+FONT = cv2.FONT_HERSHEY_SIMPLEX
+TEXT_PADDING = 5  # Marge du fond noir autour du texte
+
+
+class TextSprite:
+    """Texte pré-rendu : image BGR, masque des pixels opaques et position de l'origine"""
+
+    __slots__ = ('image', 'mask', 'origin', 'text_size')
+
+    def __init__(self, image, mask, origin, text_size):
+        self.image = image
+        self.mask = mask
+        self.origin = origin  # (x, y) de l'origine cv2.putText dans le sprite
+        self.text_size = text_size  # (largeur, hauteur) renvoyées par cv2.getTextSize
+
+
+def render_text_sprite(text, scale=1, color=(255, 255, 255), thickness=2):
+    """
+    Dessine une fois un texte sur fond noir avec contour noir.
+
+    Le rendu est celui de l'ancien draw_text_with_background : rectangle noir
+    de TEXT_PADDING pixels autour du texte, contour noir puis texte en couleur.
+    Le sprite garde une marge pour le contour qui déborde du rectangle.
+
+    Returns:
+        TextSprite: Sprite et masque de ses pixels opaques
+    """
+    (text_width, text_height), baseline = cv2.getTextSize(text, FONT, scale, thickness)
+    margin = thickness + 2
+    origin_x = TEXT_PADDING + margin
+    origin_y = text_height + TEXT_PADDING + margin
+    width = text_width + 2 * (TEXT_PADDING + margin)
+    height = origin_y + max(TEXT_PADDING, baseline) + margin
+
+    image = np.zeros((height, width, 3), dtype=np.uint8)
+    mask = np.zeros((height, width), dtype=np.uint8)
+    # Fond noir : l'image est déjà noire, seul le masque est marqué
+    cv2.rectangle(mask,
+                  (origin_x - TEXT_PADDING, origin_y - text_height - TEXT_PADDING),
+                  (origin_x + text_width + TEXT_PADDING, origin_y + TEXT_PADDING),
+                  255, -1)
+    # Contour noir
+    cv2.putText(mask, text, (origin_x, origin_y), FONT, scale, 255, thickness + 2)
+    # Texte principal
+    cv2.putText(image, text, (origin_x, origin_y), FONT, scale, color, thickness)
+    return TextSprite(image, mask.astype(bool), (origin_x, origin_y), (text_width, text_height))
+
+
+class TextSpriteCache:
+    """Cache LRU des sprites de texte, indexé par (texte, taille, couleur, épaisseur)"""
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self._sprites = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._sprites)
+
+    def get(self, text, scale=1, color=(255, 255, 255), thickness=2):
+        key = (text, scale, tuple(color), thickness)
+        sprite = self._sprites.get(key)
+        if sprite is not None:
+            self.hits += 1
+            self._sprites.move_to_end(key)
+            return sprite
+        self.misses += 1
+        sprite = self._sprites[key] = render_text_sprite(text, scale, color, thickness)
+        if len(self._sprites) > self.max_entries:
+            self._sprites.popitem(last=False)
+        return sprite
+
+
+class HudLayer:
+    """
+    Calque d'interface superposé aux images de la caméra.
+
+    Le calque (couleur prémultipliée et part de l'image conservée) n'est
+    recomposé que lorsque la clé d'état passée à compose() change ; chaque
+    image est ensuite mélangée avec lui en une seule opération vectorisée,
+    limitée au rectangle réellement couvert par le calque.
+    """
+
+    def __init__(self, sprites=None):
+        self.sprites = sprites if sprites is not None else TextSpriteCache()
+        self.compositions = 0
+        self._key = None
+        self._shape = None
+        self._color = None  # Couleur prémultipliée par l'opacité (H, W, 3)
+        self._keep = None  # Part conservée de l'image, 255 = image intacte (H, W, 3)
+        self._bbox = None  # (x0, y0, x1, y1) de la zone couverte, None = calque vide
+
+    @property
+    def width(self):
+        return self._shape[1]
+
+    @property
+    def height(self):
+        return self._shape[0]
+
+    def compose(self, key, shape, build):
+        """
+        Recompose le calque si l'état ou la taille de l'image a changé.
+
+        Args:
+            key: Valeur (hachable) décrivant tout ce qu'affiche le calque
+            shape: Forme des images sur lesquelles il sera appliqué
+            build: Fonction appelée avec le calque pour y dessiner
+
+        Returns:
+            bool: True si le calque a été recomposé
+        """
+        shape = tuple(shape[:2])
+        if key == self._key and shape == self._shape:
+            return False
+        if shape != self._shape:
+            self._color = np.zeros(shape + (3,), dtype=np.uint8)
+            self._keep = np.full(shape + (3,), 255, dtype=np.uint8)
+            self._shape = shape
+        elif self._bbox is not None:
+            # Seule la zone dessinée précédemment doit être effacée
+            x0, y0, x1, y1 = self._bbox
+            self._color[y0:y1, x0:x1] = 0
+            self._keep[y0:y1, x0:x1] = 255
+        self._bbox = None
+        build(self)
+        self._key = key
+        self.compositions += 1
+        return True
+
+    def dim(self, opacity):
+        """Assombrit toute l'image sous le calque (fond noir d'opacité `opacity`)"""
+        self._color[:] = 0
+        self._keep[:] = int(round(255 * (1 - opacity)))
+        self._extend_bbox(0, 0, self.width, self.height)
+
+    def measure(self, text, scale=1, thickness=2):
+        """Retourne (largeur, hauteur) du texte, comme cv2.getTextSize"""
+        return self.sprites.get(text, scale, (255, 255, 255), thickness).text_size
+
+    def text(self, text, position, scale=1, color=(255, 255, 255), thickness=2):
+        """Place un texte sur fond noir, `position` étant l'origine de cv2.putText"""
+        sprite = self.sprites.get(text, scale, color, thickness)
+        left = position[0] - sprite.origin[0]
+        top = position[1] - sprite.origin[1]
+        sprite_height, sprite_width = sprite.mask.shape
+        x0, y0 = max(left, 0), max(top, 0)
+        x1 = min(left + sprite_width, self.width)
+        y1 = min(top + sprite_height, self.height)
+        if x0 >= x1 or y0 >= y1:
+            return
+        mask = sprite.mask[y0 - top:y1 - top, x0 - left:x1 - left]
+        self._color[y0:y1, x0:x1][mask] = sprite.image[y0 - top:y1 - top, x0 - left:x1 - left][mask]
+        self._keep[y0:y1, x0:x1][mask] = 0
+        self._extend_bbox(x0, y0, x1, y1)
+
+    def text_centered(self, text, y, scale=1, color=(255, 255, 255), thickness=2):
+        """Place un texte centré horizontalement"""
+        text_width = self.measure(text, scale, thickness)[0]
+        self.text(text, ((self.width - text_width) // 2, y), scale, color, thickness)
+
+    def apply(self, frame):
+        """Mélange le calque avec l'image, sur place"""
+        if self._bbox is None or tuple(frame.shape[:2]) != self._shape:
+            return frame
+        x0, y0, x1, y1 = self._bbox
+        region = frame[y0:y1, x0:x1]
+        # image * conservé / 255 + couleur prémultipliée
+        cv2.multiply(region, self._keep[y0:y1, x0:x1], dst=region, scale=1 / 255)
+        cv2.add(region, self._color[y0:y1, x0:x1], dst=region)
+        return frame
+
+    def _extend_bbox(self, x0, y0, x1, y1):
+        if self._bbox is not None:
+            x0 = min(x0, self._bbox[0])
+            y0 = min(y0, self._bbox[1])
+            x1 = max(x1, self._bbox[2])
+            y1 = max(y1, self._bbox[3])
+        self._bbox = (x0, y0, x1, y1)
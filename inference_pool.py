@@ -0,0 +1,314 @@
+import itertools
+import multiprocessing
+import queue
+import threading
+import time
+import zlib
+from concurrent.futures import Future
+from multiprocessing import shared_memory
+from multiprocessing.connection import wait
+
+# Taille maximale d'une image transmise aux processus (hauteur, largeur, canaux)
+DEFAULT_MAX_FRAME_SHAPE = (720, 1280, 3)
+
+# Intervalle de vérification des processus (redémarrage d'un processus mort)
+HEALTH_CHECK_INTERVAL = 0.5
+
+
+def _worker_main(shm_name, slot_bytes, requests, results, max_live, ttl):
+    """
+    Boucle d'un processus d'inférence.
+
+    Le processus garde ses propres trackers MediaPipe, un par client, et lit
+    les images directement dans ses emplacements de mémoire partagée. Les
+    résultats repartent par son propre tube `results` : un processus tué en
+    cours d'envoi ne peut bloquer que ce tube, pas ceux des autres.
+    """
+    import numpy as np
+    import vision
+    from hand_trackers import HandTrackerRegistry
+
+    # Le segment appartient au parent, qui le détruit ; le suivi des ressources est partagé avec lui
+    shm = shared_memory.SharedMemory(name=shm_name)
+    trackers = HandTrackerRegistry(vision.create_hand_tracker, max_live=max_live, ttl=ttl)
+    try:
+        while True:
+            message = requests.get()
+            if message is None:
+                break
+            kind, job_id = message[0], message[1]
+            try:
+                if kind == 'frame':
+                    _, _, client_id, slot, shape = message
+                    frame = np.ndarray(shape, dtype=np.uint8, buffer=shm.buf, offset=slot * slot_bytes)
+                    result = vision.detect_hands(trackers.get(client_id), frame)
+                    del frame
+                elif kind == 'release':
+                    trackers.release(message[2])
+                    result = None
+                elif kind == 'prewarm':
+                    trackers.prewarm(message[2], warm=vision.warm_up_tracker)
+                    result = None
+                else:
+                    raise ValueError(f"Message inconnu: {kind}")
+                results.send((job_id, True, result))
+            except Exception as e:
+                results.send((job_id, False, f"{type(e).__name__}: {e}"))
+    finally:
+        trackers.close_all()
+        shm.close()
+
+
+class _Worker:
+    """Processus d'inférence vu du parent : file de requêtes, tube de résultats et emplacements libres"""
+
+    def __init__(self, process, requests, results, shm, free_slots):
+        self.process = process
+        self.requests = requests
+        self.results = results
+        self.shm = shm
+        self.free_slots = free_slots
+
+
+class ProcessInferencePool:
+    """
+    Pool de processus d'inférence MediaPipe.
+
+    Chaque processus possède ses trackers et un segment de mémoire partagée
+    découpé en `slots_per_process` emplacements de taille fixe. Le parent
+    copie l'image décodée dans un emplacement libre et n'envoie au processus
+    que son numéro et sa forme : aucun tableau n'est sérialisé. Un client est
+    toujours servi par le même processus (empreinte de son identifiant), ce
+    qui préserve le suivi de la main d'une image à l'autre.
+
+    Un processus mort (plantage de MediaPipe, manque de mémoire) est détecté
+    par le thread de collecte (fin de son tube de résultats, ou vérification
+    périodique) : ses tâches en cours échouent, puis il est remplacé par un
+    nouveau processus avec de nouveaux emplacements.
+    """
+
+    def __init__(self, processes, slots_per_process=2, max_frame_shape=DEFAULT_MAX_FRAME_SHAPE,
+                 max_live=32, ttl=300.0, timeout=10.0):
+        """
+        Args:
+            processes: Nombre de processus d'inférence
+            slots_per_process: Images pouvant attendre en même temps par processus
+            max_frame_shape: Forme maximale d'une image (hauteur, largeur, canaux)
+            max_live: Nombre maximum de trackers par processus
+            ttl: Durée d'inactivité avant fermeture d'un tracker
+            timeout: Attente maximale d'un résultat, en secondes
+        """
+        if processes < 1:
+            raise ValueError("processes doit être au moins 1")
+        self.processes = processes
+        self.slots_per_process = slots_per_process
+        self.slot_bytes = max_frame_shape[0] * max_frame_shape[1] * max_frame_shape[2]
+        self.max_live = max_live
+        self.ttl = ttl
+        self.timeout = timeout
+        self._workers = []
+        self._pending = {}  # identifiant de tâche -> (Future, processus, emplacement ou None)
+        self._job_ids = itertools.count()
+        self._lock = threading.Lock()
+        self._retired = []  # Tubes de processus remplacés, fermés par le thread de collecte
+        self._collector = None
+        self._context = None
+        self.restarts = 0  # Processus remplacés après un arrêt inopiné
+
+    @property
+    def started(self):
+        return bool(self._workers)
+
+    def start(self):
+        """Démarre les processus (sans effet s'ils tournent déjà)"""
+        with self._lock:
+            if self._workers:
+                return
+            # spawn : les processus ne récupèrent ni les threads ni l'état de Flask
+            self._context = multiprocessing.get_context('spawn')
+            for _ in range(self.processes):
+                self._workers.append(self._spawn_worker())
+            self._collector = threading.Thread(target=self._collect, name='inference-results', daemon=True)
+            self._collector.start()
+
+    def _spawn_worker(self):
+        """Démarre un processus d'inférence et son segment de mémoire partagée"""
+        shm = shared_memory.SharedMemory(create=True, size=self.slot_bytes * self.slots_per_process)
+        requests = self._context.Queue()
+        results, results_writer = self._context.Pipe(duplex=False)
+        process = self._context.Process(
+            target=_worker_main, name='shifumi-inference', daemon=True,
+            args=(shm.name, self.slot_bytes, requests,
+                  results_writer, self.max_live, self.ttl))
+        process.start()
+        # Seul le processus garde l'extrémité d'écriture : sa mort ferme le tube
+        results_writer.close()
+        free_slots = queue.Queue()
+        for slot in range(self.slots_per_process):
+            free_slots.put(slot)
+        return _Worker(process, requests, results, shm, free_slots)
+
+    def stop(self, timeout=5.0):
+        """Arrête les processus et libère la mémoire partagée"""
+        with self._lock:
+            workers, self._workers = self._workers, []
+        if not workers:
+            return
+        for worker in workers:
+            worker.requests.put(None)
+        for worker in workers:
+            worker.process.join(timeout)
+            if worker.process.is_alive():
+                worker.process.terminate()
+            worker.shm.close()
+            worker.shm.unlink()
+        # Le thread de collecte s'arrête de lui-même, la liste des processus étant vide
+        self._collector.join(timeout)
+        for worker in workers:
+            worker.results.close()
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        for future, _, _ in pending.values():
+            future.set_exception(RuntimeError("Pool d'inférence arrêté"))
+
+    def worker_index(self, client_id):
+        """Processus attitré d'un client"""
+        return zlib.crc32(str(client_id).encode()) % self.processes
+
+    def infer(self, client_id, frame):
+        """
+        Détecte les mains d'une image dans le processus attitré du client.
+
+        Args:
+            client_id: Identifiant du client (routage et tracker)
+            frame: Image BGR (np.uint8, hauteur x largeur x 3)
+
+        Returns:
+            dict: Résultat de vision.detect_hands
+        """
+        import numpy as np
+
+        if frame.nbytes > self.slot_bytes:
+            raise ValueError(f"Image trop grande pour le pool d'inférence: {frame.shape}")
+        self.start()
+        index = self.worker_index(client_id)
+        deadline = time.monotonic() + self.timeout
+        while True:
+            # Processus relu à chaque attente : il a pu être remplacé entre-temps
+            worker = self._workers[index]
+            try:
+                slot = worker.free_slots.get(timeout=min(HEALTH_CHECK_INTERVAL, max(deadline - time.monotonic(), 0)))
+                break
+            except queue.Empty:
+                self._replace_if_dead(worker)
+                if time.monotonic() >= deadline:
+                    raise TimeoutError("Aucun emplacement libre dans le pool d'inférence") from None
+        try:
+            view = np.ndarray(frame.shape, dtype=np.uint8, buffer=worker.shm.buf, offset=slot * self.slot_bytes)
+            np.copyto(view, frame)
+            del view
+        except Exception:
+            worker.free_slots.put(slot)
+            raise
+        # L'emplacement n'est rendu qu'à la réception du résultat, même après une attente dépassée
+        future = self._submit(worker, ('frame', client_id, slot, frame.shape), slot)
+        return future.result(self.timeout)
+
+    def release(self, client_id):
+        """Ferme le tracker d'un client dans son processus (à la déconnexion)"""
+        if self._workers:
+            self._submit(self._workers[self.worker_index(client_id)], ('release', client_id))
+
+    def prewarm(self, trackers_per_process=1, timeout=None):
+        """Prépare des trackers de réserve dans chaque processus et attend qu'ils soient prêts"""
+        self.start()
+        futures = [self._submit(worker, ('prewarm', trackers_per_process)) for worker in self._workers]
+        for future in futures:
+            future.result(timeout)
+
+    def _submit(self, worker, message, slot=None):
+        future = Future()
+        job_id = next(self._job_ids)
+        with self._lock:
+            # Processus déjà remplacé (ou pool arrêté) : la tâche ne serait jamais traitée
+            replaced = worker not in self._workers
+            if not replaced:
+                self._pending[job_id] = (future, worker, slot)
+        if replaced:
+            future.set_exception(RuntimeError("Processus d'inférence arrêté inopinément"))
+            return future
+        try:
+            worker.requests.put((message[0], job_id) + message[1:])
+        except (ValueError, OSError):
+            # File fermée entre-temps par _replace_if_dead, qui a déjà fait échouer la tâche
+            pass
+        return future
+
+    def _replace_if_dead(self, worker):
+        """
+        Remplace un processus mort : ses tâches en cours échouent et un nouveau
+        processus reprend sa place, avec ses propres emplacements.
+
+        Returns:
+            bool: True si le processus a été remplacé
+        """
+        with self._lock:
+            if worker.process.is_alive() or worker not in self._workers:
+                return False
+            self._workers[self._workers.index(worker)] = self._spawn_worker()
+            self.restarts += 1
+            lost = [job_id for job_id, (_, owner, _) in self._pending.items() if owner is worker]
+            futures = [self._pending.pop(job_id)[0] for job_id in lost]
+            self._retired.append(worker.results)
+        print(f"Processus d'inférence arrêté (code {worker.process.exitcode}), remplacé")
+        for future in futures:
+            future.set_exception(RuntimeError("Processus d'inférence arrêté inopinément"))
+        worker.requests.cancel_join_thread()
+        worker.requests.close()
+        try:
+            worker.shm.close()
+        except BufferError:
+            pass  # Une copie vers l'ancien segment est en cours ; il sera libéré avec elle
+        worker.shm.unlink()
+        return True
+
+    def _collect(self):
+        """Transmet les résultats des processus aux appelants en attente et surveille les processus"""
+        while True:
+            with self._lock:
+                workers = list(self._workers)
+                retired, self._retired = self._retired, []
+            for connection in retired:
+                connection.close()
+            if not workers:
+                return
+            channels = {worker.results: worker for worker in workers}
+            for connection in wait(list(channels), timeout=HEALTH_CHECK_INTERVAL):
+                worker = channels[connection]
+                try:
+                    job_id, ok, result = connection.recv()
+                except (EOFError, OSError):
+                    # Tube fermé : le processus est mort ou se termine
+                    worker.process.join(1.0)
+                    if worker.process.is_alive() and worker in self._workers:
+                        worker.process.kill()
+                        worker.process.join()
+                    self._replace_if_dead(worker)
+                    continue
+                self._deliver(job_id, ok, result)
+            # Vérification périodique, y compris quand les autres processus répondent sans cesse
+            for worker in workers:
+                self._replace_if_dead(worker)
+
+    def _deliver(self, job_id, ok, result):
+        with self._lock:
+            entry = self._pending.pop(job_id, None)
+        if entry is None:
+            return
+        future, worker, slot = entry
+        if slot is not None:
+            worker.free_slots.put(slot)
+        if ok:
+            future.set_result(result)
+        else:
+            future.set_exception(RuntimeError(result))
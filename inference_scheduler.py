@@ -0,0 +1,146 @@
+import threading
+import time
+from collections import deque
+
+
+class _Job:
+    """Image en attente dans la boîte aux lettres d'un client"""
+
+    __slots__ = ('payload', 'enqueued_at')
+
+    def __init__(self, payload, enqueued_at):
+        self.payload = payload
+        self.enqueued_at = enqueued_at
+
+
+class InferenceScheduler:
+    """
+    Ordonnanceur d'inférence « dernière image gagnante ».
+
+    Chaque client dispose d'une boîte aux lettres à une seule place : une
+    nouvelle image remplace celle qui attend encore, et l'image remplacée est
+    comptée comme abandonnée. Un nombre fixe de threads vide les boîtes ; un
+    client n'est jamais traité par deux threads à la fois, ce qui préserve
+    l'ordre des images pour son tracker.
+    """
+
+    def __init__(self, handler, workers=2, clock=time.monotonic):
+        """
+        Args:
+            handler: Fonction `handler(client_id, payload, stats)` appelée par
+                les threads ; `stats` contient `dropped_frames` (images
+                abandonnées pour ce client) et `queue_wait_ms`
+            workers: Nombre de threads d'inférence
+            clock: Horloge monotone, remplaçable pour les tests
+        """
+        if workers < 1:
+            raise ValueError("workers doit être au moins 1")
+        self._handler = handler
+        self.workers = workers
+        self._clock = clock
+        self._mailboxes = {}  # client -> _Job en attente
+        self._ready = deque()  # clients ayant une image prête et aucun thread dessus
+        self._busy = set()
+        self._dropped = {}
+        self._cleanups = {}  # client -> fonction à appeler une fois son traitement fini
+        self._cond = threading.Condition()
+        self._threads = []
+        self._running = False
+
+    def start(self):
+        """Démarre les threads (sans effet s'ils tournent déjà)"""
+        with self._cond:
+            if self._running:
+                return
+            self._running = True
+            self._threads = [
+                threading.Thread(target=self._run, name=f"inference-{i}", daemon=True)
+                for i in range(self.workers)
+            ]
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self, timeout=None):
+        """Arrête les threads après le traitement en cours"""
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def submit(self, client_id, payload):
+        """
+        Dépose une image pour un client, en remplaçant celle en attente.
+
+        Returns:
+            bool: False si une image en attente a été remplacée
+        """
+        self.start()
+        job = _Job(payload, self._clock())
+        with self._cond:
+            replaced = client_id in self._mailboxes
+            self._mailboxes[client_id] = job
+            if replaced:
+                self._dropped[client_id] = self._dropped.get(client_id, 0) + 1
+            elif client_id not in self._busy:
+                self._ready.append(client_id)
+                self._cond.notify()
+        return not replaced
+
+    def forget(self, client_id, cleanup=None):
+        """
+        Oublie un client (à la déconnexion).
+
+        Args:
+            client_id: Identifiant du client
+            cleanup: Fonction appelée une fois qu'aucun thread ne traite plus
+                ce client (par exemple pour libérer son tracker)
+        """
+        with self._cond:
+            self._mailboxes.pop(client_id, None)
+            self._dropped.pop(client_id, None)
+            try:
+                self._ready.remove(client_id)
+            except ValueError:
+                pass
+            busy = client_id in self._busy
+            if busy and cleanup is not None:
+                self._cleanups[client_id] = cleanup
+        if not busy and cleanup is not None:
+            cleanup()
+
+    def pending(self):
+        """Nombre de clients ayant une image en attente"""
+        with self._cond:
+            return len(self._mailboxes)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while self._running and not self._ready:
+                    self._cond.wait()
+                if not self._running:
+                    return
+                client_id = self._ready.popleft()
+                job = self._mailboxes.pop(client_id)
+                self._busy.add(client_id)
+                stats = {
+                    'dropped_frames': self._dropped.get(client_id, 0),
+                    'queue_wait_ms': round((self._clock() - job.enqueued_at) * 1000, 1),
+                }
+
+            try:
+                self._handler(client_id, job.payload, stats)
+            except Exception as e:
+                print(f"Erreur dans le thread d'inférence: {e}")
+
+            with self._cond:
+                self._busy.discard(client_id)
+                cleanup = self._cleanups.pop(client_id, None)
+                if client_id in self._mailboxes:
+                    # Une image plus récente est arrivée pendant le traitement
+                    self._ready.append(client_id)
+                    self._cond.notify()
+            if cleanup is not None:
+                cleanup()
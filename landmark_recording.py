@@ -0,0 +1,233 @@
+"""
+Enregistrement des points de repère des mains et relecture rapide.
+
+Un enregistrement est un en-tête de 12 octets suivi d'enregistrements de
+taille fixe (RECORD_DTYPE) : une ligne par main détectée, ou une ligne
+`hand = -1` pour une image sans main. Le fichier peut donc être projeté en
+mémoire (np.memmap) et relu par blocs sans décodage.
+
+Relecture :
+    python landmark_recording.py partie.lmk [--mode batch|single]
+"""
+import argparse
+import json
+import os
+import struct
+import sys
+import threading
+import time
+
+import numpy as np
+
+from game_logic import GESTURE_NAMES, detect_sign_batch, detect_sign_code, landmarks_to_array
+
+MAGIC = b'SHFLMK'
+FORMAT_VERSION = 1
+HEADER = struct.Struct('<6sHI')  # magie, version, taille d'un enregistrement
+
+RECORD_DTYPE = np.dtype([
+    ('timestamp', '<f8'),         # Horodatage de l'image (secondes, epoch)
+    ('frame', '<u4'),             # Numéro de l'image dans son flux
+    ('stream', '<u2'),            # Flux d'origine (client web, webcam = 0)
+    ('hand', 'i1'),               # Index de la main dans l'image, -1 = aucune main
+    ('is_right', 'u1'),           # 1 = main droite
+    ('landmarks', '<f4', (21, 3)),  # Points de repère (x, y, z)
+])
+
+
+class LandmarkRecorder:
+    """Ajoute les mains détectées à un fichier d'enregistrements, image par image"""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._frames = {}  # flux -> numéro de la prochaine image
+        self._streams = {}  # clé (sid d'un client web) -> flux
+        self._next_stream = 1  # Le flux 0 est celui de la webcam
+        new_file = not os.path.exists(path) or os.path.getsize(path) == 0
+        if not new_file:
+            self._resume(path)
+        self._file = open(path, 'ab')
+        if new_file:
+            self._file.write(HEADER.pack(MAGIC, FORMAT_VERSION, RECORD_DTYPE.itemsize))
+
+    def _resume(self, path):
+        """Reprend un enregistrement existant à la suite de son dernier enregistrement complet"""
+        read_header(path)
+        count = (os.path.getsize(path) - HEADER.size) // RECORD_DTYPE.itemsize
+        # Enregistrement partiel (arrêt brutal) : supprimé pour que les suivants restent alignés
+        os.truncate(path, HEADER.size + count * RECORD_DTYPE.itemsize)
+        # Les numéros d'image de chaque flux reprennent après les derniers enregistrés
+        records = load_recording(path)
+        streams = records['stream']
+        for stream in np.unique(streams):
+            self._frames[int(stream)] = int(records['frame'][streams == stream].max()) + 1
+        if len(streams):
+            # Les nouveaux clients ne prolongent pas les flux des sessions précédentes
+            self._next_stream = int(streams.max()) % 0xFFFF + 1
+        del records
+
+    def stream_id(self, key):
+        """
+        Retourne le flux attribué à `key`, en attribuant le suivant à une nouvelle clé.
+
+        Les flux sont numérotés dans l'ordre d'arrivée des clés : deux clients
+        actifs n'ont jamais le même flux (avant 65535 clients, le compteur
+        repart ensuite de 1).
+
+        Args:
+            key: Identifiant du client (sid Socket.IO)
+
+        Returns:
+            int: Identifiant du flux (1 à 65535)
+        """
+        with self._lock:
+            stream = self._streams.get(key)
+            if stream is None:
+                stream = self._streams[key] = self._next_stream
+                self._next_stream = stream % 0xFFFF + 1
+            return stream
+
+    def release_stream(self, key):
+        """Oublie le flux de `key` (client déconnecté)"""
+        with self._lock:
+            self._streams.pop(key, None)
+
+    def record_frame(self, hands, timestamp=None, stream=0):
+        """
+        Enregistre les mains d'une image.
+
+        Args:
+            hands: Itérable de (points de repère, main droite ?) ; les points
+                   sont un NormalizedLandmarkList MediaPipe ou un tableau (21, 3)
+            timestamp: Horodatage de l'image (maintenant si None)
+            stream: Identifiant du flux (0 à 65535)
+        """
+        hands = list(hands)
+        records = np.zeros(max(len(hands), 1), dtype=RECORD_DTYPE)
+        records['timestamp'] = time.time() if timestamp is None else timestamp
+        records['stream'] = stream
+        if hands:
+            records['hand'] = np.arange(len(hands))
+            for index, (landmarks, is_right_hand) in enumerate(hands):
+                points = landmarks if isinstance(landmarks, np.ndarray) else landmarks_to_array(landmarks)
+                records['landmarks'][index] = points[:21, :3]
+                records['is_right'][index] = bool(is_right_hand)
+        else:
+            records['hand'] = -1
+
+        with self._lock:
+            if self._file is None:
+                return
+            frame = self._frames.get(stream, 0)
+            self._frames[stream] = frame + 1
+            records['frame'] = frame
+            self._file.write(records.tobytes())
+
+    def flush(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.flush()
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def read_header(path):
+    """Vérifie l'en-tête d'un enregistrement et retourne sa version"""
+    with open(path, 'rb') as f:
+        header = f.read(HEADER.size)
+    if len(header) < HEADER.size:
+        raise ValueError(f"{path} : en-tête incomplet")
+    magic, version, record_size = HEADER.unpack(header)
+    if magic != MAGIC:
+        raise ValueError(f"{path} : ce n'est pas un enregistrement de points de repère")
+    if version != FORMAT_VERSION or record_size != RECORD_DTYPE.itemsize:
+        raise ValueError(f"{path} : format {version} ({record_size} octets) non pris en charge")
+    return version
+
+
+def load_recording(path):
+    """
+    Projette un enregistrement en mémoire.
+
+    Un enregistrement tronqué (arrêt brutal pendant l'écriture) est lu
+    jusqu'à son dernier enregistrement complet.
+
+    Returns:
+        np.memmap: Tableau d'enregistrements RECORD_DTYPE (lecture seule)
+    """
+    read_header(path)
+    count = (os.path.getsize(path) - HEADER.size) // RECORD_DTYPE.itemsize
+    if count == 0:
+        return np.zeros(0, dtype=RECORD_DTYPE)
+    return np.memmap(path, dtype=RECORD_DTYPE, mode='r', offset=HEADER.size, shape=(count,))
+
+
+def replay(records, mode='batch', chunk_size=65536, clock=time.perf_counter):
+    """
+    Classe toutes les mains d'un enregistrement aussi vite que possible.
+
+    Args:
+        records: Enregistrements (load_recording)
+        mode: 'batch' (detect_sign_batch par blocs) ou 'single' (detect_sign_code main par main)
+        chunk_size: Nombre d'enregistrements lus et classés par bloc
+
+    Returns:
+        dict: Nombre d'images et de mains, répartition des gestes, durée et débit
+    """
+    counts = np.zeros(len(GESTURE_NAMES), dtype=np.int64)
+    started = clock()
+    for start in range(0, len(records), chunk_size):
+        chunk = records[start:start + chunk_size]
+        hands = chunk[chunk['hand'] >= 0]
+        if not len(hands):
+            continue
+        if mode == 'batch':
+            codes = detect_sign_batch(hands['landmarks'], hands['is_right'].astype(bool))
+        elif mode == 'single':
+            codes = [detect_sign_code(points, bool(is_right))
+                     for points, is_right in zip(hands['landmarks'], hands['is_right'])]
+        else:
+            raise ValueError(f"Mode de relecture inconnu: {mode}")
+        counts += np.bincount(codes, minlength=len(GESTURE_NAMES))
+    elapsed = clock() - started
+
+    # Chaque image a exactement un enregistrement d'index 0 (ou -1 sans main)
+    frames = int(np.count_nonzero(records['hand'] <= 0))
+    hands_total = int(counts.sum())
+    return {
+        'mode': mode,
+        'records': int(len(records)),
+        'frames': frames,
+        'hands': hands_total,
+        'frames_without_hand': int(np.count_nonzero(records['hand'] < 0)),
+        'distribution': {name: int(count) for name, count in zip(GESTURE_NAMES, counts)},
+        'seconds': round(elapsed, 6),
+        'frames_per_sec': round(frames / elapsed, 1) if elapsed > 0 else None,
+        'hands_per_sec': round(hands_total / elapsed, 1) if elapsed > 0 else None,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Relecture rapide d'un enregistrement de points de repère")
+    parser.add_argument('path', help="Fichier d'enregistrement (.lmk)")
+    parser.add_argument('--mode', choices=('batch', 'single'), default='batch',
+                        help="Classement vectorisé par blocs ou main par main")
+    args = parser.parse_args(argv)
+
+    print(json.dumps(replay(load_recording(args.path), args.mode), indent=2, ensure_ascii=False))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
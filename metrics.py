@@ -0,0 +1,169 @@
+import bisect
+import functools
+import threading
+import time
+
+# Bornes (en secondes) des histogrammes de latence
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+
+def _format_labels(labels, extra=None):
+    items = list(labels.items()) + list((extra or {}).items())
+    if not items:
+        return ''
+    return '{' + ','.join(f'{key}="{value}"' for key, value in items) + '}'
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """Compteur monotone"""
+
+    kind = 'counter'
+
+    def __init__(self, name, help_text, labels=None):
+        self.name = name
+        self.help = help_text
+        self.labels = labels or {}
+        self._value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1):
+        with self._lock:
+            self._value += amount
+
+    @property
+    def value(self):
+        return self._value
+
+    def samples(self):
+        yield self.name + _format_labels(self.labels), self._value
+
+
+class Gauge:
+    """Valeur instantanée, calculée au moment de l'export"""
+
+    kind = 'gauge'
+
+    def __init__(self, name, help_text, read, labels=None):
+        self.name = name
+        self.help = help_text
+        self.labels = labels or {}
+        self._read = read
+
+    def samples(self):
+        yield self.name + _format_labels(self.labels), self._read()
+
+
+class Histogram:
+    """
+    Histogramme à bornes fixes.
+
+    Une observation ne coûte qu'une recherche dichotomique et trois
+    incréments ; les comptes cumulés ne sont calculés qu'à l'export.
+    """
+
+    kind = 'histogram'
+
+    def __init__(self, name, help_text, buckets=LATENCY_BUCKETS, labels=None):
+        self.name = name
+        self.help = help_text
+        self.labels = labels or {}
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self.buckets) + 1)  # Dernière case : au-delà de la plus grande borne
+        self._sum = 0.0
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+            self._count += 1
+
+    @property
+    def count(self):
+        return self._count
+
+    def samples(self):
+        with self._lock:
+            counts = list(self._counts)
+            total, count = self._sum, self._count
+        cumulative = 0
+        for bound, bucket_count in zip(self.buckets + (float('inf'),), counts):
+            cumulative += bucket_count
+            yield self.name + '_bucket' + _format_labels(self.labels, {'le': _format_value(bound)}), cumulative
+        yield self.name + '_sum' + _format_labels(self.labels), total
+        yield self.name + '_count' + _format_labels(self.labels), count
+
+
+class StageTimer:
+    """Mesure des étapes successives : chaque mark() clôt l'étape en cours"""
+
+    __slots__ = ('_histograms', '_last')
+
+    def __init__(self, histograms):
+        self._histograms = histograms
+        self._last = time.perf_counter()
+
+    def mark(self, stage):
+        now = time.perf_counter()
+        self._histograms[stage].observe(now - self._last)
+        self._last = now
+
+    def skip(self):
+        """Ignore le temps écoulé depuis la dernière étape"""
+        self._last = time.perf_counter()
+
+
+def timed(histogram):
+    """Décorateur enregistrant la durée de chaque appel dans `histogram`"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                histogram.observe(time.perf_counter() - started)
+        return wrapper
+    return decorator
+
+
+class MetricsRegistry:
+    """Ensemble de métriques exportées au format texte de Prometheus"""
+
+    def __init__(self):
+        self._metrics = []
+
+    def counter(self, name, help_text, labels=None):
+        return self._register(Counter(name, help_text, labels))
+
+    def gauge(self, name, help_text, read, labels=None):
+        return self._register(Gauge(name, help_text, read, labels))
+
+    def histogram(self, name, help_text, buckets=LATENCY_BUCKETS, labels=None):
+        return self._register(Histogram(name, help_text, buckets, labels))
+
+    def render(self):
+        """Retourne l'exposition texte (format 0.0.4) de toutes les métriques"""
+        lines = []
+        declared = set()
+        # Les métriques de même nom (étiquettes différentes) partagent HELP et TYPE
+        for metric in sorted(self._metrics, key=lambda m: m.name):
+            if metric.name not in declared:
+                declared.add(metric.name)
+                lines.append(f'# HELP {metric.name} {metric.help}')
+                lines.append(f'# TYPE {metric.name} {metric.kind}')
+            for sample, value in metric.samples():
+                lines.append(f'{sample} {_format_value(value)}')
+        return '\n'.join(lines) + '\n'
+
+    def _register(self, metric):
+        self._metrics.append(metric)
+        return metric
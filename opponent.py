@@ -0,0 +1,141 @@
+"""
+Adversaires de l'ordinateur : choix aléatoire ou prédiction du prochain
+coup du joueur. Les coups sont les codes de gestures.py (PIERRE, PAPIER, CISEAUX).
+
+Les prédicteurs ne relisent jamais l'historique d'une partie : chacun tient
+une petite table de comptes mise à jour en temps constant à chaque manche.
+Ces tables ne comptent que quelques dizaines d'entrées : de simples listes
+Python suffisent, sans NumPy.
+"""
+import random
+
+from gestures import counter_move
+
+STRATEGIES = ("random", "frequency", "markov1", "markov2", "adaptive")
+DEFAULT_STRATEGY = "adaptive"
+
+
+class FrequencyPredictor:
+    """Prédit le coup que le joueur a joué le plus souvent"""
+
+    __slots__ = ('counts',)
+
+    def __init__(self):
+        self.counts = [0, 0, 0]
+
+    def predict(self):
+        counts = self.counts
+        best = max(counts)
+        return counts.index(best) if best else None
+
+    def update(self, move):
+        self.counts[move] += 1
+
+
+class MarkovPredictor:
+    """
+    Prédit le coup le plus fréquent après les `order` derniers coups du joueur.
+
+    Le contexte est codé en base 3 et glisse d'un coup à chaque manche ; la
+    table (3 ** order contextes x 3 coups) est une liste plate.
+    """
+
+    __slots__ = ('order', 'counts', '_context', '_modulo', '_seen')
+
+    def __init__(self, order=1):
+        if order < 1:
+            raise ValueError("L'ordre d'un prédicteur de Markov doit être au moins 1")
+        self.order = order
+        self._modulo = 3 ** order
+        self.counts = [0] * (self._modulo * 3)
+        self._context = 0
+        self._seen = 0  # Coups observés, plafonné à l'ordre
+
+    def predict(self):
+        if self._seen < self.order:
+            return None
+        row = self._context * 3
+        counts = self.counts[row:row + 3]
+        best = max(counts)
+        return counts.index(best) if best else None
+
+    def update(self, move):
+        if self._seen >= self.order:
+            self.counts[self._context * 3 + move] += 1
+        else:
+            self._seen += 1
+        self._context = (self._context * 3 + move) % self._modulo
+
+
+class Opponent:
+    """
+    Adversaire de l'ordinateur.
+
+    Sans prédicteur, il joue au hasard. Sinon, chaque prédicteur est noté
+    à chaque manche (+1 s'il avait vu juste, -1 sinon, avec oubli progressif)
+    et l'ordinateur joue le coup qui bat la prédiction du mieux noté ; tant
+    qu'aucun n'a de note positive, il joue au hasard.
+    """
+
+    def __init__(self, predictors=(), decay=0.9, rng=None, strategy=None):
+        """
+        Args:
+            predictors: Prédicteurs (predict() -> code ou None, update(code))
+            decay: Poids conservé des notes précédentes à chaque manche
+            rng: Générateur aléatoire (random.Random), pour les tests
+            strategy: Nom de la stratégie, pour l'affichage
+        """
+        self.strategy = strategy
+        self.predictors = list(predictors)
+        self.scores = [0.0] * len(self.predictors)
+        self.decay = decay
+        self.rounds = 0
+        self._rng = rng or random.Random()
+
+    def choose(self):
+        """Retourne le code du coup de l'ordinateur"""
+        best_score = 0.0
+        best_prediction = None
+        for predictor, score in zip(self.predictors, self.scores):
+            if score > best_score:
+                prediction = predictor.predict()
+                if prediction is not None:
+                    best_score, best_prediction = score, prediction
+        if best_prediction is None:
+            return self._rng.randrange(3)
+        return counter_move(best_prediction)
+
+    def observe(self, player_move):
+        """Prend en compte le coup joué par le joueur à la manche qui vient de se terminer"""
+        scores = self.scores
+        for index, predictor in enumerate(self.predictors):
+            prediction = predictor.predict()
+            if prediction is not None:
+                scores[index] = scores[index] * self.decay + (1.0 if prediction == player_move else -1.0)
+            predictor.update(player_move)
+        self.rounds += 1
+
+
+def create_opponent(strategy=DEFAULT_STRATEGY, rng=None):
+    """
+    Crée un adversaire.
+
+    Args:
+        strategy: "random", "frequency", "markovK" (ordre K) ou "adaptive"
+                  (fréquence et Markov d'ordres 1 à 3, le meilleur du moment)
+        rng: Générateur aléatoire optionnel
+
+    Returns:
+        Opponent: Adversaire prêt à jouer
+    """
+    if strategy == "random":
+        predictors = ()
+    elif strategy == "frequency":
+        predictors = (FrequencyPredictor(),)
+    elif strategy == "adaptive":
+        predictors = (FrequencyPredictor(), MarkovPredictor(1), MarkovPredictor(2), MarkovPredictor(3))
+    elif strategy.startswith("markov") and strategy[6:].isdigit():
+        predictors = (MarkovPredictor(int(strategy[6:])),)
+    else:
+        raise ValueError(f"Stratégie inconnue: {strategy}")
+    return Opponent(predictors, rng=rng, strategy=strategy)
@@ -0,0 +1,205 @@
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    date TEXT NOT NULL,
+    winner TEXT NOT NULL,
+    player_score INTEGER NOT NULL,
+    computer_score INTEGER NOT NULL,
+    total_rounds INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS rounds (
+    game_id INTEGER NOT NULL REFERENCES games(id) ON DELETE CASCADE,
+    round INTEGER NOT NULL,
+    player_gesture TEXT,
+    computer_gesture TEXT,
+    result TEXT,
+    timestamp TEXT,
+    PRIMARY KEY (game_id, round)
+);
+CREATE INDEX IF NOT EXISTS idx_games_date ON games(date, id);
+CREATE INDEX IF NOT EXISTS idx_games_winner ON games(winner);
+"""
+
+ROUND_FIELDS = ('round', 'player_gesture', 'computer_gesture', 'result', 'timestamp')
+
+
+def parse_cursor(cursor):
+    """
+    Décode un curseur de pagination "date ISO|identifiant".
+
+    Returns:
+        tuple: (date, identifiant)
+
+    Raises:
+        ValueError: Si le curseur est mal formé
+    """
+    date, separator, game_id = cursor.rpartition('|')
+    try:
+        if not separator:
+            raise ValueError
+        datetime.fromisoformat(date)
+        return date, int(game_id)
+    except ValueError:
+        raise ValueError(f"Curseur de pagination invalide: {cursor!r}") from None
+
+
+class SqliteScoreStore:
+    """
+    Historique des parties dans une base SQLite (tables `games` et `rounds`).
+
+    Les pages sont lues par pagination par clé (`date`, `id`) : le coût
+    d'une page ne dépend pas de la taille de l'historique. Les parties plus
+    anciennes que `retention_days` jours sont purgées périodiquement.
+    """
+
+    def __init__(self, path, retention_days=None, purge_every=50, seed=None):
+        """
+        Args:
+            path: Chemin du fichier SQLite
+            retention_days: Durée de conservation en jours (illimitée si None)
+            purge_every: Nombre de parties enregistrées entre deux purges
+            seed: Fonction retournant les parties à importer si la base est vide
+        """
+        self.path = path
+        self.retention_days = retention_days
+        self.purge_every = purge_every
+        self._lock = threading.Lock()
+        self._inserts_since_purge = 0
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA foreign_keys=ON")
+            self._conn.executescript(SCHEMA)
+        if seed is not None and self.count() == 0:
+            self.import_entries(seed())
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def append(self, entry):
+        """Enregistre une partie et ses rounds"""
+        with self._lock, self._conn:
+            self._insert(entry)
+            self._inserts_since_purge += 1
+            if self._inserts_since_purge >= self.purge_every:
+                self._purge()
+
+    def import_entries(self, entries):
+        """Importe des parties au format de `save_score` (migration)"""
+        count = 0
+        with self._lock, self._conn:
+            for entry in entries:
+                self._insert(entry)
+                count += 1
+            self._purge()
+        return count
+
+    def count(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM games").fetchone()[0]
+
+    def page(self, limit=20, before=None):
+        """
+        Retourne une page de parties, de la plus récente à la plus ancienne.
+
+        Args:
+            limit: Nombre de parties par page
+            before: Curseur retourné par la page précédente (None pour la première)
+
+        Returns:
+            tuple: (liste des parties, curseur de la page suivante ou None)
+
+        Raises:
+            ValueError: Si le curseur n'a pas la forme "date ISO|identifiant"
+        """
+        query = "SELECT * FROM games"
+        params = []
+        if before:
+            date, game_id = parse_cursor(before)
+            query += " WHERE (date < ? OR (date = ? AND id < ?))"
+            params += [date, date, game_id]
+        query += " ORDER BY date DESC, id DESC LIMIT ?"
+        params.append(limit + 1)
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+            has_more = len(rows) > limit
+            rows = rows[:limit]
+            entries = self._with_rounds(rows)
+        next_cursor = None
+        if has_more and rows:
+            next_cursor = f"{rows[-1]['date']}|{rows[-1]['id']}"
+        return entries, next_cursor
+
+    def iter_recent(self, limit=None):
+        """Parcourt les parties de la plus récente à la plus ancienne, page par page"""
+        before = None
+        remaining = limit
+        while remaining is None or remaining > 0:
+            size = 100 if remaining is None else min(100, remaining)
+            entries, before = self.page(size, before)
+            yield from entries
+            if remaining is not None:
+                remaining -= len(entries)
+            if before is None:
+                return
+
+    def load(self, limit=100):
+        """Retourne les dernières parties dans l'ordre chronologique"""
+        entries = list(self.iter_recent(limit))
+        entries.reverse()
+        return entries
+
+    def purge(self):
+        """Supprime les parties plus anciennes que la durée de conservation"""
+        with self._lock, self._conn:
+            return self._purge()
+
+    def _insert(self, entry):
+        history = entry.get('game_details') or []
+        cursor = self._conn.execute(
+            "INSERT INTO games (date, winner, player_score, computer_score, total_rounds) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (entry['date'], entry['winner'], entry['player_score'],
+             entry['computer_score'], entry.get('total_rounds', len(history))))
+        self._conn.executemany(
+            "INSERT INTO rounds (game_id, round, player_gesture, computer_gesture, result, timestamp) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            [(cursor.lastrowid, *(r.get(field) for field in ROUND_FIELDS)) for r in history])
+
+    def _purge(self):
+        self._inserts_since_purge = 0
+        if not self.retention_days:
+            return 0
+        cutoff = (datetime.now() - timedelta(days=self.retention_days)).isoformat()
+        return self._conn.execute("DELETE FROM games WHERE date < ?", (cutoff,)).rowcount
+
+    def _with_rounds(self, rows):
+        """Reconstruit les parties au format de `save_score`, rounds compris"""
+        entries = []
+        by_id = {}
+        for row in rows:
+            entry = {
+                'id': row['id'],
+                'date': row['date'],
+                'winner': row['winner'],
+                'player_score': row['player_score'],
+                'computer_score': row['computer_score'],
+                'total_rounds': row['total_rounds'],
+                'game_details': [],
+            }
+            entries.append(entry)
+            by_id[row['id']] = entry
+        if by_id:
+            placeholders = ','.join('?' * len(by_id))
+            for r in self._conn.execute(
+                    f"SELECT * FROM rounds WHERE game_id IN ({placeholders}) "
+                    "ORDER BY game_id, round", list(by_id)):
+                by_id[r['game_id']]['game_details'].append(
+                    {field: r[field] for field in ROUND_FIELDS})
+        return entries
@@ -0,0 +1,185 @@
+import json
+import os
+import threading
+from datetime import datetime
+
+# Taille des blocs lus depuis la fin du journal
+TAIL_BLOCK_SIZE = 64 * 1024
+
+
+class ScoreJournal:
+    """
+    Historique des parties en journal JSONL : une partie par ligne.
+
+    Enregistrer une partie ne fait qu'ajouter une ligne en fin de fichier.
+    Le journal est compacté (seules les `retention` dernières parties sont
+    gardées) lorsqu'il dépasse la limite de `compact_every` lignes, ce qui
+    amortit le coût de la réécriture sur de nombreuses parties.
+    """
+
+    def __init__(self, path, retention=100, compact_every=50, legacy_path=None):
+        """
+        Args:
+            path: Chemin du journal JSONL
+            retention: Nombre de parties conservées après compactage
+            compact_every: Nombre de lignes tolérées au-delà de `retention`
+            legacy_path: Ancien fichier JSON (liste complète) à migrer une fois
+        """
+        self.path = path
+        self.retention = retention
+        self.compact_every = compact_every
+        self.legacy_path = legacy_path
+        self._lock = threading.Lock()
+        self._line_count = None
+
+    def append(self, entry):
+        """Ajoute une partie à la fin du journal"""
+        line = json.dumps(entry, ensure_ascii=False, separators=(',', ':')) + '\n'
+        with self._lock:
+            self._ensure_ready()
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(line)
+            self._line_count += 1
+            if self._line_count > self.retention + self.compact_every:
+                self._compact()
+
+    def iter_recent(self, limit=None):
+        """
+        Parcourt les parties de la plus récente à la plus ancienne.
+
+        Le fichier est lu par blocs depuis la fin : seules les lignes
+        nécessaires sont lues et décodées.
+
+        Args:
+            limit: Nombre maximum de parties à retourner (toutes si None)
+        """
+        with self._lock:
+            self._ensure_ready()
+        return self._read_recent(limit)
+
+    def load(self, limit=None):
+        """Retourne les dernières parties dans l'ordre chronologique"""
+        entries = list(self.iter_recent(limit if limit is not None else self.retention))
+        entries.reverse()
+        return entries
+
+    def page(self, limit=20, before=None):
+        """
+        Retourne une page de parties, de la plus récente à la plus ancienne.
+
+        Args:
+            limit: Nombre de parties par page
+            before: Curseur (date de la dernière partie de la page précédente)
+
+        Returns:
+            tuple: (liste des parties, curseur de la page suivante ou None)
+
+        Raises:
+            ValueError: Si le curseur n'est pas une date ISO
+        """
+        if before:
+            try:
+                datetime.fromisoformat(before)
+            except ValueError:
+                raise ValueError(f"Curseur de pagination invalide: {before!r}") from None
+        entries = []
+        for entry in self.iter_recent():
+            if before and entry['date'] >= before:
+                continue
+            if len(entries) == limit:
+                return entries, entries[-1]['date']
+            entries.append(entry)
+        return entries, None
+
+    def compact(self):
+        """Réécrit le journal en ne gardant que les `retention` dernières parties"""
+        with self._lock:
+            self._ensure_ready()
+            self._compact()
+
+    def _compact(self):
+        entries = list(self._read_recent(self.retention))
+        entries.reverse()
+        self._write_all(entries)
+        self._line_count = len(entries)
+
+    def _read_recent(self, limit):
+        if limit is not None and limit <= 0:
+            return
+        try:
+            f = open(self.path, 'rb')
+        except FileNotFoundError:
+            return
+        with f:
+            f.seek(0, os.SEEK_END)
+            position = f.tell()
+            remainder = b''
+            count = 0
+            while position > 0:
+                size = min(TAIL_BLOCK_SIZE, position)
+                position -= size
+                f.seek(position)
+                lines = (f.read(size) + remainder).split(b'\n')
+                # La première ligne du bloc peut être incomplète
+                remainder = lines[0]
+                for line in reversed(lines[1:]):
+                    entry = self._parse(line)
+                    if entry is not None:
+                        yield entry
+                        count += 1
+                        if limit is not None and count >= limit:
+                            return
+            entry = self._parse(remainder)
+            if entry is not None:
+                yield entry
+
+    def _ensure_ready(self):
+        """Migre l'ancien fichier si besoin, compte les lignes du journal et termine la dernière (une seule fois)"""
+        if self._line_count is not None:
+            return
+        if not os.path.exists(self.path):
+            self._line_count = self._migrate_legacy()
+            return
+        with open(self.path, 'rb+') as f:
+            self._line_count = sum(1 for _ in f)
+            # Dernière ligne tronquée (arrêt pendant une écriture) : la terminer pour que
+            # la prochaine partie ne soit pas collée à elle, puis perdue avec elle
+            if f.tell() > 0:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b'\n':
+                    f.write(b'\n')
+
+    def _migrate_legacy(self):
+        """Convertit l'ancien `web_scores.json` en journal (une seule fois)"""
+        if not self.legacy_path or not os.path.exists(self.legacy_path):
+            return 0
+        try:
+            with open(self.legacy_path, 'r', encoding='utf-8') as f:
+                entries = json.load(f)
+        except (OSError, ValueError):
+            return 0
+        if not isinstance(entries, list):
+            return 0
+        entries = entries[-self.retention:]
+        self._write_all(entries)
+        print(f"Migration de {len(entries)} parties de {self.legacy_path} vers {self.path}")
+        return len(entries)
+
+    def _write_all(self, entries):
+        # Écriture dans un fichier temporaire puis remplacement atomique
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for entry in entries:
+                f.write(json.dumps(entry, ensure_ascii=False, separators=(',', ':')) + '\n')
+        os.replace(tmp_path, self.path)
+
+    @staticmethod
+    def _parse(line):
+        line = line.strip()
+        if not line:
+            return None
+        try:
+            return json.loads(line)
+        except ValueError:
+            # Ligne tronquée (arrêt pendant une écriture) : ignorée
+            return None
@@ -0,0 +1,112 @@
+import json
+import os
+import threading
+
+from gestures import MOVES, WEB_LABELS
+
+GESTURES = tuple(WEB_LABELS[move] for move in MOVES)
+
+# Version du format du fichier de statistiques
+STATS_VERSION = 1
+
+
+def empty_stats():
+    """Agrégats d'un historique vide"""
+    return {
+        'version': STATS_VERSION,
+        'total_games': 0,
+        'player_wins': 0,
+        'total_rounds': 0,
+        'player_gestures': {gesture: 0 for gesture in GESTURES},
+        'computer_gestures': {gesture: 0 for gesture in GESTURES},
+    }
+
+
+class ScoreStats:
+    """
+    Statistiques des parties, tenues à jour à chaque partie enregistrée.
+
+    Les agrégats sont gardés en mémoire et persistés dans un petit fichier
+    JSON à côté des scores ; ils ne sont recalculés depuis l'historique que si
+    ce fichier est absent ou illisible. Ils couvrent toutes les parties
+    enregistrées depuis le dernier recalcul, y compris celles retirées
+    ensuite de l'historique par la rétention.
+    """
+
+    def __init__(self, path, rebuild):
+        """
+        Args:
+            path: Chemin du fichier de statistiques
+            rebuild: Fonction retournant toutes les parties de l'historique
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._data = self._load()
+        if self._data is None:
+            self._data = empty_stats()
+            for entry in rebuild():
+                self._add(entry)
+            self._save()
+
+    def record(self, entry):
+        """Ajoute une partie aux agrégats (coût indépendant de l'historique)"""
+        with self._lock:
+            self._add(entry)
+            self._save()
+
+    def snapshot(self):
+        """Retourne les statistiques affichées par `/scores` et l'API"""
+        with self._lock:
+            data = self._data
+            total_games = data['total_games']
+            player_wins = data['player_wins']
+            return {
+                'total_games': total_games,
+                'player_wins': player_wins,
+                'computer_wins': total_games - player_wins,
+                'win_rate': round((player_wins / total_games * 100) if total_games > 0 else 0, 1),
+                'total_rounds': data['total_rounds'],
+                'avg_rounds': round(data['total_rounds'] / total_games, 1) if total_games > 0 else 0,
+                'player_gestures': dict(data['player_gestures']),
+                'computer_gestures': dict(data['computer_gestures']),
+            }
+
+    def _add(self, entry):
+        data = self._data
+        data['total_games'] += 1
+        if entry.get('winner') == 'Joueur':
+            data['player_wins'] += 1
+        history = entry.get('game_details') or []
+        data['total_rounds'] += entry.get('total_rounds', len(history))
+        for round_data in history:
+            for key, counts in (('player_gesture', data['player_gestures']),
+                                ('computer_gesture', data['computer_gestures'])):
+                gesture = round_data.get(key)
+                if gesture in counts:
+                    counts[gesture] += 1
+
+    def _load(self):
+        """Lit le fichier de statistiques ; None s'il est absent ou corrompu"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        reference = empty_stats()
+        if not isinstance(data, dict) or data.get('version') != STATS_VERSION:
+            return None
+        for key, value in reference.items():
+            if isinstance(value, dict):
+                counts = data.get(key)
+                if not isinstance(counts, dict) or not all(
+                        isinstance(counts.get(gesture), int) for gesture in value):
+                    return None
+            elif not isinstance(data.get(key), int):
+                return None
+        return data
+
+    def _save(self):
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._data, f)
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,63 @@
+"""
+Mode d'exécution du serveur web et modèle de concurrence.
+
+SHIFUMI_ASYNC_MODE choisit le mode de Flask-SocketIO :
+
+- threading (défaut) : un thread système par connexion (serveur de
+  développement de Werkzeug). Les images sont traitées par les threads de
+  l'InferenceScheduler ; run_blocking() appelle directement la fonction.
+
+- eventlet ou gevent (production) : une seule boucle d'événements
+  coopérative sert toutes les routes et toutes les connexions Socket.IO.
+  Le monkey patching est appliqué à l'import de ce module, qui doit donc
+  être importé avant tout autre module par app.py. Les threads de
+  l'InferenceScheduler deviennent des greenlets. Chacune de leurs images est
+  décodée et analysée par run_blocking() dans le pool de threads système de
+  la bibliothèque (eventlet.tpool, pool du hub gevent). OpenCV et MediaPipe
+  y relâchent le GIL, et la boucle continue de servir /play,
+  /api/game/state et les autres sockets pendant l'inférence. Le chargement
+  de la pile de vision, la construction des trackers et le préchauffage
+  passent aussi par run_blocking(). Tout le reste (état des parties,
+  métriques, émissions Socket.IO) ne s'exécute que dans la boucle.
+
+Le pool de processus d'inférence (SHIFUMI_INFERENCE_PROCESSES) n'est
+disponible qu'en mode threading.
+
+N'utilise que la bibliothèque standard en mode threading.
+"""
+import os
+
+ASYNC_MODES = ('threading', 'eventlet', 'gevent')
+
+ASYNC_MODE = os.environ.get('SHIFUMI_ASYNC_MODE', 'threading')
+if ASYNC_MODE not in ASYNC_MODES:
+    raise ValueError(f"SHIFUMI_ASYNC_MODE inconnu: {ASYNC_MODE} (attendu : {', '.join(ASYNC_MODES)})")
+
+if ASYNC_MODE == 'eventlet':
+    try:
+        import eventlet
+    except ImportError:
+        raise RuntimeError("SHIFUMI_ASYNC_MODE=eventlet nécessite le paquet eventlet") from None
+    eventlet.monkey_patch()
+    from eventlet import tpool
+
+    def run_blocking(func, *args):
+        """Exécute `func(*args)` dans un thread système sans bloquer la boucle d'événements"""
+        return tpool.execute(func, *args)
+
+elif ASYNC_MODE == 'gevent':
+    try:
+        from gevent import monkey
+    except ImportError:
+        raise RuntimeError("SHIFUMI_ASYNC_MODE=gevent nécessite le paquet gevent") from None
+    monkey.patch_all()
+    import gevent
+
+    def run_blocking(func, *args):
+        """Exécute `func(*args)` dans un thread système sans bloquer la boucle d'événements"""
+        return gevent.get_hub().threadpool.apply(func, args)
+
+else:
+    def run_blocking(func, *args):
+        """Exécute `func(*args)` : en mode threading, l'appelant est déjà un thread système"""
+        return func(*args)
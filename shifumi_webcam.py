@@ -2,9 +2,14 @@
 import cv2
 import mediapipe as mp
 import numpy as np
-import random
 import time
-from game_logic import finger_up, detect_sign, get_result
+from gestures import AUCUN, COMPUTER_WINS, GAME_LABELS, OUTCOMES, PLAYER_WINS
+from hand_roi import HandRoiTracker
+from hud import HudLayer
+from landmark_recording import LandmarkRecorder
+from opponent import create_opponent
+from frame_ring import FrameRing
+from webcam_pipeline import LatestSlot, CaptureThread, InferenceThread
 from datetime import datetime
 import os
 import json
@@ -21,6 +26,11 @@ WINDOW_WIDTH = 1280
 WINDOW_HEIGHT = 720
 SCORE_MAX = 5      # Score maximum pour gagner
 SCORES_FILE = "scores.json"
+# Fichier où enregistrer les points de repère détectés (désactivé si vide)
+RECORD_LANDMARKS = os.environ.get("SHIFUMI_RECORD_LANDMARKS")
+INFERENCE_READER = 0  # Index de lecteur de l'inférence dans l'anneau d'images
+DISPLAY_READER = 1    # Index de lecteur de l'affichage
+AI_STRATEGY = os.environ.get("SHIFUMI_AI_STRATEGY", "adaptive")
 
 def load_scores():
     """Charge l'historique des scores"""
@@ -84,41 +94,13 @@ def show_final_scores(scores):
     cv2.waitKey(0)
     cv2.destroyWindow("Tableau des Scores")
 
-def draw_text_with_background(frame, text, position, scale=1, color=(255, 255, 255), thickness=2):
-    """Dessine du texte avec un fond simple pour une meilleure lisibilité"""
-    font = cv2.FONT_HERSHEY_SIMPLEX
-    (text_width, text_height), baseline = cv2.getTextSize(text, font, scale, thickness)
-    
-    # Calcul des dimensions du rectangle
-    padding = 5
-    x1 = position[0] - padding
-    y1 = position[1] - text_height - padding
-    x2 = position[0] + text_width + padding
-    y2 = position[1] + padding
-
-    # Dessiner le fond noir
-    cv2.rectangle(frame, (x1, y1), (x2, y2), (0, 0, 0), -1)
-    
-    # Dessiner le texte
-    cv2.putText(frame, text, position, font, scale, color, thickness)
-    
-    # Dessiner le texte avec contour pour plus de lisibilité
-    # Contour noir
-    cv2.putText(frame, text, position, font, scale, (0, 0, 0), thickness + 2)
-    # Texte principal
-    cv2.putText(frame, text, position, font, scale, color, thickness)
+def compose_game_over(layer, winner, score_joueur, score_ordi):
+    """Dessine l'écran de fin de partie dans le calque d'interface"""
+    center_y = layer.height // 2
 
-def show_game_over(frame, winner, score_joueur, score_ordi):
-    """Affiche l'écran de fin de partie"""
-    height, width = frame.shape[:2]
-    
     # Fond noir semi-transparent
-    overlay = np.zeros_like(frame)
-    cv2.addWeighted(frame, 0.3, overlay, 0.7, 0, frame)
-    
-    # Position centrale pour le texte
-    center_y = height // 2
-    
+    layer.dim(0.7)
+
     # Message de victoire
     if winner == "Joueur":
         message = "VICTOIRE DU JOUEUR !"
@@ -126,51 +108,116 @@ def show_game_over(frame, winner, score_joueur, score_ordi):
     else:
         message = "VICTOIRE DE L'ORDINATEUR !"
         winner_color = (0, 255, 255)
-    
-    # Centrer le texte
-    text_size = cv2.getTextSize(message, cv2.FONT_HERSHEY_SIMPLEX, 2.0, 3)[0]
-    text_x = (width - text_size[0]) // 2
-    draw_text_with_background(frame, message, 
-                            (text_x, center_y - 60), 
-                            2.0, winner_color, 3)
-    
+    layer.text_centered(message, center_y - 60, 2.0, winner_color, 3)
+
     # Score final
     score_text = f"Score Final - Joueur : {score_joueur}  Ordinateur : {score_ordi}"
-    text_size = cv2.getTextSize(score_text, cv2.FONT_HERSHEY_SIMPLEX, 1.0, 2)[0]
-    text_x = (width - text_size[0]) // 2
-    draw_text_with_background(frame, score_text, 
-                            (text_x, center_y), 
-                            1.0, (255, 255, 255), 2)
-    
+    layer.text_centered(score_text, center_y, 1.0, (255, 255, 255), 2)
+
     # Instructions
     instructions = [
         ["[R] Recommencer", (255, 255, 255)],
         ["[ESPACE] Voir les scores", (255, 255, 255)],
         ["[Q] Quitter", (255, 255, 255)]
     ]
-    
+
     for i, (text, color) in enumerate(instructions):
-        text_size = cv2.getTextSize(text, cv2.FONT_HERSHEY_SIMPLEX, 1.0, 2)[0]
-        text_x = (width - text_size[0]) // 2
-        draw_text_with_background(frame, text, 
-                                (text_x, center_y + 40 + i * 40), 
-                                1.0, color, 2)
-    
-    cv2.imshow("Shifumi", frame)
-    
+        layer.text_centered(text, center_y + 40 + i * 40, 1.0, color, 2)
+
+def show_game_over(frame, winner, score_joueur, score_ordi, hud):
+    """Affiche l'écran de fin de partie"""
+    hud.compose(("game_over", winner, score_joueur, score_ordi), frame.shape,
+                lambda layer: compose_game_over(layer, winner, score_joueur, score_ordi))
+    hud.apply(frame)
     cv2.imshow("Shifumi", frame)
 
+def compose_game_hud(layer, hand_sides, countdown, player_choice, score_joueur,
+                     computer_choice, score_ordi, round_result, message):
+    """
+    Dessine l'interface de jeu dans le calque.
+
+    Args:
+        layer: Calque HudLayer à remplir
+        hand_sides: Tuple de booléens (True = main droite) des mains détectées
+        countdown: Secondes restantes du compte à rebours, ou None
+        player_choice: Code du geste courant du joueur
+        score_joueur: Score du joueur
+        computer_choice: Code du coup de l'ordinateur, ou None en attente
+        score_ordi: Score de l'ordinateur
+        round_result: Issue de la dernière manche (gestures.OUTCOMES), ou None
+        message: (texte, couleur) du message d'état, ou None
+    """
+    width, height = layer.width, layer.height
+
+    # Informations sur les mains détectées
+    for is_right_hand in hand_sides:
+        hand_info = "Main DROITE detectee" if is_right_hand else "Main GAUCHE detectee"
+        text_x = width - layer.measure(hand_info, 1.0, 2)[0] - 20
+        layer.text(hand_info, (text_x, 350), 1, (255, 255, 0), 2)
+
+    # Compte à rebours
+    if countdown is not None:
+        text = str(countdown)
+        text_height = layer.measure(text, 4, 4)[1]
+        layer.text_centered(text, (height + text_height) // 2, 4, (255, 255, 255), 4)
+
+    # Interface utilisateur - Titre
+    layer.text_centered("SHIFUMI", 50, 2.0, (255, 215, 0), 3)
+
+    # Zone de jeu du joueur
+    layer.text("JOUEUR", (50, 100), 1.5, (0, 255, 0), 2)
+    layer.text(f"Choix : {GAME_LABELS[player_choice].upper()}", (50, 150), 1.0, (0, 255, 0), 2)
+    layer.text(f"Score : {score_joueur}/{SCORE_MAX}", (50, 200), 1.0, (0, 255, 0), 2)
+
+    # Zone de jeu de l'ordinateur
+    computer_label = GAME_LABELS[computer_choice] if computer_choice is not None else "En attente..."
+    layer.text("ORDINATEUR", (width - 300, 100), 1.5, (0, 255, 255), 2)
+    layer.text(f"Choix : {computer_label}", (width - 300, 150), 1.0, (0, 255, 255), 2)
+    layer.text(f"Score : {score_ordi}/{SCORE_MAX}", (width - 300, 200), 1.0, (0, 255, 255), 2)
+
+    # Afficher le résultat du round
+    if round_result is not None:
+        if round_result == PLAYER_WINS:
+            result_text = "VICTOIRE DU JOUEUR"
+            result_color = (0, 255, 0)
+        elif round_result == COMPUTER_WINS:
+            result_text = "VICTOIRE DE L'ORDINATEUR"
+            result_color = (0, 255, 255)
+        else:
+            result_text = "EGALITE"
+            result_color = (255, 255, 255)
+        layer.text_centered(result_text, height // 2, 2, result_color, 2)
+
+    # Messages d'état et instructions
+    if message is not None:
+        text, color = message
+        layer.text_centered(text, height - 50, 1, color, 2)
+
+def stop_pipeline(*threads):
+    """Arrête les threads de capture et d'inférence"""
+    for thread in threads:
+        if thread is not None:
+            thread.stop()
+    for thread in threads:
+        if thread is not None:
+            thread.join(timeout=2)
+
 def main():
     # Variables de gestion de la détection
-    last_valid_choice = "inconnu"
+    last_valid_choice = AUCUN
     frames_without_detection = 0
     MAX_FRAMES_WITHOUT_DETECTION = 30  # Environ 1 seconde à 30 FPS
     reconnection_attempts = 0
     MAX_RECONNECTION_ATTEMPTS = 3
     cap = None
+    capture_thread = inference_thread = None
+    recorder = None
+    ring = None
 
     # Charger l'historique des scores
     scores = load_scores()
+    # L'adversaire apprend les habitudes du joueur d'une partie à l'autre
+    opponent = create_opponent(AI_STRATEGY)
 
     while reconnection_attempts < MAX_RECONNECTION_ATTEMPTS:
         try:
@@ -199,41 +246,66 @@ def main():
             
             # Initialisation de MediaPipe
             print("Initialisation de MediaPipe Hands...")
-            hands = mp_hands.Hands(
+            # Deux mains possibles : chaque image est analysée en entier (voir HandRoiTracker)
+            hands = HandRoiTracker(mp_hands.Hands(
                 static_image_mode=False,
                 max_num_hands=2,
                 model_complexity=0,
                 min_detection_confidence=0.7,
                 min_tracking_confidence=0.7
-            )
+            ), max_num_hands=2)
             print("MediaPipe Hands initialisé avec succès!")
+            if RECORD_LANDMARKS:
+                recorder = LandmarkRecorder(RECORD_LANDMARKS)
+                print(f"Enregistrement des points de repère dans {RECORD_LANDMARKS}")
 
             # Variables du jeu
             score_joueur = 0
             score_ordi = 0
             last_play_time = 0
-            computer_choice = "En attente..."
+            computer_choice = None  # Code du coup de l'ordinateur, None en attente
             game_state = "waiting"
             countdown_start = 0
             current_round_result = None
-            player_choice = "inconnu"
+            player_choice = AUCUN
             game_over = False
             
+            # Capture et inférence tournent dans leurs propres threads ; l'affichage
+            # suit le rythme de la caméra en réutilisant les dernières mains détectées.
+            # Les images passent par un anneau préalloué : l'inférence les lit sur
+            # place, l'affichage les copie dans son propre tampon
+            ring = FrameRing((actual_height, actual_width, 3), slots=4, readers=2)
+            display = np.empty(ring.shape, dtype=np.uint8)
+            detections = LatestSlot()
+            capture_thread = CaptureThread(cap, ring)
+            inference_thread = InferenceThread(hands, ring, detections, recorder, reader=INFERENCE_READER)
+            capture_thread.start()
+            inference_thread.start()
+            frame_version = 0
+            detection_version = 0
+            detection = None
+            hand_detected = False
+            hud = HudLayer()
+            
             # Boucle principale du jeu
             while True:
                 try:
-                    ret, frame = cap.read()
-                    if not ret:
-                        print("Erreur de lecture de la caméra, tentative de récupération...")
-                        time.sleep(0.1)
+                    # Attendre une nouvelle image de la caméra
+                    if not ring.wait_newer(frame_version, timeout=1.0):
                         continue
-
-                    frame = cv2.flip(frame, 1)
+                    acquired = ring.acquire_read(DISPLAY_READER, frame_version)
+                    if acquired is None:
+                        continue
+                    frame_version, slot, captured = acquired
+                    # L'inférence peut encore lire cette image : on dessine sur le tampon d'affichage
+                    np.copyto(display, captured)
+                    ring.release_read(DISPLAY_READER, slot)
+                    frame = display
 
                     # Si le jeu est terminé, afficher l'écran de fin
                     if game_over:
                         winner = "Joueur" if score_joueur > score_ordi else "Ordinateur"
-                        show_game_over(frame, winner, score_joueur, score_ordi)
+                        show_game_over(frame, winner, score_joueur, score_ordi, hud)
                         key = cv2.waitKey(1) & 0xFF
                         if key == ord(" "):  # Espace pour voir les scores
                             show_final_scores(scores)
@@ -242,29 +314,37 @@ def main():
                             score_joueur = 0
                             score_ordi = 0
                             game_state = "waiting"
-                            computer_choice = "En attente..."
+                            computer_choice = None
                             current_round_result = None
-                            player_choice = "inconnu"
+                            player_choice = AUCUN
                             game_over = False
                         elif key == ord("q"):  # Q pour quitter
                             break
                         continue
 
-                    rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                    result = hands.process(rgb)
-
-                    hand_detected = False
-                    current_choice = "inconnu"
-
-                    if result.multi_hand_landmarks:
-                        hand_detected = True
-                        frames_without_detection = 0
-                        
-                        for hand_landmarks, handedness in zip(result.multi_hand_landmarks, result.multi_handedness):
-                            hand_type = handedness.classification[0].label
-                            landmarks = hand_landmarks.landmark
-                            is_right_hand = (hand_type == "Right")
-                            
+                    # Mettre à jour le choix du joueur à chaque nouveau résultat d'inférence
+                    new_version, new_detection = detections.latest()
+                    if new_version != detection_version:
+                        detection_version = new_version
+                        detection = new_detection
+                        hand_detected = bool(detection.hands)
+
+                        if hand_detected:
+                            frames_without_detection = 0
+                            for hand_landmarks, is_right_hand, current_choice in detection.hands:
+                                if current_choice != AUCUN:
+                                    player_choice = current_choice
+                                    last_valid_choice = current_choice
+                        else:
+                            frames_without_detection += 1
+                            if frames_without_detection < MAX_FRAMES_WITHOUT_DETECTION and game_state != "waiting":
+                                # Utiliser le dernier choix valide pendant un court moment
+                                player_choice = last_valid_choice
+                            else:
+                                player_choice = AUCUN
+
+                    if detection is not None:
+                        for hand_landmarks, is_right_hand, current_choice in detection.hands:
                             # Dessiner les mains
                             mp_drawing.draw_landmarks(
                                 frame, 
@@ -273,32 +353,14 @@ def main():
                                 mp_drawing_styles.get_default_hand_landmarks_style(),
                                 mp_drawing_styles.get_default_hand_connections_style()
                             )
-                            
-                            # Détecter le signe
-                            current_choice = detect_sign(landmarks, is_right_hand)
-                            if current_choice != "inconnu":
-                                player_choice = current_choice
-                                last_valid_choice = current_choice
-                            
-                            # Afficher les informations sur la main
-                            hand_info = "Main DROITE detectee" if is_right_hand else "Main GAUCHE detectee"
-                            text_size = cv2.getTextSize(hand_info, cv2.FONT_HERSHEY_SIMPLEX, 1.0, 2)[0]
-                            text_x = actual_width - text_size[0] - 20
-                            draw_text_with_background(frame, hand_info, (text_x, 350), 1, (255, 255, 0), 2)
-                    else:
-                        frames_without_detection += 1
-                        if frames_without_detection < MAX_FRAMES_WITHOUT_DETECTION and game_state != "waiting":
-                            # Utiliser le dernier choix valide pendant un court moment
-                            player_choice = last_valid_choice
-                        else:
-                            player_choice = "inconnu"
 
                     # Gestion des états du jeu
                     current_time = time.time()
+                    countdown = None
                     
                     if game_state == "waiting":
-                        computer_choice = "En attente..."
-                        if player_choice != "inconnu":
+                        computer_choice = None
+                        if player_choice != AUCUN:
                             game_state = "countdown"
                             countdown_start = current_time
                             current_round_result = None
@@ -306,14 +368,15 @@ def main():
                     elif game_state == "countdown":
                         remaining_time = int(COUNTDOWN_TIME - (current_time - countdown_start))
                         if remaining_time <= 0:
-                            if player_choice != "inconnu":
+                            if player_choice != AUCUN:
                                 game_state = "playing"
-                                computer_choice = random.choice(["pierre", "feuille", "ciseaux"])
-                                current_round_result = get_result(player_choice, computer_choice)
+                                computer_choice = opponent.choose()
+                                current_round_result = OUTCOMES[player_choice][computer_choice]
+                                opponent.observe(player_choice)
                                 
-                                if current_round_result == "Joueur":
+                                if current_round_result == PLAYER_WINS:
                                     score_joueur += 1
-                                elif current_round_result == "Ordinateur":
+                                elif current_round_result == COMPUTER_WINS:
                                     score_ordi += 1
                                 
                                 # Vérifier si le score maximum est atteint
@@ -326,62 +389,26 @@ def main():
                             else:
                                 game_state = "waiting"
                         else:
-                            text = str(remaining_time)
-                            text_size = cv2.getTextSize(text, cv2.FONT_HERSHEY_SIMPLEX, 4, 4)[0]
-                            text_x = (actual_width - text_size[0]) // 2
-                            text_y = (actual_height + text_size[1]) // 2
-                            draw_text_with_background(frame, text, (text_x, text_y), 4, (255, 255, 255), 4)
+                            countdown = remaining_time
                     
                     elif game_state == "playing":
                         if current_time - last_play_time > ROUND_PAUSE:
                             game_state = "waiting"
 
-                    # Interface utilisateur - Titre
-                    title = "SHIFUMI"
-                    text_size = cv2.getTextSize(title, cv2.FONT_HERSHEY_SIMPLEX, 2.0, 3)[0]
-                    text_x = (actual_width - text_size[0]) // 2
-                    draw_text_with_background(frame, title, (text_x, 50), 2.0, (255, 215, 0), 3)
-
-                    # Zone de jeu du joueur
-                    draw_text_with_background(frame, "JOUEUR", (50, 100), 1.5, (0, 255, 0), 2)
-                    draw_text_with_background(frame, f"Choix : {player_choice.upper()}", (50, 150), 1.0, (0, 255, 0), 2)
-                    draw_text_with_background(frame, f"Score : {score_joueur}/{SCORE_MAX}", (50, 200), 1.0, (0, 255, 0), 2)
-
-                    # Zone de jeu de l'ordinateur
-                    draw_text_with_background(frame, "ORDINATEUR", (actual_width - 300, 100), 1.5, (0, 255, 255), 2)
-                    draw_text_with_background(frame, f"Choix : {computer_choice}", (actual_width - 300, 150), 1.0, (0, 255, 255), 2)
-                    draw_text_with_background(frame, f"Score : {score_ordi}/{SCORE_MAX}", (actual_width - 300, 200), 1.0, (0, 255, 255), 2)
-
-                    # Afficher le résultat du round
-                    if current_round_result:
-                        if current_round_result == "Joueur":
-                            result_text = "VICTOIRE DU JOUEUR"
-                            result_color = (0, 255, 0)
-                        elif current_round_result == "Ordinateur":
-                            result_text = "VICTOIRE DE L'ORDINATEUR"
-                            result_color = (0, 255, 255)
-                        else:
-                            result_text = "EGALITE"
-                            result_color = (255, 255, 255)
-                        
-                        text_size = cv2.getTextSize(result_text, cv2.FONT_HERSHEY_SIMPLEX, 2.0, 2)[0]
-                        text_x = (actual_width - text_size[0]) // 2
-                        draw_text_with_background(frame, result_text, 
-                                               (text_x, actual_height//2), 2, result_color, 2)
-
                     # Messages d'état et instructions
                     if not hand_detected:
-                        message = "En attente de detection de main..."
-                        text_size = cv2.getTextSize(message, cv2.FONT_HERSHEY_SIMPLEX, 1.0, 2)[0]
-                        text_x = (actual_width - text_size[0]) // 2
-                        draw_text_with_background(frame, message, 
-                            (text_x, actual_height - 50), 1, (200, 200, 200), 2)
+                        message = ("En attente de detection de main...", (200, 200, 200))
                     elif game_state == "waiting":
-                        message = "Montrez votre main pour commencer"
-                        text_size = cv2.getTextSize(message, cv2.FONT_HERSHEY_SIMPLEX, 1.0, 2)[0]
-                        text_x = (actual_width - text_size[0]) // 2
-                        draw_text_with_background(frame, message, 
-                            (text_x, actual_height - 50), 1, (255, 255, 255), 2)
+                        message = ("Montrez votre main pour commencer", (255, 255, 255))
+                    else:
+                        message = None
+
+                    # Interface : le calque n'est recomposé que si son contenu change
+                    hand_sides = tuple(is_right_hand for _, is_right_hand, _ in detection.hands) if detection else ()
+                    hud_state = (hand_sides, countdown, player_choice, score_joueur,
+                                 computer_choice, score_ordi, current_round_result, message)
+                    hud.compose(hud_state, frame.shape, lambda layer: compose_game_hud(layer, *hud_state))
+                    hud.apply(frame)
 
                     if not game_over:
                         # Affichage de la fenêtre
@@ -396,6 +423,11 @@ def main():
                     continue
 
             # Nettoyage
+            stop_pipeline(capture_thread, inference_thread)
+            hands.close()
+            ring.close()
+            if recorder is not None:
+                recorder.close()
             if cap is not None:
                 cap.release()
             cv2.destroyAllWindows()
@@ -403,6 +435,11 @@ def main():
 
         except Exception as e:
             print(f"Erreur lors de l'initialisation: {e}")
+            stop_pipeline(capture_thread, inference_thread)
+            capture_thread = inference_thread = None
+            if recorder is not None:
+                recorder.close()
+                recorder = None
             if cap is not None:
                 cap.release()
             reconnection_attempts += 1
@@ -0,0 +1,376 @@
+"""
+Simulation vectorisée de parties entre un modèle de joueur et une stratégie
+de l'ordinateur.
+
+Toutes les parties d'un lot avancent ensemble, une manche à la fois : les
+coups sont des codes entiers (PIERRE, PAPIER, CISEAUX) et l'issue de chaque
+manche est lue dans game_logic.RESULT_TABLE, qui reprend les règles de
+get_result. Les stratégies reproduisent celles d'opponent.py (mêmes
+prédicteurs, même notation) sur des tableaux de N parties.
+
+Usage :
+    python simulation.py --player cycle --strategy adaptive --games 1000000
+    python simulation.py --matrix --games 100000
+"""
+import argparse
+import json
+import sys
+import time
+
+import numpy as np
+
+from game_logic import RESULT_TABLE
+from opponent import STRATEGIES
+
+DEFAULT_BATCH_SIZE = 100_000
+DEFAULT_MAX_ROUNDS = 500  # Au-delà, une partie (suite d'égalités) est abandonnée
+
+
+def _counter_or_random(predictions, rng):
+    """Coup qui bat chaque prédiction, ou coup au hasard là où il n'y en a pas (-1)"""
+    moves = rng.integers(0, 3, size=predictions.shape[0])
+    known = predictions >= 0
+    moves[known] = (predictions[known] + 1) % 3
+    return moves
+
+
+# Modèles de joueur. Interface commune :
+#   start(games, rng)             prépare l'état de `games` parties
+#   play(live, round_index)       coups des parties encore en cours (indices `live`)
+#   observe(live, player, computer)  prend en compte les coups de la manche
+
+class UniformPlayer:
+    """Joue au hasard"""
+
+    def start(self, games, rng):
+        self.rng = rng
+
+    def play(self, live, round_index):
+        return self.rng.integers(0, 3, size=live.shape[0])
+
+    def observe(self, live, player, computer):
+        pass
+
+
+class BiasedPlayer(UniformPlayer):
+    """Joue au hasard avec des probabilités fixes (pierre, papier, ciseaux)"""
+
+    def __init__(self, probabilities=(0.5, 0.3, 0.2)):
+        self.probabilities = np.asarray(probabilities, dtype=np.float64)
+
+    def play(self, live, round_index):
+        return self.rng.choice(3, size=live.shape[0], p=self.probabilities)
+
+
+class CyclePlayer(UniformPlayer):
+    """Répète une suite de coups"""
+
+    def __init__(self, pattern=(0, 1, 2)):
+        self.pattern = tuple(pattern)
+
+    def play(self, live, round_index):
+        return np.full(live.shape[0], self.pattern[round_index % len(self.pattern)])
+
+
+class StickyPlayer:
+    """Rejoue son coup précédent avec une probabilité `repeat`, sinon joue au hasard"""
+
+    def __init__(self, repeat=0.6):
+        self.repeat = repeat
+
+    def start(self, games, rng):
+        self.rng = rng
+        self.last = np.full(games, -1, dtype=np.int8)
+
+    def play(self, live, round_index):
+        moves = self.rng.integers(0, 3, size=live.shape[0])
+        last = self.last[live]
+        keep = (last >= 0) & (self.rng.random(live.shape[0]) < self.repeat)
+        moves[keep] = last[keep]
+        return moves
+
+    def observe(self, live, player, computer):
+        self.last[live] = player
+
+
+class BeatLastPlayer:
+    """Joue le coup qui bat le coup précédent de l'ordinateur"""
+
+    def start(self, games, rng):
+        self.rng = rng
+        self.last = np.full(games, -1, dtype=np.int8)
+
+    def play(self, live, round_index):
+        return _counter_or_random(self.last[live], self.rng)
+
+    def observe(self, live, player, computer):
+        self.last[live] = computer
+
+
+PLAYER_MODELS = {
+    'uniform': UniformPlayer,
+    'biased': BiasedPlayer,
+    'cycle': CyclePlayer,
+    'sticky': StickyPlayer,
+    'beat-last': BeatLastPlayer,
+}
+
+
+# Prédicteurs vectorisés, équivalents à ceux d'opponent.py :
+# predict(live) retourne le coup prédit par partie, -1 s'il n'y en a pas
+
+class FrequencyPredictor:
+    """Coup le plus joué par le joueur"""
+
+    def start(self, games):
+        self.counts = np.zeros((games, 3), dtype=np.int32)
+
+    def predict(self, live):
+        counts = self.counts[live]
+        predictions = counts.argmax(axis=1)
+        predictions[counts.max(axis=1) == 0] = -1
+        return predictions
+
+    def update(self, live, player):
+        self.counts[live, player] += 1
+
+
+class MarkovPredictor:
+    """Coup le plus joué après les `order` derniers coups du joueur"""
+
+    def __init__(self, order=1):
+        if order < 1:
+            raise ValueError("L'ordre d'un prédicteur de Markov doit être au moins 1")
+        self.order = order
+        self.modulo = 3 ** order
+
+    def start(self, games):
+        # Une ligne de 3 comptes par (partie, contexte) : ligne = partie * 3 ** order + contexte
+        self.counts = np.zeros((games * self.modulo, 3), dtype=np.int32)
+        self.context = np.zeros(games, dtype=np.int64)
+        self.seen = np.zeros(games, dtype=np.int8)  # Coups observés, plafonné à l'ordre
+
+    def predict(self, live):
+        counts = self.counts[live * self.modulo + self.context[live]]
+        predictions = counts.argmax(axis=1)
+        predictions[(counts.max(axis=1) == 0) | (self.seen[live] < self.order)] = -1
+        return predictions
+
+    def update(self, live, player):
+        context = self.context[live]
+        ready = self.seen[live] >= self.order
+        self.counts[live[ready] * self.modulo + context[ready], player[ready]] += 1
+        self.seen[live[~ready]] += 1
+        self.context[live] = (context * 3 + player) % self.modulo
+
+
+class PredictorStrategy:
+    """
+    Stratégie de l'ordinateur : version vectorisée d'opponent.Opponent.
+
+    Les prédicteurs sont notés partie par partie (+1 / -1 avec oubli) et
+    l'ordinateur bat la prédiction du mieux noté, s'il a une note positive ;
+    sinon il joue au hasard.
+    """
+
+    def __init__(self, predictors=(), decay=0.9):
+        self.predictors = list(predictors)
+        self.decay = decay
+
+    def start(self, games, rng):
+        self.rng = rng
+        self.scores = np.zeros((len(self.predictors), games), dtype=np.float64)
+        self._cached = (None, None)
+        for predictor in self.predictors:
+            predictor.start(games)
+
+    def play(self, live, round_index):
+        if not self.predictors:
+            return self.rng.integers(0, 3, size=live.shape[0])
+        predictions = self._predict(live)
+        scores = self.scores[:, live]
+        eligible = (scores > 0) & (predictions >= 0)
+        # Comme Opponent.choose : le premier des mieux notés parmi ceux qui prédisent
+        best = np.where(eligible, scores, -np.inf).argmax(axis=0)
+        chosen = predictions[best, np.arange(live.shape[0])]
+        chosen[~eligible.any(axis=0)] = -1
+        return _counter_or_random(chosen, self.rng)
+
+    def observe(self, live, player, computer):
+        if not self.predictors:
+            return
+        all_predictions = self._predict(live)
+        for index, predictor in enumerate(self.predictors):
+            predictions = all_predictions[index]
+            known = predictions >= 0
+            scores = self.scores[index, live]
+            hit = np.where(predictions == player, 1.0, -1.0)
+            self.scores[index, live] = np.where(known, scores * self.decay + hit, scores)
+            predictor.update(live, player)
+
+    def _predict(self, live):
+        """Prédictions (prédicteurs x parties), calculées une fois par manche pour play et observe"""
+        cached_live, predictions = self._cached
+        if cached_live is not live:
+            predictions = np.stack([predictor.predict(live) for predictor in self.predictors])
+            self._cached = (live, predictions)
+        return predictions
+
+
+def create_strategy(name):
+    """Stratégie vectorisée de même nom qu'opponent.create_opponent"""
+    if name == "random":
+        predictors = ()
+    elif name == "frequency":
+        predictors = (FrequencyPredictor(),)
+    elif name == "adaptive":
+        predictors = (FrequencyPredictor(), MarkovPredictor(1), MarkovPredictor(2), MarkovPredictor(3))
+    elif name.startswith("markov") and name[6:].isdigit():
+        predictors = (MarkovPredictor(int(name[6:])),)
+    else:
+        raise ValueError(f"Stratégie inconnue: {name}")
+    return PredictorStrategy(predictors)
+
+
+def create_player(name):
+    """Modèle de joueur à partir de son nom (PLAYER_MODELS)"""
+    try:
+        return PLAYER_MODELS[name]()
+    except KeyError:
+        raise ValueError(f"Modèle de joueur inconnu: {name}") from None
+
+
+def simulate_batch(player, computer, games, points_to_win=5, rng=None, max_rounds=DEFAULT_MAX_ROUNDS):
+    """
+    Joue `games` parties en parallèle jusqu'à `points_to_win` points.
+
+    Args:
+        player: Modèle de joueur
+        computer: Stratégie de l'ordinateur
+        games: Nombre de parties
+        points_to_win: Points nécessaires pour gagner une partie
+        rng: Générateur numpy (np.random.Generator)
+        max_rounds: Nombre maximum de manches par partie
+
+    Returns:
+        tuple: (gagnants, longueurs, manches nulles) ; gagnant 1 = joueur,
+        -1 = ordinateur, 0 = partie abandonnée après max_rounds manches
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    player.start(games, rng)
+    computer.start(games, rng)
+    player_score = np.zeros(games, dtype=np.int16)
+    computer_score = np.zeros(games, dtype=np.int16)
+    winners = np.zeros(games, dtype=np.int8)
+    lengths = np.full(games, max_rounds, dtype=np.int32)
+    draws = 0
+    live = np.arange(games)
+    for round_index in range(max_rounds):
+        if not live.size:
+            break
+        player_moves = player.play(live, round_index)
+        computer_moves = computer.play(live, round_index)
+        outcomes = RESULT_TABLE[player_moves, computer_moves]
+        draws += int(np.count_nonzero(outcomes == 0))
+        player_score[live] += outcomes == 1
+        computer_score[live] += outcomes == -1
+        player.observe(live, player_moves, computer_moves)
+        computer.observe(live, player_moves, computer_moves)
+
+        done = (player_score[live] >= points_to_win) | (computer_score[live] >= points_to_win)
+        finished = live[done]
+        lengths[finished] = round_index + 1
+        winners[finished] = np.where(player_score[finished] >= points_to_win, 1, -1)
+        live = live[~done]
+    return winners, lengths, draws
+
+
+def simulate(player='uniform', strategy='adaptive', games=1_000_000, points_to_win=5,
+             seed=None, batch_size=DEFAULT_BATCH_SIZE, max_rounds=DEFAULT_MAX_ROUNDS,
+             clock=time.perf_counter):
+    """
+    Simule des parties par lots et résume leurs issues.
+
+    Args:
+        player: Nom du modèle de joueur (PLAYER_MODELS)
+        strategy: Nom de la stratégie de l'ordinateur (opponent.STRATEGIES, markovK)
+        games: Nombre total de parties
+        points_to_win: Points nécessaires pour gagner une partie
+        seed: Graine du générateur aléatoire
+        batch_size: Parties simulées ensemble (borne la mémoire)
+        max_rounds: Nombre maximum de manches par partie
+
+    Returns:
+        dict: Taux de victoire, répartition des longueurs de partie et débit
+    """
+    rng = np.random.default_rng(seed)
+    outcome_counts = np.zeros(3, dtype=np.int64)  # abandonnées, joueur, ordinateur
+    length_counts = np.zeros(max_rounds + 1, dtype=np.int64)
+    draws = 0
+    started = clock()
+    for start in range(0, games, batch_size):
+        count = min(batch_size, games - start)
+        winners, lengths, batch_draws = simulate_batch(
+            create_player(player), create_strategy(strategy), count, points_to_win, rng, max_rounds)
+        outcome_counts += np.bincount(np.where(winners == -1, 2, winners), minlength=3)
+        length_counts += np.bincount(lengths, minlength=max_rounds + 1)
+        draws += batch_draws
+    elapsed = clock() - started
+
+    rounds = int(length_counts @ np.arange(max_rounds + 1))
+    cumulative = np.cumsum(length_counts)
+    return {
+        'player': player,
+        'strategy': strategy,
+        'games': games,
+        'points_to_win': points_to_win,
+        'player_win_rate': round(outcome_counts[1] / games, 6) if games else None,
+        'computer_win_rate': round(outcome_counts[2] / games, 6) if games else None,
+        'unfinished': int(outcome_counts[0]),
+        'rounds': rounds,
+        'draw_rate': round(draws / rounds, 6) if rounds else None,
+        'game_length': {
+            'mean': round(rounds / games, 3) if games else None,
+            'median': int(np.searchsorted(cumulative, games / 2)) if games else None,
+            'p95': int(np.searchsorted(cumulative, 0.95 * games)) if games else None,
+            'min': int(np.flatnonzero(length_counts)[0]) if games else None,
+            'max': int(np.flatnonzero(length_counts)[-1]) if games else None,
+            'distribution': {int(length): int(count)
+                             for length, count in enumerate(length_counts) if count},
+        },
+        'seconds': round(elapsed, 6),
+        'games_per_sec': round(games / elapsed, 1) if elapsed > 0 else None,
+        'rounds_per_sec': round(rounds / elapsed, 1) if elapsed > 0 else None,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulation de parties contre les stratégies de l'ordinateur")
+    parser.add_argument('--player', choices=sorted(PLAYER_MODELS), default='uniform',
+                        help="Modèle de joueur")
+    parser.add_argument('--strategy', default='adaptive',
+                        help=f"Stratégie de l'ordinateur ({', '.join(STRATEGIES)} ou markovK)")
+    parser.add_argument('--games', type=int, default=1_000_000, help="Nombre de parties")
+    parser.add_argument('--points', type=int, default=5, help="Points pour gagner une partie")
+    parser.add_argument('--seed', type=int, default=None, help="Graine du générateur aléatoire")
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+                        help="Parties simulées ensemble")
+    parser.add_argument('--matrix', action='store_true',
+                        help="Taux de victoire de l'ordinateur pour chaque joueur et chaque stratégie")
+    args = parser.parse_args(argv)
+
+    if args.matrix:
+        matrix = {player: {strategy: simulate(player, strategy, args.games, args.points,
+                                              args.seed, args.batch_size)['computer_win_rate']
+                           for strategy in STRATEGIES}
+                  for player in sorted(PLAYER_MODELS)}
+        print(json.dumps(matrix, indent=2))
+        return 0
+
+    result = simulate(args.player, args.strategy, args.games, args.points, args.seed, args.batch_size)
+    print(json.dumps(result, indent=2, ensure_ascii=False))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
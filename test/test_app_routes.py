@@ -0,0 +1,100 @@
+import importlib
+import time
+
+import pytest
+
+@pytest.fixture(scope='module')
+def app_module(tmp_path_factory):
+    """Module `app` dont les scores sont écrits dans un dossier temporaire"""
+    workdir = tmp_path_factory.mktemp('app')
+    with pytest.MonkeyPatch.context() as mp:
+        mp.chdir(workdir)
+        mp.setenv('SHIFUMI_SCORES_FILE', str(workdir / 'web_scores.jsonl'))
+        yield importlib.import_module('app')
+
+def connect(app_module):
+    """Client HTTP et client Socket.IO partageant la même session"""
+    http = app_module.app.test_client()
+    # Comme la page, qui attribue la partie à la session avant d'ouvrir le socket
+    http.get('/')
+    sock = app_module.socketio.test_client(app_module.app, flask_test_client=http)
+    return http, sock
+
+def received(sock, name):
+    return [message['args'][0] for message in sock.get_received() if message['name'] == name]
+
+def wait_for(sock, name, timeout=30.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        messages = received(sock, name)
+        if messages:
+            return messages[0]
+        time.sleep(0.005)
+    raise TimeoutError(f"Pas de message {name}")
+
+def test_play_is_isolated_per_session(app_module):
+    first, second = app_module.app.test_client(), app_module.app.test_client()
+    assert first.post('/play', json={'gesture': 'pierre'}).status_code == 200
+    assert first.post('/play', json={'gesture': 'papier'}).status_code == 200
+    assert first.get('/api/game/state').get_json()['current_round'] == 2
+    assert second.get('/api/game/state').get_json()['current_round'] == 0
+
+def test_game_updates_reach_only_the_session_room(app_module):
+    """Les patches d'une partie ne sont émis qu'à ses clients, versions enchaînées"""
+    http, sock = connect(app_module)
+    _, other = connect(app_module)
+    snapshot = received(sock, 'game_state')[0]
+    assert snapshot['event'] == 'snapshot'
+    other.get_received()
+
+    versions = []
+    for gesture in ('pierre', 'ciseaux'):
+        response = http.post('/play', json={'gesture': gesture}).get_json()
+        patch = received(sock, 'game_patch')[0]
+        assert patch['version'] == response['version']
+        assert patch['history_start'] == len(versions)
+        assert [r['player_gesture'] for r in patch['new_rounds']] == [gesture]
+        versions.append((patch['base_version'], patch['version']))
+    assert versions == [(snapshot['version'], snapshot['version'] + 1),
+                        (snapshot['version'] + 1, snapshot['version'] + 2)]
+    assert other.get_received() == []
+
+    # Un client qui a manqué une version reçoit l'état complet à la version courante
+    sock.emit('request_resync')
+    resync = received(sock, 'game_state')[0]
+    assert resync['event'] == 'resync'
+    assert resync['version'] == snapshot['version'] + 2
+    assert len(resync['state']['game_history']) == 2
+
+    # Une remise à zéro raccourcit l'historique : un instantané remplace le patch
+    http.post('/reset')
+    assert received(sock, 'game_state')[0]['state']['game_history'] == []
+    sock.disconnect()
+    other.disconnect()
+
+def test_binary_frames_are_detected(app_module):
+    """Une trame binaire est analysée et son en-tête renvoyé ; une trame tronquée compte comme erreur"""
+    pytest.importorskip('mediapipe')
+    from benchmark import synthetic_jpegs
+    from frame_transport import FRAME_HEADER
+
+    _, sock = connect(app_module)
+    sock.get_received()
+    errors = app_module.frame_errors_total.value
+    sock.emit('detect_gesture', FRAME_HEADER.pack(7, 1234.5) + synthetic_jpegs(1)[0])
+    response = wait_for(sock, 'gesture_detected')
+    assert (response['seq'], response['captured_at']) == (7, 1234.5)
+    assert response['gesture'] == 'aucun' and not response['hand_detected']
+    assert app_module.frame_errors_total.value == errors
+
+    sock.emit('detect_gesture', FRAME_HEADER.pack(8, 0.0))
+    assert not wait_for(sock, 'gesture_detected')['hand_detected']
+    assert app_module.frame_errors_total.value == errors + 1
+    sock.disconnect()
+
+def test_scores_rejects_invalid_cursor(app_module):
+    client = app_module.app.test_client()
+    assert client.get('/scores').status_code == 200
+    response = client.get('/scores?before=hier')
+    assert response.status_code == 400
+    assert 'error' in response.get_json()
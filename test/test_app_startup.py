@@ -0,0 +1,45 @@
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+def test_app_import_does_not_load_vision_stack(tmp_path):
+    """Les routes hors vision démarrent sans OpenCV, MediaPipe ni NumPy"""
+    code = (
+        "import json, sys, app\n"
+        "client = app.app.test_client()\n"
+        "statuses = [client.get('/').status_code, client.get('/scores').status_code,\n"
+        "            client.post('/play', json={'gesture': 'pierre'}).status_code,\n"
+        "            client.post('/play', json={'gesture': ['pierre']}).status_code,\n"
+        "            client.post('/play', json=['pierre']).status_code,\n"
+        "            client.get('/ready').status_code,\n"
+        "            client.post('/api/game/strategy', json={'strategy': 'markov2'}).status_code,\n"
+        "            client.post('/api/game/strategy', json={'strategy': 'devin'}).status_code]\n"
+        "strategy = client.get('/api/game/strategy').get_json()['strategy']\n"
+        "winners = [app.determine_winner('foo', 'bar'), app.determine_winner('pierre', 'ciseaux')]\n"
+        "heavy = [m for m in ('cv2', 'mediapipe', 'numpy') if m in sys.modules]\n"
+        "print(json.dumps({'statuses': statuses, 'strategy': strategy, 'winners': winners, 'heavy': heavy}))\n")
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    output = subprocess.run([sys.executable, '-c', code], cwd=tmp_path, env=env,
+                            capture_output=True, text=True, check=True).stdout
+    result = json.loads(output.strip().splitlines()[-1])
+    assert result['statuses'] == [200, 200, 200, 400, 400, 200, 200, 400]
+    assert result['winners'] == ['computer', 'player']
+    assert result['strategy'] == 'markov2'
+    assert result['heavy'] == []
+
+def test_spawned_worker_import_has_no_side_effects(tmp_path):
+    """Réimporté sous __mp_main__ par un processus d'inférence, app.py ne crée ni fichier ni pool"""
+    code = (
+        "import json, runpy\n"
+        f"module = runpy.run_path({os.path.join(ROOT, 'app.py')!r}, run_name='__mp_main__')\n"
+        "print(json.dumps([module[name] is None for name in\n"
+        "                  ('score_store', 'score_stats', 'landmark_recorder', 'inference_pool')]))\n")
+    env = dict(os.environ, PYTHONPATH=ROOT, SHIFUMI_INFERENCE_PROCESSES='1',
+               SHIFUMI_RECORD_LANDMARKS='partie.lmk')
+    output = subprocess.run([sys.executable, '-c', code], cwd=tmp_path, env=env,
+                            capture_output=True, text=True, check=True).stdout
+    assert json.loads(output.strip().splitlines()[-1]) == [True, True, True, True]
+    assert os.listdir(tmp_path) == []
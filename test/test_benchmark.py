@@ -0,0 +1,25 @@
+from benchmark import compare, measure, synthetic_landmarks, to_landmark_lists
+from game_logic import GESTURE_NAMES, detect_sign, detect_sign_batch
+
+def test_synthetic_landmarks_cover_all_gestures():
+    """Les mains synthétiques produisent les quatre gestes, de façon cohérente"""
+    points = synthetic_landmarks(200)
+    codes = detect_sign_batch(points)
+    assert set(codes.tolist()) == {0, 1, 2, 3}
+    hands = to_landmark_lists(points[:20])
+    assert [detect_sign(hand) for hand in hands] == [GESTURE_NAMES[c] for c in codes[:20]]
+
+def test_measure_reports_per_call_times():
+    calls = []
+    stats = measure(lambda: calls.append(1), repeat=3, number=10, warmup=1)
+    assert len(calls) == 40
+    assert stats['calls'] == 30
+    assert 0 <= stats['min_us'] <= stats['median_us'] <= stats['p95_us']
+
+def test_compare_flags_slowdowns_beyond_tolerance():
+    baseline = {'benchmarks': {'a': {'median_us': 10.0}, 'b': {'median_us': 10.0}}}
+    results = {'benchmarks': {'a': {'median_us': 12.0}, 'b': {'median_us': 20.0},
+                              'nouveau': {'median_us': 1.0}}}
+    regressions = compare(results, baseline, tolerance=0.25)
+    assert [r['name'] for r in regressions] == ['b']
+    assert regressions[0]['ratio'] == 2.0
@@ -0,0 +1,66 @@
+from capture_pacing import CapturePacer
+
+def run(pacer, client_id, processing_ms, rounds=30, **kwargs):
+    for _ in range(rounds):
+        recommendation = pacer.recommend(client_id, processing_ms, **kwargs)
+    return recommendation
+
+def test_idle_server_speeds_up():
+    """Un serveur peu chargé conseille l'intervalle minimal et la meilleure qualité"""
+    pacer = CapturePacer(workers=2, min_interval_ms=100, max_interval_ms=1000)
+    recommendation = run(pacer, "a", processing_ms=10)
+    assert recommendation['capture_interval_ms'] == 100
+    assert recommendation['jpeg_quality'] == 0.85
+
+def test_slow_inference_throttles_smoothly():
+    """Un traitement lent allonge l'intervalle progressivement, sans dépasser le maximum"""
+    pacer = CapturePacer(workers=1, min_interval_ms=100, max_interval_ms=1000)
+    first = pacer.recommend("a", processing_ms=400)['capture_interval_ms']
+    second = pacer.recommend("a", processing_ms=400)['capture_interval_ms']
+    assert 200 < first < second < 1000
+    recommendation = run(pacer, "a", processing_ms=400)
+    assert recommendation['capture_interval_ms'] > 500
+    assert recommendation['jpeg_quality'] < 0.85
+    assert run(pacer, "a", processing_ms=5000)['capture_interval_ms'] <= 1000
+
+def test_more_clients_share_capacity():
+    """L'intervalle tient compte du nombre de clients actifs"""
+    pacer = CapturePacer(workers=1, min_interval_ms=10, max_interval_ms=5000)
+    alone = run(pacer, "a", processing_ms=50)['capture_interval_ms']
+    for client_id in "bcd":
+        pacer.recommend(client_id, processing_ms=50)
+    crowded = run(pacer, "a", processing_ms=50)['capture_interval_ms']
+    assert crowded > alone * 3
+    for client_id in "bcd":
+        pacer.forget(client_id)
+    assert run(pacer, "a", processing_ms=50)['capture_interval_ms'] < crowded
+
+def test_queue_wait_backs_off():
+    pacer = CapturePacer(workers=4, min_interval_ms=100, max_interval_ms=1000)
+    relaxed = run(pacer, "a", processing_ms=10)['capture_interval_ms']
+    backed_off = run(pacer, "a", processing_ms=10, rounds=5, queue_wait_ms=500)['capture_interval_ms']
+    assert backed_off > relaxed
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def test_silent_clients_stop_counting():
+    """Un client qui n'envoie plus d'images (caméra coupée, déconnecté) ne ralentit plus les autres"""
+    clock = FakeClock()
+    pacer = CapturePacer(workers=1, min_interval_ms=10, max_interval_ms=5000, clock=clock)
+    alone = run(pacer, "a", processing_ms=50)['capture_interval_ms']
+    for client_id in "bcd":
+        pacer.recommend(client_id, processing_ms=50)
+    crowded = run(pacer, "a", processing_ms=50)['capture_interval_ms']
+    assert crowded > alone * 3
+
+    # "b", "c" et "d" se taisent ; "a" continue d'envoyer des images
+    for _ in range(100):
+        clock.now += 0.2
+        recommendation = pacer.recommend("a", processing_ms=50)
+    assert recommendation['capture_interval_ms'] < crowded
+    assert len(pacer._clients) == 1
@@ -0,0 +1,59 @@
+import subprocess
+import sys
+import textwrap
+import numpy as np
+import pytest
+from frame_ring import FrameRing
+
+def write_frame(ring, value):
+    slot, frame = ring.acquire_write()
+    frame[:] = value
+    ring.commit_write(slot)
+    return slot
+
+def test_reader_gets_latest_frame_in_place():
+    ring = FrameRing((2, 3, 3), slots=4, readers=2)
+    assert ring.acquire_read(0) is None
+    write_frame(ring, 1)
+    slot = write_frame(ring, 2)
+    number, read_slot, frame = ring.acquire_read(0)
+    assert (number, read_slot) == (2, slot)
+    assert (frame == 2).all()
+    assert np.shares_memory(frame, ring.frames)
+    ring.release_read(0, read_slot)
+    assert ring.acquire_read(0, seen_number=2) is None
+
+def test_writer_never_overwrites_pinned_or_latest_frame():
+    ring = FrameRing((2, 2, 3), slots=4, readers=2)
+    write_frame(ring, 7)
+    _, pinned, frame = ring.acquire_read(0)
+    for value in range(20):
+        slot = write_frame(ring, value)
+        assert slot != pinned
+    assert (frame == 7).all()
+    # Les deux lecteurs épinglent chacun une image : il reste toujours un emplacement libre
+    _, other, _ = ring.acquire_read(1)
+    assert other != pinned
+    assert ring.acquire_write() is not None
+
+def test_too_few_slots_is_rejected():
+    with pytest.raises(ValueError):
+        FrameRing((2, 2, 3), slots=3, readers=2)
+
+def test_shared_ring_is_readable_from_another_process(tmp_path):
+    """Un autre processus lit l'image dans la mémoire partagée, sans copie par le parent"""
+    with FrameRing((8, 8, 3), shared=True) as ring:
+        write_frame(ring, 42)
+        script = textwrap.dedent(f"""
+            from frame_ring import FrameRing
+            ring = FrameRing.attach({ring.name!r}, (8, 8, 3))
+            number, slot, frame = ring.acquire_read(1)
+            print(number, int(frame.sum()))
+            ring.release_read(1, slot)
+            del frame
+            ring.close()
+        """)
+        output = subprocess.run([sys.executable, '-c', script], capture_output=True, text=True,
+                                check=True, cwd=str(tmp_path),
+                                env={'PYTHONPATH': str(__import__('pathlib').Path(__file__).parent.parent)})
+        assert output.stdout.split() == ['1', str(42 * 8 * 8 * 3)]
@@ -1,5 +1,7 @@
 import pytest
-from game_logic import get_result, finger_up, detect_sign
+import numpy as np
+from game_logic import (get_result, finger_up, detect_sign, detect_sign_batch, detect_sign_code,
+                        detect_sign_fast, hand_sign_code, GESTURE_NAMES, AUCUN)
 
 class MockLandmark:
     """Classe pour simuler les points de repère de la main"""
@@ -27,6 +29,9 @@ def create_mock_hand(finger_states):
             x = i * 0.05
             if i == 4:  # Pouce
                 x = -0.1 if is_up else 0.3
+        elif i in [7, 11, 15, 19]:  # Articulations intermédiaires, au-dessus de la base
+            y = base_y - 0.1
+            x = i * 0.05
         else:
             y = base_y
             x = i * 0.05
@@ -79,3 +84,50 @@ def test_get_result():
     assert get_result("pierre", "feuille") == "Ordinateur"
     assert get_result("feuille", "ciseaux") == "Ordinateur"
     assert get_result("ciseaux", "pierre") == "Ordinateur"
+    assert get_result("foo", "bar") == "Ordinateur"
+
+def test_detect_sign_batch_matches_detect_sign():
+    """La version vectorisée donne les mêmes gestes que detect_sign"""
+    rng = np.random.default_rng(0)
+    points = rng.random((500, 21, 3))
+    right = rng.random(500) < 0.5
+    codes = detect_sign_batch(points, right)
+    for hand, is_right, code in zip(points, right, codes):
+        landmarks = [MockLandmark(x, y) for x, y, _ in hand]
+        assert GESTURE_NAMES[code] == detect_sign(landmarks, is_right)
+
+def test_detect_sign_batch_mock_hands():
+    """Les mains simulées sont classées comme par detect_sign"""
+    states = [
+        [False, False, False, False, False],
+        [True, True, True, True, True],
+        [False, True, True, False, False],
+        [True, False, True, False, True],
+    ]
+    hands = np.array([[[lm.x, lm.y, 0.0] for lm in create_mock_hand(s)] for s in states])
+    codes = detect_sign_batch(hands)
+    expected = [detect_sign(create_mock_hand(s)) for s in states]
+    assert [GESTURE_NAMES[c] for c in codes] == expected
+
+def test_detect_sign_batch_missing_hand():
+    """Une main absente (NaN) est classée aucun"""
+    hands = np.full((1, 21, 3), np.nan)
+    assert detect_sign_batch(hands)[0] == AUCUN
+
+def test_sign_table_matches_detect_sign():
+    """Les chemins tableau et scalaire + SIGN_TABLE donnent les mêmes gestes que detect_sign"""
+    rng = np.random.default_rng(1)
+    for hand in rng.random((300, 21, 3)):
+        landmarks = [MockLandmark(x, y) for x, y, _ in hand]
+        for is_right in (True, False):
+            expected = GESTURE_NAMES.index(detect_sign(landmarks, is_right))
+            assert detect_sign_code(hand, is_right) == expected
+            assert hand_sign_code(landmarks, is_right) == expected
+
+def test_detect_sign_fast_from_landmarks():
+    """detect_sign_fast accepte directement les objets points de repère"""
+    for states in ([False] * 5, [True] * 5, [False, True, True, False, False]):
+        landmarks = create_mock_hand(states)
+        for lm in landmarks:
+            lm.z = 0.0
+        assert detect_sign_fast(landmarks) == detect_sign(landmarks)
@@ -0,0 +1,79 @@
+from game_sessions import GameState, GameSessionStore
+
+class FakeClock:
+    """Horloge contrôlée manuellement"""
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def test_game_state_dict_format():
+    """L'état exposé garde les clés historiques de l'API"""
+    state = GameState(points_to_win=3)
+    data = state.to_dict()
+    assert data['points_to_win'] == 3
+    assert data['detected_hand'] == 'aucun'
+    assert data['game_history'] == []
+    assert 'last_seen' not in data
+
+def test_reset_keeps_points_to_win():
+    state = GameState(points_to_win=3)
+    state.player_score = 2
+    state.game_history.append({'round': 1})
+    state.reset()
+    assert state.player_score == 0
+    assert state.game_history == []
+    assert state.points_to_win == 3
+
+def test_sessions_are_isolated():
+    """Chaque session a sa propre partie"""
+    store = GameSessionStore()
+    store.get("a").player_score = 4
+    assert store.get("b").player_score == 0
+    assert store.get("a").player_score == 4
+    assert len(store) == 2
+
+def test_idle_sessions_expire():
+    """Les parties inactives sont supprimées lors d'un accès ultérieur"""
+    clock = FakeClock()
+    store = GameSessionStore(idle_timeout=100, sweep_interval=10, clock=clock)
+    store.get("a")
+    clock.now = 50
+    store.get("b")
+    clock.now = 120
+    store.get("b")
+    assert "a" not in store
+    assert "b" in store
+    clock.now = 500
+    assert store.expire_idle() == 1
+    assert len(store) == 0
+
+def test_patch_carries_only_changes():
+    """Un patch ne contient que les champs modifiés et les nouveaux rounds"""
+    state = GameState()
+    state.player_score = 1
+    state.game_history.append({'round': 1})
+    patch = state.make_patch()
+    assert patch['base_version'] == 0 and patch['version'] == 1
+    assert patch['changes'] == {'player_score': 1}
+    assert patch['history_start'] == 0
+    assert patch['new_rounds'] == [{'round': 1}]
+
+    state.game_history.append({'round': 2})
+    patch = state.make_patch()
+    assert patch['base_version'] == 1
+    assert patch['changes'] == {}
+    assert patch['history_start'] == 1
+    assert patch['new_rounds'] == [{'round': 2}]
+
+def test_reset_requires_snapshot():
+    """Après une remise à zéro de l'historique, un instantané est nécessaire"""
+    state = GameState()
+    state.game_history.append({'round': 1})
+    state.make_patch()
+    state.reset()
+    assert state.make_patch() is None
+    snapshot = state.snapshot()
+    assert snapshot['version'] == 2
+    assert snapshot['state']['game_history'] == []
@@ -0,0 +1,25 @@
+from gestures import (AUCUN, CISEAUX, COMPUTER_WINS, DRAW, GAME_LABELS, OUTCOMES, PAPIER, PIERRE,
+                      PLAYER_WINS, WEB_LABELS, counter_move, gesture_code, is_move, label_outcome, outcome)
+
+def test_both_vocabularies_map_to_the_same_codes():
+    assert gesture_code("feuille") == gesture_code("papier") == PAPIER
+    assert gesture_code("inconnu") == gesture_code("aucun") == AUCUN
+    assert gesture_code("lézard") == AUCUN
+    assert [gesture_code(label) for label in GAME_LABELS] == [gesture_code(label) for label in WEB_LABELS]
+
+def test_outcome_matrix():
+    assert [outcome(move, move) for move in (PIERRE, PAPIER, CISEAUX, AUCUN)] == [DRAW] * 4
+    assert outcome(PAPIER, PIERRE) == outcome(CISEAUX, PAPIER) == outcome(PIERRE, CISEAUX) == PLAYER_WINS
+    assert outcome(PIERRE, PAPIER) == outcome(PAPIER, CISEAUX) == outcome(CISEAUX, PIERRE) == COMPUTER_WINS
+    # Sans geste reconnu, le joueur perd
+    assert outcome(AUCUN, PIERRE) == COMPUTER_WINS
+    assert all(OUTCOMES[counter_move(move)][move] == PLAYER_WINS for move in (PIERRE, PAPIER, CISEAUX))
+
+def test_is_move():
+    assert [is_move(code) for code in (PIERRE, PAPIER, CISEAUX, AUCUN)] == [True, True, True, False]
+
+def test_unknown_labels_lose_unless_identical():
+    assert label_outcome("papier", "feuille") == DRAW
+    assert label_outcome("foo", "bar") == label_outcome("pierre", "lézard") == COMPUTER_WINS
+    assert label_outcome("lézard", "ciseaux") == COMPUTER_WINS
+    assert label_outcome("foo", "foo") == DRAW
@@ -0,0 +1,120 @@
+import numpy as np
+import pytest
+from types import SimpleNamespace
+from hand_roi import HandRoiTracker
+
+class FakeLandmark:
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+        self.z = 0.0
+
+class FakeHands:
+    """
+    Simule MediaPipe : une main carrée est placée aux coordonnées `hand_box`
+    (en pixels de l'image complète) ; seules les images la contenant la voient.
+    """
+    def __init__(self, frame_shape, hand_box):
+        self.frame_shape = frame_shape
+        self.hand_box = hand_box
+        self.region = None
+        self.shapes = []
+
+    def process(self, rgb):
+        self.shapes.append(rgb.shape[:2])
+        x0, y0, x1, y1 = self.region
+        hx0, hy0, hx1, hy1 = self.hand_box
+        if hx0 < x0 or hy0 < y0 or hx1 > x1 or hy1 > y1:
+            return SimpleNamespace(multi_hand_landmarks=None)
+        w, h = x1 - x0, y1 - y0
+        corners = [(hx0, hy0), (hx1, hy1)] * 10 + [(hx0, hy1)]
+        landmarks = [FakeLandmark((x - x0) / w, (y - y0) / h) for x, y in corners]
+        return SimpleNamespace(multi_hand_landmarks=[SimpleNamespace(landmark=landmarks)])
+
+class RegionTracker(HandRoiTracker):
+    """Transmet la zone analysée au faux tracker"""
+    def _process_region(self, frame, roi, color_conversion):
+        self.hands.region = roi
+        return super()._process_region(frame, roi, color_conversion)
+
+def test_roi_crops_after_first_detection():
+    frame = np.zeros((480, 640, 3), np.uint8)
+    hands = FakeHands(frame.shape, (300, 200, 380, 280))
+    tracker = RegionTracker(hands, padding=0.25)
+
+    tracker.process(frame)
+    assert hands.shapes[-1] == (480, 640)
+    assert tracker.roi is not None
+
+    second = tracker.process(frame)
+    assert hands.shapes[-1][0] < 480
+    assert tracker.last_area_ratio < 0.2
+    # Les points sont ramenés en coordonnées de l'image complète
+    lm = second.multi_hand_landmarks[0].landmark[0]
+    assert lm.x * 640 == pytest.approx(300)
+    assert lm.y * 480 == pytest.approx(200)
+
+def test_roi_falls_back_to_full_frame_when_lost():
+    frame = np.zeros((480, 640, 3), np.uint8)
+    hands = FakeHands(frame.shape, (300, 200, 380, 280))
+    tracker = RegionTracker(hands)
+    tracker.process(frame)
+
+    # La main se déplace hors de la zone : la même image est réanalysée en entier
+    hands.hand_box = (20, 20, 100, 100)
+    results = tracker.process(frame)
+    assert hands.shapes[-1] == (480, 640)
+    assert results.multi_hand_landmarks
+    assert tracker.roi[0] < 100
+
+def test_roi_reset_when_frame_size_changes():
+    """Une zone calculée pour une image plus grande n'est pas appliquée à une image plus petite"""
+    frame = np.zeros((720, 1280, 3), np.uint8)
+    hands = FakeHands(frame.shape, (900, 500, 1000, 600))
+    tracker = RegionTracker(hands)
+    tracker.process(frame)
+    assert tracker.roi[2] > 640
+
+    small = np.zeros((480, 640, 3), np.uint8)
+    hands.hand_box = (300, 200, 380, 280)
+    results = tracker.process(small)
+    assert hands.shapes[-1] == (480, 640)
+    lm = results.multi_hand_landmarks[0].landmark[0]
+    assert (lm.x * 640, lm.y * 480) == (pytest.approx(300), pytest.approx(200))
+    assert tracker.roi[2] <= 640 and tracker.roi[3] <= 480
+
+def test_roi_reset_without_hand():
+    frame = np.zeros((480, 640, 3), np.uint8)
+    hands = FakeHands(frame.shape, (300, 200, 380, 280))
+    tracker = RegionTracker(hands)
+    tracker.process(frame)
+    hands.hand_box = (-1, -1, -1, -1)
+    assert not tracker.process(frame).multi_hand_landmarks
+    assert tracker.roi is None
+
+def test_roi_stays_fixed_while_hand_inside():
+    """La zone ne bouge pas pour un petit déplacement : MediaPipe suit la main dans un repère stable"""
+    frame = np.zeros((480, 640, 3), np.uint8)
+    hands = FakeHands(frame.shape, (300, 200, 380, 280))
+    tracker = RegionTracker(hands, padding=0.35)
+    tracker.process(frame)
+    roi = tracker.roi
+
+    hands.hand_box = (305, 204, 385, 284)
+    tracker.process(frame)
+    assert tracker.roi == roi
+
+    # Main près du bord de la zone : elle est recentrée
+    hands.hand_box = (roi[2] - 82, 204, roi[2] - 2, 284)
+    tracker.process(frame)
+    assert tracker.roi != roi
+
+def test_multi_hand_tracker_analyses_full_frames():
+    """Avec plusieurs mains possibles, une autre main pourrait être hors de la zone : pas de recadrage"""
+    frame = np.zeros((480, 640, 3), np.uint8)
+    hands = FakeHands(frame.shape, (300, 200, 380, 280))
+    tracker = RegionTracker(hands, max_num_hands=2)
+    tracker.process(frame)
+    tracker.process(frame)
+    assert hands.shapes == [(480, 640), (480, 640)]
+    assert tracker.roi is None
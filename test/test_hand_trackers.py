@@ -0,0 +1,104 @@
+import pytest
+from hand_trackers import HandTrackerRegistry
+
+class FakeTracker:
+    """Classe pour simuler un tracker MediaPipe Hands"""
+    def __init__(self):
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+class FakeClock:
+    """Horloge contrôlée manuellement"""
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def test_tracker_reused_per_sid():
+    """Un même client récupère toujours le même tracker"""
+    registry = HandTrackerRegistry(FakeTracker, max_live=4)
+    first = registry.get("a")
+    assert registry.get("a") is first
+    assert registry.get("b") is not first
+    assert len(registry) == 2
+
+def test_release_closes_tracker():
+    """La déconnexion ferme le tracker du client"""
+    registry = HandTrackerRegistry(FakeTracker)
+    tracker = registry.get("a")
+    registry.release("a")
+    assert tracker.closed
+    assert "a" not in registry
+    registry.release("a")  # Sans effet si déjà libéré
+
+def test_lru_eviction_at_cap():
+    """Au-delà du plafond, le tracker le moins récemment utilisé est fermé"""
+    clock = FakeClock()
+    registry = HandTrackerRegistry(FakeTracker, max_live=2, clock=clock)
+    a = registry.get("a")
+    clock.now = 1
+    b = registry.get("b")
+    clock.now = 2
+    registry.get("a")  # "a" redevient le plus récent
+    clock.now = 3
+    registry.get("c")
+    assert b.closed and not a.closed
+    assert len(registry) == 2
+
+def test_ttl_eviction():
+    """Les trackers inactifs trop longtemps sont fermés"""
+    clock = FakeClock()
+    registry = HandTrackerRegistry(FakeTracker, ttl=10, clock=clock)
+    a = registry.get("a")
+    clock.now = 5
+    b = registry.get("b")
+    clock.now = 12
+    assert registry.evict_expired() == 1
+    assert a.closed and not b.closed
+    clock.now = 30
+    registry.get("c")
+    assert b.closed
+
+def test_invalid_cap():
+    with pytest.raises(ValueError):
+        HandTrackerRegistry(FakeTracker, max_live=0)
+
+def test_prewarmed_trackers_go_to_new_clients():
+    """Les trackers préchauffés sont remis aux premiers clients"""
+    warmed = []
+    registry = HandTrackerRegistry(FakeTracker)
+    registry.prewarm(2, warm=warmed.append)
+    assert registry.spare_count == 2 and len(warmed) == 2
+    assert registry.get("a") in warmed
+    assert registry.get("b") in warmed
+    assert registry.spare_count == 0
+    assert registry.get("c") not in warmed
+    registry.prewarm(1)
+    registry.close_all()
+    assert registry.spare_count == 0
+
+def test_borrowed_tracker_closed_after_checkin():
+    """Un tracker évincé pendant une inférence n'est fermé qu'à son retour"""
+    registry = HandTrackerRegistry(FakeTracker, max_live=1)
+    a = registry.checkout("a")
+    registry.get("b")  # Plafond atteint : "a" est évincé pendant son emprunt
+    assert "a" not in registry
+    assert not a.closed
+    registry.checkin(a)
+    assert a.closed
+
+def test_release_during_borrow_is_deferred():
+    registry = HandTrackerRegistry(FakeTracker)
+    a = registry.checkout("a")
+    assert registry.checkout("a") is a
+    registry.release("a")
+    registry.checkin(a)
+    assert not a.closed
+    registry.checkin(a)
+    assert a.closed
+    b = registry.checkout("b")
+    registry.checkin(b)
+    assert not b.closed and "b" in registry
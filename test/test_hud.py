@@ -0,0 +1,62 @@
+import cv2
+import numpy as np
+
+from hud import FONT, HudLayer, TextSpriteCache
+
+def draw_reference(frame, text, position, scale, color, thickness):
+    """Rendu direct historique : fond noir, contour noir puis texte"""
+    (text_width, text_height), _ = cv2.getTextSize(text, FONT, scale, thickness)
+    cv2.rectangle(frame, (position[0] - 5, position[1] - text_height - 5),
+                  (position[0] + text_width + 5, position[1] + 5), (0, 0, 0), -1)
+    cv2.putText(frame, text, position, FONT, scale, (0, 0, 0), thickness + 2)
+    cv2.putText(frame, text, position, FONT, scale, color, thickness)
+
+def test_layer_matches_direct_drawing():
+    """Le calque produit les mêmes pixels que le dessin direct"""
+    frame = np.random.default_rng(0).integers(0, 256, (240, 320, 3), dtype=np.uint8)
+    expected = frame.copy()
+    draw_reference(expected, "Score : 3/5", (20, 60), 1.0, (0, 255, 0), 2)
+    draw_reference(expected, "SHIFUMI", (300, 230), 2.0, (255, 215, 0), 3)
+
+    hud = HudLayer()
+    def build(layer):
+        layer.text("Score : 3/5", (20, 60), 1.0, (0, 255, 0), 2)
+        layer.text("SHIFUMI", (300, 230), 2.0, (255, 215, 0), 3)  # Déborde de l'image
+    hud.compose("etat", frame.shape, build)
+    hud.apply(frame)
+    assert np.array_equal(frame, expected)
+
+def test_compose_only_on_state_change():
+    hud = HudLayer()
+    calls = []
+    build = lambda layer: calls.append(layer.text("A", (10, 30)))
+    assert hud.compose(("a", 1), (100, 100, 3), build)
+    assert not hud.compose(("a", 1), (100, 100, 3), build)
+    assert hud.compose(("a", 2), (100, 100, 3), build)
+    assert len(calls) == 2 and hud.compositions == 2
+
+def test_recompose_clears_previous_content():
+    hud = HudLayer()
+    hud.compose(1, (60, 200, 3), lambda layer: layer.text("AAAA", (10, 40)))
+    hud.compose(2, (60, 200, 3), lambda layer: None)
+    frame = np.full((60, 200, 3), 100, dtype=np.uint8)
+    hud.apply(frame)
+    assert (frame == 100).all()
+
+def test_dim_darkens_whole_frame():
+    hud = HudLayer()
+    hud.compose("fin", (20, 20, 3), lambda layer: layer.dim(0.7))
+    frame = np.full((20, 20, 3), 200, dtype=np.uint8)
+    hud.apply(frame)
+    assert abs(int(frame[0, 0, 0]) - 60) <= 1
+
+def test_sprite_cache_evicts_least_recently_used():
+    cache = TextSpriteCache(max_entries=2)
+    first = cache.get("a")
+    cache.get("b")
+    assert cache.get("a") is first
+    cache.get("c")
+    assert len(cache) == 2
+    assert cache.hits == 1 and cache.misses == 3
+    cache.get("b")
+    assert cache.misses == 4
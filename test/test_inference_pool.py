@@ -0,0 +1,60 @@
+import time
+
+import numpy as np
+import pytest
+
+from gestures import AUCUN
+from inference_pool import ProcessInferencePool
+
+def test_sticky_routing():
+    """Un client est toujours servi par le même processus"""
+    pool = ProcessInferencePool(processes=4)
+    assert pool.worker_index("client-a") == pool.worker_index("client-a")
+    assert {pool.worker_index(f"client-{i}") for i in range(50)} == {0, 1, 2, 3}
+
+def test_rejects_frames_larger_than_slots():
+    pool = ProcessInferencePool(processes=1, max_frame_shape=(10, 10, 3))
+    with pytest.raises(ValueError):
+        pool.infer("a", np.zeros((20, 20, 3), dtype=np.uint8))
+    assert not pool.started
+
+def test_frame_through_shared_memory():
+    """Une image passe par la mémoire partagée et revient avec son résultat"""
+    pool = ProcessInferencePool(processes=1, slots_per_process=1, max_frame_shape=(240, 320, 3))
+    try:
+        result = pool.infer("a", np.full((240, 320, 3), 128, dtype=np.uint8))
+        assert result['gesture_code'] == AUCUN
+        assert result['hands'] == []
+        assert result['inference_seconds'] > 0
+        # L'emplacement unique est rendu : une seconde image passe aussi
+        assert pool.infer("a", np.zeros((120, 160, 3), dtype=np.uint8))['gesture_code'] == AUCUN
+    finally:
+        pool.stop()
+    assert not pool.started
+
+def test_dead_worker_is_replaced():
+    """Un processus mort est remplacé : ses tâches échouent et le client est de nouveau servi"""
+    pool = ProcessInferencePool(processes=1, slots_per_process=1, max_frame_shape=(120, 160, 3))
+    try:
+        frame = np.zeros((120, 160, 3), dtype=np.uint8)
+        assert pool.infer("a", frame)['gesture_code'] == AUCUN
+        old_process = pool._workers[0].process
+        old_process.kill()
+        old_process.join()
+        deadline = time.monotonic() + 5
+        while pool.restarts == 0 and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert pool.restarts == 1
+        assert pool._workers[0].process is not old_process
+        assert pool.infer("a", frame)['gesture_code'] == AUCUN
+    finally:
+        pool.stop()
+
+def test_submit_to_replaced_worker_fails_immediately():
+    """Une tâche adressée à un processus déjà remplacé échoue au lieu de rester en attente"""
+    pool = ProcessInferencePool(processes=1)
+    stale = object()
+    future = pool._submit(stale, ('release', "a"))
+    with pytest.raises(RuntimeError):
+        future.result(0)
+    assert pool._pending == {}
@@ -0,0 +1,82 @@
+import threading
+from inference_scheduler import InferenceScheduler
+
+def test_latest_frame_wins():
+    """Les images arrivées pendant un traitement sont remplacées par la plus récente"""
+    started = threading.Event()
+    release = threading.Event()
+    done = threading.Event()
+    processed = []
+
+    def handler(client_id, payload, stats):
+        processed.append((client_id, payload, stats['dropped_frames']))
+        if payload == 0:
+            started.set()
+            release.wait(5)
+        if payload == 3:
+            done.set()
+
+    scheduler = InferenceScheduler(handler, workers=1)
+    try:
+        scheduler.submit("a", 0)
+        assert started.wait(5)
+        # Pendant que l'image 0 est traitée, trois images arrivent
+        assert scheduler.submit("a", 1)
+        assert not scheduler.submit("a", 2)
+        assert not scheduler.submit("a", 3)
+        release.set()
+        assert done.wait(5)
+    finally:
+        scheduler.stop(timeout=5)
+
+    assert [payload for _, payload, _ in processed] == [0, 3]
+    assert processed[-1][2] == 2
+
+def test_clients_are_served_independently():
+    """Chaque client a sa propre boîte aux lettres"""
+    seen = set()
+    lock = threading.Lock()
+    done = threading.Event()
+
+    def handler(client_id, payload, stats):
+        with lock:
+            seen.add((client_id, payload))
+            if len(seen) == 3:
+                done.set()
+
+    scheduler = InferenceScheduler(handler, workers=2)
+    try:
+        for client_id in ("a", "b", "c"):
+            scheduler.submit(client_id, client_id.upper())
+        assert done.wait(5)
+    finally:
+        scheduler.stop(timeout=5)
+    assert seen == {("a", "A"), ("b", "B"), ("c", "C")}
+
+def test_forget_defers_cleanup_while_busy():
+    """Le nettoyage d'un client n'a lieu qu'après son traitement en cours"""
+    started = threading.Event()
+    release = threading.Event()
+    cleaned = threading.Event()
+    order = []
+
+    def handler(client_id, payload, stats):
+        started.set()
+        release.wait(5)
+        order.append("handler")
+
+    def cleanup():
+        order.append("cleanup")
+        cleaned.set()
+
+    scheduler = InferenceScheduler(handler, workers=1)
+    try:
+        scheduler.submit("a", 0)
+        assert started.wait(5)
+        scheduler.forget("a", cleanup=cleanup)
+        assert not cleaned.is_set()
+        release.set()
+        assert cleaned.wait(5)
+    finally:
+        scheduler.stop(timeout=5)
+    assert order == ["handler", "cleanup"]
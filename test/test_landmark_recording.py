@@ -0,0 +1,105 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from benchmark import synthetic_landmarks, to_landmark_lists
+from game_logic import GESTURE_NAMES, detect_sign_batch, detect_sign_code
+from landmark_recording import RECORD_DTYPE, LandmarkRecorder, load_recording, replay
+
+def test_records_round_trip_through_memmap(tmp_path):
+    path = str(tmp_path / "partie.lmk")
+    hands = synthetic_landmarks(3)
+    with LandmarkRecorder(path) as recorder:
+        recorder.record_frame([(hands[0], True), (hands[1], False)], timestamp=10.0)
+        recorder.record_frame([], timestamp=10.1)
+    with LandmarkRecorder(path) as recorder:  # Reprise du même fichier
+        recorder.record_frame([(hands[2], True)], timestamp=10.2, stream=7)
+
+    records = load_recording(path)
+    assert isinstance(records, np.memmap)
+    assert records.dtype == RECORD_DTYPE
+    assert records['hand'].tolist() == [0, 1, -1, 0]
+    assert records['frame'].tolist() == [0, 0, 1, 0]
+    assert records['is_right'].tolist() == [1, 0, 0, 1]
+    assert records['stream'][3] == 7
+    np.testing.assert_allclose(records['landmarks'][1], hands[1], rtol=1e-6)
+
+def test_truncated_file_reads_complete_records(tmp_path):
+    path = str(tmp_path / "partie.lmk")
+    with LandmarkRecorder(path) as recorder:
+        recorder.record_frame([(synthetic_landmarks(1)[0], True)])
+    with open(path, 'ab') as f:
+        f.write(b'\0' * 10)
+    assert len(load_recording(path)) == 1
+
+def test_resume_after_truncated_record(tmp_path):
+    """La reprise supprime l'enregistrement partiel et poursuit la numérotation des images"""
+    path = str(tmp_path / "partie.lmk")
+    hands = synthetic_landmarks(3)
+    with LandmarkRecorder(path) as recorder:
+        recorder.record_frame([(hands[0], True)], timestamp=10.0)
+        recorder.record_frame([(hands[1], True)], timestamp=10.1)
+    with open(path, 'ab') as f:
+        f.write(b'\0' * 10)
+    with LandmarkRecorder(path) as recorder:
+        recorder.record_frame([(hands[2], False)], timestamp=10.2)
+
+    records = load_recording(path)
+    assert records['timestamp'].tolist() == [10.0, 10.1, 10.2]
+    assert records['frame'].tolist() == [0, 1, 2]
+    np.testing.assert_allclose(records['landmarks'][2], hands[2], rtol=1e-6)
+
+def test_rejects_foreign_files(tmp_path):
+    path = tmp_path / "autre.lmk"
+    path.write_bytes(b'pas un enregistrement')
+    with pytest.raises(ValueError):
+        load_recording(str(path))
+
+@pytest.mark.parametrize("mode", ["batch", "single"])
+def test_replay_reports_gesture_distribution(tmp_path, mode):
+    path = str(tmp_path / "partie.lmk")
+    hands = synthetic_landmarks(50)
+    with LandmarkRecorder(path) as recorder:
+        for points in hands:
+            recorder.record_frame([(points, True)])
+        recorder.record_frame([])
+
+    report = replay(load_recording(path), mode=mode, chunk_size=16)
+    expected = np.bincount(detect_sign_batch(hands), minlength=4)
+    assert report['frames'] == 51
+    assert report['hands'] == 50
+    assert report['frames_without_hand'] == 1
+    assert report['distribution'] == dict(zip(GESTURE_NAMES, expected.tolist()))
+
+def test_stream_ids_follow_connection_order(tmp_path):
+    """Chaque client reçoit son propre flux, après ceux d'un enregistrement repris"""
+    path = str(tmp_path / "partie.lmk")
+    with LandmarkRecorder(path) as recorder:
+        assert [recorder.stream_id(sid) for sid in ("a", "b", "a")] == [1, 2, 1]
+        recorder.record_frame([], stream=recorder.stream_id("b"))
+        recorder.release_stream("a")
+        assert recorder.stream_id("a") == 3
+    with LandmarkRecorder(path) as recorder:
+        assert recorder.stream_id("c") == 3
+
+def test_live_detection_matches_replay_for_left_hands(tmp_path):
+    """La détection en direct tient compte de la main enregistrée, comme la relecture"""
+    vision = pytest.importorskip("vision")
+    points = synthetic_landmarks(64)
+    handedness = [SimpleNamespace(classification=[SimpleNamespace(label='Left')])]
+    path = str(tmp_path / "partie.lmk")
+    live = []
+    with LandmarkRecorder(path) as recorder:
+        for hand in to_landmark_lists(points):
+            results = SimpleNamespace(multi_hand_landmarks=[hand], multi_handedness=handedness)
+            tracker = SimpleNamespace(process=lambda frame: results,
+                                      last_convert_seconds=0.0, last_inference_seconds=0.0)
+            detection = vision.detect_hands(tracker, None)
+            recorder.record_frame(detection['hands'])
+            live.append(detection['gesture_code'])
+
+    records = load_recording(path)
+    assert not records['is_right'].any()
+    assert live == [detect_sign_code(hand, False) for hand in records['landmarks']]
+    assert live != [detect_sign_code(hand, True) for hand in records['landmarks']]
@@ -0,0 +1,45 @@
+from metrics import MetricsRegistry, StageTimer, timed
+
+def test_histogram_exports_cumulative_buckets():
+    registry = MetricsRegistry()
+    histogram = registry.histogram('latence_seconds', "Latence", buckets=(0.01, 0.1))
+    for value in (0.005, 0.01, 0.05, 2.0):
+        histogram.observe(value)
+    text = registry.render()
+    assert '# TYPE latence_seconds histogram' in text
+    assert 'latence_seconds_bucket{le="0.01"} 2' in text
+    assert 'latence_seconds_bucket{le="0.1"} 3' in text
+    assert 'latence_seconds_bucket{le="+Inf"} 4' in text
+    assert 'latence_seconds_count 4' in text
+
+def test_labelled_metrics_share_help_and_type():
+    registry = MetricsRegistry()
+    stages = {stage: registry.histogram('etape_seconds', "Étapes", labels={'stage': stage})
+              for stage in ('decode', 'emit')}
+    timer = StageTimer(stages)
+    timer.mark('decode')
+    timer.mark('emit')
+    text = registry.render()
+    assert text.count('# TYPE etape_seconds histogram') == 1
+    assert 'etape_seconds_count{stage="decode"} 1' in text
+    assert 'etape_seconds_bucket{stage="emit",le="+Inf"} 1' in text
+
+def test_counter_gauge_and_timed():
+    registry = MetricsRegistry()
+    frames = registry.counter('images_total', "Images")
+    registry.gauge('ratio', "Ratio", lambda: 0.5)
+    durations = registry.histogram('appel_seconds', "Appels")
+
+    @timed(durations)
+    def call():
+        frames.inc()
+        raise RuntimeError("échec")
+
+    try:
+        call()
+    except RuntimeError:
+        pass
+    text = registry.render()
+    assert 'images_total 1' in text
+    assert 'ratio 0.5' in text
+    assert durations.count == 1
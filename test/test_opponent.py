@@ -0,0 +1,53 @@
+import random
+import pytest
+from gestures import CISEAUX, PAPIER, PIERRE, counter_move
+from opponent import FrequencyPredictor, MarkovPredictor, create_opponent
+from game_sessions import GameSessionStore
+
+def play(opponent, player_moves):
+    """Joue une suite de coups et retourne le nombre de manches gagnées par l'ordinateur"""
+    wins = 0
+    for move in player_moves:
+        wins += opponent.choose() == counter_move(move)
+        opponent.observe(move)
+    return wins
+
+def test_frequency_predictor_counts_moves():
+    predictor = FrequencyPredictor()
+    assert predictor.predict() is None
+    for move in (PIERRE, CISEAUX, CISEAUX):
+        predictor.update(move)
+    assert predictor.predict() == CISEAUX
+
+def test_markov_predictor_follows_context():
+    """Après pierre vient toujours papier, après papier toujours ciseaux..."""
+    predictor = MarkovPredictor(order=1)
+    for move in [PIERRE, PAPIER, CISEAUX] * 5:
+        predictor.update(move)
+    # Dernier coup : ciseaux, suivi jusqu'ici par pierre
+    assert predictor.predict() == PIERRE
+    assert sum(predictor.counts) == 14
+
+def test_adaptive_opponent_exploits_a_pattern():
+    opponent = create_opponent("adaptive", rng=random.Random(0))
+    cycle = [PIERRE, PIERRE, PAPIER, CISEAUX] * 50
+    assert play(opponent, cycle) > 0.8 * len(cycle)
+
+def test_random_opponent_ignores_the_player():
+    opponent = create_opponent("random", rng=random.Random(0))
+    wins = play(opponent, [PIERRE] * 300)
+    assert 60 < wins < 140
+
+def test_unknown_strategy_is_rejected():
+    with pytest.raises(ValueError):
+        create_opponent("devin")
+    assert create_opponent("markov3").predictors[0].order == 3
+
+def test_each_session_gets_its_own_opponent():
+    store = GameSessionStore(opponent_factory=lambda: create_opponent("frequency"))
+    a, b = store.get("a"), store.get("b")
+    a.opponent.observe(PIERRE)
+    assert a.opponent is not b.opponent
+    assert b.opponent.rounds == 0
+    a.reset()
+    assert a.opponent.rounds == 1
@@ -0,0 +1,64 @@
+import pytest
+from datetime import datetime, timedelta
+from score_db import SqliteScoreStore
+
+def make_entry(i, date=None, winner='Joueur'):
+    return {
+        'date': date or f"2025-01-01T00:00:{i:02d}",
+        'winner': winner,
+        'player_score': 5,
+        'computer_score': i % 5,
+        'game_details': [
+            {'round': r, 'player_gesture': 'pierre', 'computer_gesture': 'ciseaux',
+             'result': 'player', 'timestamp': '2025-01-01T00:00:00'}
+            for r in range(1, 3)
+        ],
+        'total_rounds': 2
+    }
+
+def test_keyset_pagination(tmp_path):
+    """Les pages se suivent sans doublon, de la plus récente à la plus ancienne"""
+    store = SqliteScoreStore(str(tmp_path / "scores.db"))
+    for i in range(7):
+        store.append(make_entry(i))
+    seen = []
+    cursor = None
+    while True:
+        entries, cursor = store.page(3, cursor)
+        seen += [e['computer_score'] for e in entries]
+        if cursor is None:
+            break
+    assert seen == [(i % 5) for i in range(6, -1, -1)]
+
+def test_rounds_round_trip(tmp_path):
+    store = SqliteScoreStore(str(tmp_path / "scores.db"))
+    store.append(make_entry(1))
+    entry = store.load()[0]
+    assert entry['winner'] == 'Joueur'
+    assert [r['round'] for r in entry['game_details']] == [1, 2]
+    assert entry['game_details'][0]['player_gesture'] == 'pierre'
+
+def test_retention_purge(tmp_path):
+    """Les parties plus anciennes que la durée de conservation sont supprimées"""
+    store = SqliteScoreStore(str(tmp_path / "scores.db"), retention_days=30)
+    old = (datetime.now() - timedelta(days=40)).isoformat()
+    store.append(make_entry(1, date=old))
+    store.append(make_entry(2, date=datetime.now().isoformat()))
+    assert store.purge() == 1
+    assert store.count() == 1
+
+def test_seed_only_when_empty(tmp_path):
+    path = str(tmp_path / "scores.db")
+    SqliteScoreStore(path, seed=lambda: [make_entry(1), make_entry(2)]).close()
+    store = SqliteScoreStore(path, seed=lambda: [make_entry(3)])
+    assert store.count() == 2
+
+def test_invalid_cursor_is_rejected(tmp_path):
+    """Un curseur mal formé (paramètre ?before= de l'utilisateur) lève ValueError"""
+    store = SqliteScoreStore(str(tmp_path / "scores.db"))
+    store.append(make_entry(1))
+    for cursor in ("2025|x", "pas-une-date|3", "2025-01-01T00:00:01", "|"):
+        with pytest.raises(ValueError):
+            store.page(3, cursor)
+    entries, _ = store.page(3, "2025-01-01T00:00:02|99")
+    assert len(entries) == 1
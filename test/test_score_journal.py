@@ -0,0 +1,76 @@
+import json
+
+import pytest
+
+from score_journal import ScoreJournal
+
+def make_entry(i):
+    return {'date': f"2025-01-01T00:00:{i:02d}", 'winner': 'Joueur' if i % 2 else 'IA', 'total_rounds': i}
+
+def test_append_and_load(tmp_path):
+    """Les parties sont relues dans l'ordre chronologique"""
+    journal = ScoreJournal(str(tmp_path / "scores.jsonl"))
+    for i in range(3):
+        journal.append(make_entry(i))
+    assert [e['total_rounds'] for e in journal.load()] == [0, 1, 2]
+    assert [e['total_rounds'] for e in journal.iter_recent(2)] == [2, 1]
+
+def test_one_entry_per_line(tmp_path):
+    path = tmp_path / "scores.jsonl"
+    journal = ScoreJournal(str(path))
+    journal.append(make_entry(1))
+    journal.append(make_entry(2))
+    lines = path.read_text(encoding='utf-8').splitlines()
+    assert [json.loads(line)['total_rounds'] for line in lines] == [1, 2]
+
+def test_compaction_enforces_retention(tmp_path):
+    """Le journal est réduit aux dernières parties une fois la marge dépassée"""
+    path = tmp_path / "scores.jsonl"
+    journal = ScoreJournal(str(path), retention=5, compact_every=3)
+    for i in range(9):
+        journal.append(make_entry(i))
+    assert len(path.read_text().splitlines()) == 5
+    assert [e['total_rounds'] for e in journal.load()] == [4, 5, 6, 7, 8]
+
+def test_tail_reader_spans_blocks(tmp_path, monkeypatch):
+    """La lecture depuis la fin reconstitue les lignes coupées entre deux blocs"""
+    monkeypatch.setattr("score_journal.TAIL_BLOCK_SIZE", 16)
+    journal = ScoreJournal(str(tmp_path / "scores.jsonl"), retention=50)
+    for i in range(20):
+        journal.append(make_entry(i))
+    assert [e['total_rounds'] for e in journal.iter_recent()] == list(range(19, -1, -1))
+
+def test_truncated_line_is_skipped(tmp_path):
+    path = tmp_path / "scores.jsonl"
+    path.write_text(json.dumps(make_entry(1)) + "\n{\"date\": \"2025", encoding='utf-8')
+    journal = ScoreJournal(str(path))
+    assert [e['total_rounds'] for e in journal.load()] == [1]
+
+def test_legacy_migration(tmp_path):
+    """L'ancien fichier JSON est converti une seule fois"""
+    legacy = tmp_path / "web_scores.json"
+    legacy.write_text(json.dumps([make_entry(i) for i in range(4)]), encoding='utf-8')
+    path = tmp_path / "scores.jsonl"
+    journal = ScoreJournal(str(path), retention=3, legacy_path=str(legacy))
+    assert [e['total_rounds'] for e in journal.load()] == [1, 2, 3]
+    journal.append(make_entry(9))
+
+    # Un nouveau journal ne réimporte pas l'ancien fichier
+    reopened = ScoreJournal(str(path), retention=3, legacy_path=str(legacy))
+    assert [e['total_rounds'] for e in reopened.load(10)] == [1, 2, 3, 9]
+
+def test_append_after_truncated_line(tmp_path):
+    """Une ligne tronquée par un arrêt brutal n'emporte pas la partie suivante"""
+    path = tmp_path / "scores.jsonl"
+    ScoreJournal(str(path)).append(make_entry(1))
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write('{"date":"2025-01-01T00:00:02","win')
+    journal = ScoreJournal(str(path))
+    journal.append(make_entry(3))
+    assert [e['total_rounds'] for e in journal.load()] == [1, 3]
+
+def test_page_rejects_invalid_cursor(tmp_path):
+    journal = ScoreJournal(str(tmp_path / "scores.jsonl"))
+    journal.append(make_entry(1))
+    with pytest.raises(ValueError):
+        journal.page(before="hier")
@@ -0,0 +1,44 @@
+import json
+from score_stats import ScoreStats
+
+def make_entry(winner, gestures):
+    return {
+        'winner': winner,
+        'game_details': [
+            {'round': i + 1, 'player_gesture': p, 'computer_gesture': c}
+            for i, (p, c) in enumerate(gestures)
+        ],
+        'total_rounds': len(gestures)
+    }
+
+def test_incremental_record(tmp_path):
+    """Chaque partie enregistrée met à jour les agrégats"""
+    stats = ScoreStats(str(tmp_path / "stats.json"), rebuild=list)
+    stats.record(make_entry('Joueur', [('pierre', 'ciseaux'), ('papier', 'pierre')]))
+    stats.record(make_entry('IA', [('ciseaux', 'pierre')]))
+    snapshot = stats.snapshot()
+    assert snapshot['total_games'] == 2
+    assert snapshot['player_wins'] == 1
+    assert snapshot['computer_wins'] == 1
+    assert snapshot['win_rate'] == 50.0
+    assert snapshot['avg_rounds'] == 1.5
+    assert snapshot['player_gestures'] == {'pierre': 1, 'papier': 1, 'ciseaux': 1}
+    assert snapshot['computer_gestures'] == {'pierre': 2, 'papier': 0, 'ciseaux': 1}
+
+def test_persisted_stats_are_reused(tmp_path):
+    """Le fichier existant évite de relire l'historique"""
+    path = str(tmp_path / "stats.json")
+    ScoreStats(path, rebuild=list).record(make_entry('Joueur', [('pierre', 'ciseaux')]))
+
+    def rebuild():
+        raise AssertionError("L'historique ne devrait pas être relu")
+
+    assert ScoreStats(path, rebuild=rebuild).snapshot()['total_games'] == 1
+
+def test_corrupt_stats_are_rebuilt(tmp_path):
+    path = tmp_path / "stats.json"
+    path.write_text(json.dumps({'version': 1, 'total_games': 'abc'}))
+    history = [make_entry('IA', [('pierre', 'papier')])]
+    stats = ScoreStats(str(path), rebuild=lambda: iter(history))
+    assert stats.snapshot()['total_games'] == 1
+    assert json.loads(path.read_text())['total_games'] == 1
@@ -0,0 +1,55 @@
+import importlib.util
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+def run_python(code, tmp_path, **env):
+    return subprocess.run([sys.executable, '-c', code], cwd=tmp_path,
+                          env=dict(os.environ, PYTHONPATH=ROOT, **env),
+                          capture_output=True, text=True)
+
+def test_threading_mode_runs_blocking_calls_inline(tmp_path):
+    """Par défaut, l'application reste en mode threading et n'utilise aucun pool"""
+    code = (
+        "import json, threading, app, server_mode\n"
+        "ident = server_mode.run_blocking(threading.get_ident)\n"
+        "print(json.dumps({'mode': app.app.config['ASYNC_MODE'], 'socketio': app.socketio.async_mode,\n"
+        "                  'inline': ident == threading.get_ident()}))\n")
+    result = run_python(code, tmp_path, SHIFUMI_ASYNC_MODE='threading')
+    assert result.returncode == 0, result.stderr
+    assert json.loads(result.stdout.strip().splitlines()[-1]) == {
+        'mode': 'threading', 'socketio': 'threading', 'inline': True}
+
+def test_unknown_async_mode_is_rejected(tmp_path):
+    result = run_python("import app", tmp_path, SHIFUMI_ASYNC_MODE='asyncio')
+    assert result.returncode != 0
+    assert 'SHIFUMI_ASYNC_MODE' in result.stderr
+
+# Identifiant du thread système courant, hors monkey patching
+NATIVE_GET_IDENT = {
+    'eventlet': "from eventlet.patcher import original\nnative = original('threading').get_ident\n",
+    'gevent': "from gevent.monkey import get_original\nnative = get_original('threading', 'get_ident')\n",
+}
+
+@pytest.mark.parametrize('mode', ['eventlet', 'gevent'])
+def test_async_mode_offloads_to_os_threads(tmp_path, mode):
+    """La vision s'exécute dans un thread système ; le pool de processus est refusé"""
+    if importlib.util.find_spec(mode) is None:
+        pytest.skip(f"{mode} non installé (requirements-async.txt)")
+    code = (
+        "import json, app, server_mode\n"
+        + NATIVE_GET_IDENT[mode] +
+        "print(json.dumps({'mode': app.socketio.async_mode,\n"
+        "                  'offloaded': server_mode.run_blocking(native) != native()}))\n")
+    result = run_python(code, tmp_path, SHIFUMI_ASYNC_MODE=mode)
+    assert result.returncode == 0, result.stderr
+    assert json.loads(result.stdout.strip().splitlines()[-1]) == {'mode': mode, 'offloaded': True}
+
+    result = run_python("import app", tmp_path, SHIFUMI_ASYNC_MODE=mode, SHIFUMI_INFERENCE_PROCESSES='1')
+    assert result.returncode != 0
+    assert 'SHIFUMI_INFERENCE_PROCESSES' in result.stderr
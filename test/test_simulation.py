@@ -0,0 +1,58 @@
+import random
+import numpy as np
+import pytest
+from game_logic import GESTURE_NAMES, RESULT_TABLE, get_result
+from opponent import create_opponent
+from simulation import create_strategy, simulate, simulate_batch, CyclePlayer
+
+def test_result_table_matches_get_result():
+    expected = {"Joueur": 1, "Ordinateur": -1, "Égalité": 0}
+    for player in range(3):
+        for computer in range(3):
+            assert RESULT_TABLE[player, computer] == expected[get_result(GESTURE_NAMES[player], GESTURE_NAMES[computer])]
+
+def test_vectorized_strategy_matches_opponent():
+    """Mêmes prédictions et mêmes notes que opponent.Opponent, partie par partie"""
+    rng = np.random.default_rng(0)
+    moves = rng.integers(0, 3, size=(40, 3))  # 40 manches de 3 parties
+    strategy = create_strategy("adaptive")
+    strategy.start(3, rng)
+    opponents = [create_opponent("adaptive", rng=random.Random(0)) for _ in range(3)]
+    live = np.arange(3)
+    for round_moves in moves:
+        live = live.copy()
+        strategy.play(live, 0)
+        strategy.observe(live, round_moves, np.zeros(3, dtype=np.int64))
+        for game, opponent in enumerate(opponents):
+            opponent.observe(int(round_moves[game]))
+            assert np.allclose(strategy.scores[:, game], opponent.scores)
+            predictions = [p.predict(live)[game] for p in strategy.predictors]
+            assert predictions == [-1 if p.predict() is None else p.predict() for p in opponent.predictors]
+
+def test_games_end_at_points_to_win():
+    winners, lengths, draws = simulate_batch(CyclePlayer(), create_strategy("random"), 1000,
+                                             points_to_win=3, rng=np.random.default_rng(1))
+    assert set(winners.tolist()) <= {-1, 1}
+    assert lengths.min() >= 3
+    # Chaque manche non nulle donne un point ; le perdant en a moins de 3
+    points = lengths.sum() - draws
+    assert 3 * 1000 <= points < 5 * 1000
+
+def test_simulation_report():
+    result = simulate("cycle", "adaptive", games=5000, seed=1, batch_size=2000)
+    assert result['computer_win_rate'] > 0.95
+    assert result['player_win_rate'] + result['computer_win_rate'] + result['unfinished'] / 5000 == pytest.approx(1)
+    assert sum(result['game_length']['distribution'].values()) == 5000
+    assert result['game_length']['min'] >= 5
+    assert result['games_per_sec'] > 0
+
+def test_random_strategy_is_fair():
+    result = simulate("uniform", "random", games=20000, seed=2)
+    assert result['computer_win_rate'] == pytest.approx(0.5, abs=0.02)
+    assert result['draw_rate'] == pytest.approx(1 / 3, abs=0.02)
+
+def test_unknown_models_are_rejected():
+    with pytest.raises(ValueError):
+        simulate("devin", "random", games=1)
+    with pytest.raises(ValueError):
+        simulate("uniform", "devin", games=1)
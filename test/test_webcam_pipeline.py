@@ -0,0 +1,63 @@
+import threading
+import numpy as np
+from types import SimpleNamespace
+from frame_ring import FrameRing
+from webcam_pipeline import LatestSlot, CaptureThread, InferenceThread
+
+class FakeCapture:
+    """Caméra simulée : chaque image contient son numéro"""
+    def __init__(self):
+        self.count = 0
+
+    def read(self, image=None):
+        self.count += 1
+        if image is None:
+            image = np.empty((4, 4, 3), np.uint8)
+        image[:] = self.count % 256
+        return True, image
+
+class SlowHands:
+    """Tracker simulé plus lent que la caméra, sans main détectée"""
+    def __init__(self):
+        self.processed = 0
+        self.done = threading.Event()
+
+    def process(self, frame):
+        self.processed += 1
+        if self.processed >= 3:
+            self.done.set()
+        threading.Event().wait(0.02)
+        return SimpleNamespace(multi_hand_landmarks=None, multi_handedness=None)
+
+def test_latest_slot_keeps_newest_value():
+    slot = LatestSlot()
+    assert slot.latest() == (0, None)
+    slot.put("a")
+    slot.put("b")
+    assert slot.latest() == (2, "b")
+    assert slot.wait_newer(0, timeout=0) == (2, "b")
+    assert slot.wait_newer(2, timeout=0.01) == (2, "b")
+
+def test_pipeline_skips_frames_when_inference_is_slow():
+    """L'inférence ne traite que la dernière image, la capture ne l'attend pas"""
+    ring = FrameRing((4, 4, 3))
+    detections = LatestSlot()
+    cap = FakeCapture()
+    hands = SlowHands()
+    capture = CaptureThread(cap, ring)
+    inference = InferenceThread(hands, ring, detections)
+    capture.start()
+    inference.start()
+    try:
+        assert hands.done.wait(5)
+    finally:
+        capture.stop()
+        inference.stop()
+        capture.join(2)
+        inference.join(2)
+
+    version, detection = detections.latest()
+    assert version >= 3
+    assert detection.hands == []
+    # La caméra a produit bien plus d'images que l'inférence n'en a traité
+    assert cap.count > hands.processed
@@ -0,0 +1,72 @@
+"""
+Pile de vision du serveur web (OpenCV, MediaPipe, NumPy).
+
+Ce module n'est importé qu'au premier besoin par `app.load_vision()` : les
+pages, `/play` et les API d'état restent servis sans charger ces dépendances.
+"""
+import time
+
+import cv2
+import mediapipe as mp
+import numpy as np
+
+from frame_transport import extract_jpeg, decode_jpeg
+from game_logic import AUCUN, hand_sign_code
+from hand_roi import HandRoiTracker
+
+# Configuration MediaPipe
+mp_hands = mp.solutions.hands
+
+def create_hand_tracker():
+    """Construit un tracker MediaPipe Hands pour un client, recadré sur sa main"""
+    return HandRoiTracker(mp_hands.Hands(
+        static_image_mode=False,
+        max_num_hands=1,
+        min_detection_confidence=0.5,
+        min_tracking_confidence=0.5), max_num_hands=1)
+
+def detect_hands(tracker, frame):
+    """
+    Détecte les mains d'une image BGR et le geste reconnu.
+
+    Args:
+        tracker: Tracker HandRoiTracker du client
+        frame: Image BGR complète
+
+    Returns:
+        dict: 'gesture_code' (gestures.py), 'hands' (liste de (points de repère MediaPipe, main droite ?)) et
+              durées 'convert_seconds', 'inference_seconds', 'detect_seconds'
+    """
+    results = tracker.process(frame)
+    started = time.perf_counter()
+    gesture = AUCUN
+    hands = []
+    if results.multi_hand_landmarks:
+        handedness = results.multi_handedness or []
+        for index, hand_landmarks in enumerate(results.multi_hand_landmarks):
+            is_right_hand = index >= len(handedness) or handedness[index].classification[0].label == 'Right'
+            hands.append((hand_landmarks, is_right_hand))
+            # Détecter le geste (lectures scalaires : plus rapide qu'une conversion NumPy par main)
+            gesture = hand_sign_code(hand_landmarks, is_right_hand)
+    return {
+        'gesture_code': int(gesture),
+        'hands': hands,
+        'convert_seconds': tracker.last_convert_seconds,
+        'inference_seconds': tracker.last_inference_seconds,
+        'detect_seconds': time.perf_counter() - started,
+    }
+
+def warm_up_tracker(tracker, frames=2):
+    """
+    Exécute des inférences à blanc sur une image synthétique.
+
+    La première inférence d'un graphe MediaPipe initialise ses calculateurs ;
+    l'encodage puis le décodage JPEG préparent aussi libjpeg.
+    """
+    image = np.random.default_rng(0).integers(0, 256, (480, 640, 3), dtype=np.uint8)
+    _, jpeg = cv2.imencode('.jpg', image)
+    frame = decode_jpeg(jpeg)
+    for _ in range(frames):
+        tracker.process(frame)
+
+__all__ = ['extract_jpeg', 'decode_jpeg', 'create_hand_tracker', 'detect_hands', 'warm_up_tracker']
@@ -0,0 +1,137 @@
+import threading
+import time
+
+import cv2
+import numpy as np
+
+from game_logic import hand_sign_code
+
+
+class LatestSlot:
+    """
+    Tampon de transfert à une seule place entre deux threads.
+
+    Chaque écriture remplace la valeur précédente et incrémente une version ;
+    le lecteur récupère toujours la valeur la plus récente et peut attendre
+    qu'une version plus récente que celle qu'il a déjà vue soit disponible.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._version = 0
+        self._value = None
+
+    def put(self, value):
+        with self._cond:
+            self._version += 1
+            self._value = value
+            self._cond.notify_all()
+
+    def latest(self):
+        """Retourne (version, valeur) sans attendre"""
+        with self._cond:
+            return self._version, self._value
+
+    def wait_newer(self, seen_version, timeout=None):
+        """Attend une version plus récente que `seen_version` et retourne (version, valeur)"""
+        with self._cond:
+            self._cond.wait_for(lambda: self._version > seen_version, timeout)
+            return self._version, self._value
+
+
+class HandDetection:
+    """Résultat de l'inférence pour une image : mains, côté et geste reconnu"""
+
+    __slots__ = ('frame_version', 'hands')
+
+    def __init__(self, frame_version, hands):
+        self.frame_version = frame_version
+        self.hands = hands  # liste de (hand_landmarks, is_right_hand, code du geste)
+
+
+class CaptureThread(threading.Thread):
+    """
+    Lit la caméra en continu et publie l'image la plus récente, retournée en
+    miroir, dans un FrameRing.
+
+    La caméra écrit dans un tampon préalloué et le miroir est écrit directement
+    dans l'emplacement de l'anneau : la boucle n'alloue aucune image.
+    """
+
+    def __init__(self, cap, ring):
+        super().__init__(name="capture", daemon=True)
+        self.cap = cap
+        self.ring = ring
+        self.dropped = 0  # Images perdues faute d'emplacement libre
+        self._stop_event = threading.Event()
+
+    def stop(self):
+        self._stop_event.set()
+
+    def run(self):
+        raw = np.empty(self.ring.shape, dtype=self.ring.dtype)
+        height, width = self.ring.shape[:2]
+        while not self._stop_event.is_set():
+            ret, frame = self.cap.read(raw)
+            if not ret:
+                print("Erreur de lecture de la caméra, tentative de récupération...")
+                time.sleep(0.1)
+                continue
+            acquired = self.ring.acquire_write()
+            if acquired is None:
+                self.dropped += 1
+                continue
+            slot, target = acquired
+            try:
+                if frame.shape != target.shape:
+                    # La caméra n'a pas respecté la résolution annoncée
+                    frame = cv2.resize(frame, (width, height))
+                cv2.flip(frame, 1, dst=target)
+            except Exception:
+                self.ring.cancel_write(slot)
+                raise
+            self.ring.commit_write(slot)
+
+
+class InferenceThread(threading.Thread):
+    """Analyse la dernière image de l'anneau, sur place, et publie les mains détectées"""
+
+    def __init__(self, hands, ring, detections, recorder=None, reader=0):
+        super().__init__(name="inference", daemon=True)
+        self.hands = hands
+        self.ring = ring
+        self.reader = reader  # Index de lecteur réservé dans l'anneau
+        self.detections = detections
+        self.recorder = recorder  # LandmarkRecorder optionnel
+        self._stop_event = threading.Event()
+
+    def stop(self):
+        self._stop_event.set()
+
+    def run(self):
+        seen_number = 0
+        while not self._stop_event.is_set():
+            if not self.ring.wait_newer(seen_number, timeout=0.5):
+                continue
+            acquired = self.ring.acquire_read(self.reader, seen_number)
+            if acquired is None:
+                continue
+            seen_number, slot, frame = acquired
+            try:
+                result = self.hands.process(frame)
+            except Exception as e:
+                print(f"Erreur pendant la détection: {e}")
+                continue
+            finally:
+                self.ring.release_read(self.reader, slot)
+
+            detected = []
+            if result.multi_hand_landmarks:
+                for hand_landmarks, handedness in zip(result.multi_hand_landmarks, result.multi_handedness):
+                    is_right_hand = handedness.classification[0].label == "Right"
+                    detected.append((hand_landmarks, is_right_hand,
+                                     hand_sign_code(hand_landmarks, is_right_hand)))
+            if self.recorder is not None:
+                self.recorder.record_frame(
+                    (hand_landmarks, is_right_hand) for hand_landmarks, is_right_hand, _ in detected)
+            self.detections.put(HandDetection(seen_number, detected))